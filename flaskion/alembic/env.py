@@ -7,6 +7,9 @@ from alembic import context
 
 from pydbx_hng.models.base.base_model import BaseModel
 from app.models.user import User  # noqa: F401
+from app.models.image import Image  # noqa: F401
+from app.models.image_job import ImageJob  # noqa: F401
+from app.models.refresh_token import RefreshToken  # noqa: F401
 
 target_metadata = BaseModel.metadata
 
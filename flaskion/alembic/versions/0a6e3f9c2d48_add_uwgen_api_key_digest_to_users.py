@@ -0,0 +1,30 @@
+"""add uwgen_api_key_digest to users
+
+Revision ID: 0a6e3f9c2d48
+Revises: f5c2d8a03b17
+Create Date: 2026-01-11 15:27:43.902617
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a6e3f9c2d48'
+down_revision: Union[str, Sequence[str], None] = 'f5c2d8a03b17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('uwgen_api_key_digest', sa.String(length=64), nullable=True), schema='uwgen')
+    op.create_unique_constraint('users_uwgen_api_key_digest_key', 'users', ['uwgen_api_key_digest'], schema='uwgen')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('users_uwgen_api_key_digest_key', 'users', schema='uwgen', type_='unique')
+    op.drop_column('users', 'uwgen_api_key_digest', schema='uwgen')
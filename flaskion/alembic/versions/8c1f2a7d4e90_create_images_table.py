@@ -0,0 +1,45 @@
+"""create images table
+
+Revision ID: 8c1f2a7d4e90
+Revises: 5ebb82b7befa
+Create Date: 2026-01-05 10:12:31.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c1f2a7d4e90'
+down_revision: Union[str, Sequence[str], None] = '5ebb82b7befa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('images',
+    sa.Column('id', sa.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('path_type', sa.String(), nullable=False),
+    sa.Column('date_dir', sa.String(length=10), nullable=False),
+    sa.Column('filename', sa.String(), nullable=False),
+    sa.Column('mtime', sa.Float(), nullable=False),
+    sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['uwgen.users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'path_type', 'date_dir', 'filename', name='uq_images_user_file'),
+    schema='uwgen'
+    )
+    op.create_index('ix_images_user_sort', 'images', ['user_id', 'date_dir', 'mtime', 'filename'], unique=False, schema='uwgen')
+    op.create_index('ix_images_user_type_sort', 'images', ['user_id', 'path_type', 'date_dir', 'mtime', 'filename'], unique=False, schema='uwgen')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_images_user_type_sort', table_name='images', schema='uwgen')
+    op.drop_index('ix_images_user_sort', table_name='images', schema='uwgen')
+    op.drop_table('images', schema='uwgen')
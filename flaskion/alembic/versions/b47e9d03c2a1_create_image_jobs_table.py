@@ -0,0 +1,44 @@
+"""create image_jobs table
+
+Revision ID: b47e9d03c2a1
+Revises: 8c1f2a7d4e90
+Create Date: 2026-01-08 14:03:52.771902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b47e9d03c2a1'
+down_revision: Union[str, Sequence[str], None] = '8c1f2a7d4e90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('image_jobs',
+    sa.Column('id', sa.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('result', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('error_code', sa.String(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+    sa.Column('started_at', sa.TIMESTAMP(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.TIMESTAMP(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['uwgen.users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    schema='uwgen'
+    )
+    op.create_index('ix_image_jobs_user_created', 'image_jobs', ['user_id', 'created_at'], unique=False, schema='uwgen')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_image_jobs_user_created', table_name='image_jobs', schema='uwgen')
+    op.drop_table('image_jobs', schema='uwgen')
@@ -0,0 +1,30 @@
+"""add content_hash to images
+
+Revision ID: d3a9f61b7e25
+Revises: b47e9d03c2a1
+Create Date: 2026-01-09 10:12:41.305118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a9f61b7e25'
+down_revision: Union[str, Sequence[str], None] = 'b47e9d03c2a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('images', sa.Column('content_hash', sa.String(length=64), nullable=True), schema='uwgen')
+    op.create_index('ix_images_content_hash', 'images', ['content_hash'], unique=False, schema='uwgen')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_images_content_hash', table_name='images', schema='uwgen')
+    op.drop_column('images', 'content_hash', schema='uwgen')
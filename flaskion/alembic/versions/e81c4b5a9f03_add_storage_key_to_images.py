@@ -0,0 +1,28 @@
+"""add storage_key to images
+
+Revision ID: e81c4b5a9f03
+Revises: d3a9f61b7e25
+Create Date: 2026-01-10 09:41:27.118532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e81c4b5a9f03'
+down_revision: Union[str, Sequence[str], None] = 'd3a9f61b7e25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('images', sa.Column('storage_key', sa.String(), nullable=True), schema='uwgen')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('images', 'storage_key', schema='uwgen')
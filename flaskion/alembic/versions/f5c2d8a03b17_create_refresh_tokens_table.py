@@ -0,0 +1,44 @@
+"""create refresh_tokens table
+
+Revision ID: f5c2d8a03b17
+Revises: e81c4b5a9f03
+Create Date: 2026-01-11 10:12:05.604219
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5c2d8a03b17'
+down_revision: Union[str, Sequence[str], None] = 'e81c4b5a9f03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('refresh_tokens',
+    sa.Column('id', sa.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('family_id', sa.UUID(), nullable=False),
+    sa.Column('token_hash', sa.String(length=64), nullable=False),
+    sa.Column('expires_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('revoked_at', sa.TIMESTAMP(timezone=True), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['uwgen.users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('token_hash'),
+    schema='uwgen'
+    )
+    op.create_index('ix_refresh_tokens_family', 'refresh_tokens', ['family_id'], unique=False, schema='uwgen')
+    op.create_index('ix_refresh_tokens_user_expires', 'refresh_tokens', ['user_id', 'expires_at'], unique=False, schema='uwgen')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_refresh_tokens_user_expires', table_name='refresh_tokens', schema='uwgen')
+    op.drop_index('ix_refresh_tokens_family', table_name='refresh_tokens', schema='uwgen')
+    op.drop_table('refresh_tokens', schema='uwgen')
@@ -2,10 +2,12 @@ from flask import Blueprint, request, session
 from http import HTTPStatus
 from app.schemas.auth import (
     SignupRequestSchema, SignupResponseSchema,
-    SigninRequestSchema, SigninResponseSchema
+    SigninRequestSchema, SigninResponseSchema,
+    RefreshRequestSchema
 )
 from app.services.auth_service import AuthService
-from app.core.security import get_current_user
+from app.services.refresh_token_service import RefreshTokenService
+from app.core.security import get_current_user, public_endpoint
 from app.core.errors import AuthError, RequestError
 from app.models.response.errors import ErrorResponse
 from app.models.response.success import SuccessResponse
@@ -14,6 +16,7 @@ from app.models.response.success import SuccessResponse
 bp = Blueprint("auth", __name__, url_prefix="/api/v1/auth")
 
 @bp.post("/signup")
+@public_endpoint
 def signup():
     """
     ユーザーサインアップAPI
@@ -37,6 +40,7 @@ def signup():
     )
     
 @bp.post("/signin")
+@public_endpoint
 def signin():
     """
     ユーザーサインインAPI
@@ -55,6 +59,9 @@ def signin():
     if err == AuthError.INACTIVE_ACCOUNT:
         return ErrorResponse.from_error(AuthError.INACTIVE_ACCOUNT, HTTPStatus.FORBIDDEN)
 
+    # リフレッシュトークン発行(アクセストークン期限切れ後はパスワードなしで更新できる)
+    refresh_token = RefreshTokenService.issue(user.id)
+
     # セッションにidとEmailアドレスをセットする
     session["id"] = user.id
     session["email"] = user.email
@@ -63,9 +70,63 @@ def signin():
     return SuccessResponse.ok(
         SigninResponseSchema().dump({
             "access_token": token,
+            "refresh_token": refresh_token,
+            "token_type": "Bearer"
+        })
+    )
+
+@bp.post("/refresh")
+@public_endpoint
+def refresh():
+    """
+    アクセストークン更新API
+    
+    - リフレッシュトークンは使い捨て(レスポンスの新しいリフレッシュトークンに置き換える)
+    """
+    
+    # リクエストデータ検証
+    data = request.get_json(silent=True) or {}
+    errors = RefreshRequestSchema().validate(data)
+    if errors:
+        return ErrorResponse.from_error(RequestError.INVALID_REQUEST, HTTPStatus.BAD_REQUEST, details=errors)
+
+    # トークン更新処理
+    user, token, refresh_token, err = RefreshTokenService.rotate(data["refresh_token"])
+    if err == AuthError.INVALID_REFRESH_TOKEN:
+        return ErrorResponse.from_error(AuthError.INVALID_REFRESH_TOKEN, HTTPStatus.UNAUTHORIZED)
+    if err == AuthError.INACTIVE_ACCOUNT:
+        return ErrorResponse.from_error(AuthError.INACTIVE_ACCOUNT, HTTPStatus.FORBIDDEN)
+
+    # レスポンス生成
+    return SuccessResponse.ok(
+        SigninResponseSchema().dump({
+            "access_token": token,
+            "refresh_token": refresh_token,
             "token_type": "Bearer"
         })
     )
+
+@bp.post("/logout")
+@public_endpoint
+def logout():
+    """
+    ログアウトAPI
+    
+    - リフレッシュトークンを失効させる(発行済みのアクセストークンは有効期限まで有効)
+    - 存在しない・失効済みのトークンでも成功を返す
+    """
+    
+    # リクエストデータ検証
+    data = request.get_json(silent=True) or {}
+    errors = RefreshRequestSchema().validate(data)
+    if errors:
+        return ErrorResponse.from_error(RequestError.INVALID_REQUEST, HTTPStatus.BAD_REQUEST, details=errors)
+
+    # トークン失効処理
+    RefreshTokenService.revoke(data["refresh_token"])
+    session.clear()
+
+    return SuccessResponse.ok(data={}, status=HTTPStatus.OK)
     
 @bp.get("/me")
 def get_me():
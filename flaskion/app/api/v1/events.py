@@ -0,0 +1,29 @@
+from flask_socketio import join_room
+from app.core.security import decode_access_token
+from app.core.socketio import socketio
+from app.services.notification_service import NotificationService
+
+@socketio.on("connect")
+def on_connect(auth=None):
+    """
+    SocketIO接続時の認証とルーム参加
+    
+    - クライアントは auth: {token: <アクセストークン>} を指定して接続する
+    - トークンが無効な場合は接続を拒否する
+    """
+    
+    token = (auth or {}).get("token")
+    if not token:
+        return False
+    
+    try:
+        payload = decode_access_token(token)
+    except Exception:
+        return False
+    
+    user_id = payload.get("sub")
+    if not user_id:
+        return False
+    
+    # ユーザー専用ルームに参加
+    join_room(NotificationService.user_room(user_id))
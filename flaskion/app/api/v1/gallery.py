@@ -1,18 +1,25 @@
 from flask import Blueprint, request
 from http import HTTPStatus
 from app.core.security import get_current_user
+from app.core.errors import RequestError
 from app.models.response.errors import ErrorResponse
 from app.services.gallery_service import GalleryService
 from app.models.response.success import SuccessResponse
 
 bp = Blueprint("gallery_api", __name__, url_prefix="/api/v1")
 
+# 1ページあたりの最大取得件数
+MAX_LIMIT = 100
+
 @bp.get("/gallery")
 def get_gallery():
     """
     ギャラリー画像一覧取得
+
+    - offset/limit指定: オフセットモード(総件数を返す)
+    - cursor指定: カーソルモード(前ページのnext_cursorから続きを返す。空文字は先頭ページ)
     """
-    
+
     # 認証チェック
     current_user, error, status = get_current_user()
     if error:
@@ -21,22 +28,29 @@ def get_gallery():
     # クエリパラメーター
     filter_type = request.args.get("type", "all")
     sort_order = request.args.get("sort", "newest")
-    offset = request.args.get("offset", default=0, type=int)
-    limit = request.args.get("limit", default=20, type=int)
-    
+    offset = max(request.args.get("offset", default=0, type=int), 0)
+    limit = min(max(request.args.get("limit", default=20, type=int), 1), MAX_LIMIT)
+    cursor = request.args.get("cursor")
+
     # 画像取得サービス呼び出し
-    results = GalleryService.get_user_images(
-        current_user_id=current_user.id,
-        filter_type=filter_type,
-        sort_order=sort_order,
-        offset=offset,
-        limit=limit
-    )
-    
+    try:
+        results = GalleryService.get_user_images(
+            current_user_id=current_user.id,
+            filter_type=filter_type,
+            sort_order=sort_order,
+            offset=offset,
+            limit=limit,
+            cursor=cursor
+        )
+    except ValueError:
+        return ErrorResponse.from_error(RequestError.INVALID_REQUEST, HTTPStatus.BAD_REQUEST)
+
     return SuccessResponse.ok(
         data={
-            "images": results["images"], 
+            "images": results["images"],
             "total": results["total"],
+            "next_cursor": results["next_cursor"],
+            "has_more": results["has_more"],
         },
         status=HTTPStatus.OK
-    )
\ No newline at end of file
+    )
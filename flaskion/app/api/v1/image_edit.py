@@ -2,6 +2,7 @@
 from flask import Blueprint, request
 from http import HTTPStatus
 from app.services.image_service import ImageGenService
+from app.services.job_service import JobService
 from app.core.security import get_current_user
 from app.models.response.errors import ErrorResponse
 from app.models.response.success import SuccessResponse
@@ -22,18 +23,56 @@ def image_edit():
     # フォームデータ取得
     param_data: dict = request.form.to_dict()
 
-    # 元画像を取得
+    # 元画像を取得(元画像IDを指定した場合はファイルのアップロードを省略できる)
     source_image = request.files.get("sourceImage")
+    source_image_id = param_data.pop("sourceImageId", None)
     
     # ImageGenServiceで画像編集
     results, status = ImageGenService.edit_image(
         current_user=current_user,
         param_data=param_data,
-        source_image=source_image
+        source_image=source_image,
+        source_image_id=source_image_id
     )
     if status == HTTPStatus.OK:
         return SuccessResponse.ok(
-            data={"generated": results},
+            data=results,
+            status=status
+        )
+    else:
+        return ErrorResponse.from_error(results, status)
+
+@bp.post("/image_edit/jobs")
+def image_edit_job():
+    """
+    画像編集ジョブ投入エンドポイント
+    
+    - 入力チェック後すぐにジョブIDを返す(202)
+    - 結果は GET /api/v1/jobs/<job_id> で取得する
+    """
+    
+    # 認証チェック
+    current_user, error, status = get_current_user()
+    if error:
+        return ErrorResponse.from_error(error, status)
+    
+    # フォームデータ取得
+    param_data: dict = request.form.to_dict()
+
+    # 元画像を取得(元画像IDを指定した場合はファイルのアップロードを省略できる)
+    source_image = request.files.get("sourceImage")
+    source_image_id = param_data.pop("sourceImageId", None)
+    
+    # JobServiceで画像編集ジョブを投入
+    results, status = JobService.submit_edit(
+        current_user=current_user,
+        param_data=param_data,
+        source_image=source_image,
+        source_image_id=source_image_id
+    )
+    if status == HTTPStatus.ACCEPTED:
+        return SuccessResponse.ok(
+            data=results,
             status=status
         )
     else:
@@ -1,11 +1,17 @@
-
-from flask import Blueprint, request, send_file
+import time
+import uuid
+from flask import Blueprint, Response, request, stream_with_context
 from http import HTTPStatus
-from pathlib import Path
+from app.services.batch_service import ImageBatchService
+from app.services.derivative_service import DerivativeService
+from app.services.image_delivery_service import ImageDeliveryService
 from app.services.image_service import ImageGenService
+from app.services.image_url_service import ImageUrlService
+from app.services.job_service import JobService
 from app.core.config import settings
-from app.core.security import get_current_user
-from app.core.errors import ImageGenError
+from app.core.security import get_current_user, public_endpoint
+from app.core.enums import ImageVariant
+from app.core.errors import ImageGenError, RequestError
 from app.models.response.errors import ErrorResponse
 from app.models.response.success import SuccessResponse
 
@@ -38,50 +44,139 @@ def image_gen():
     else:
         return ErrorResponse.from_error(results, status)
 
-@bp.get("/images/<path_type>/<date_dir>/<image_id>")
-def get_image(path_type: str, date_dir: str, image_id: str):
+@bp.post("/image_gen/jobs")
+def image_gen_job():
     """
-    画像取得API
+    画像生成ジョブ投入エンドポイント
+    
+    - 入力チェック後すぐにジョブIDを返す(202)
+    - 結果は GET /api/v1/jobs/<job_id> で取得する
     """
     
     # 認証チェック
     current_user, error, status = get_current_user()
     if error:
         return ErrorResponse.from_error(error, status)
+    
+    # リクエストデータ検証
+    param_data: dict = request.get_json() or {}
+    
+    # JobServiceで画像生成ジョブを投入
+    results, status = JobService.submit_generate(
+        current_user=current_user,
+        param_data=param_data
+    )
+    if status == HTTPStatus.ACCEPTED:
+        return SuccessResponse.ok(
+            data=results,
+            status=status
+        )
+    else:
+        return ErrorResponse.from_error(results, status)
 
-    # 保存先ディレクトリ取得
-    user_dir = ImageGenService.get_image_path(path_type, date_dir, current_user.id)
+@bp.post("/image_gen/batch")
+def image_gen_batch():
+    """
+    バッチ画像生成エンドポイント
+    
+    - リクエスト: {"items": [画像生成パラメーター, ...]}
+    - 各アイテムを並列に生成し、完了した順にNDJSON(1行1アイテム)で返す
+    """
+    
+    # 認証チェック
+    current_user, error, status = get_current_user()
+    if error:
+        return ErrorResponse.from_error(error, status)
+    
+    # リクエストデータ検証
+    body = request.get_json(silent=True)
+    prepared, status = ImageBatchService.prepare(
+        current_user=current_user,
+        items=body.get("items") if isinstance(body, dict) else None
+    )
+    if status != HTTPStatus.OK:
+        return ErrorResponse.from_error(prepared, status)
+    
+    # 完了した順に結果を返す
+    return Response(
+        stream_with_context(ImageBatchService.stream(current_user.id, prepared)),
+        mimetype="application/x-ndjson"
+    )
 
-    # ユーザーディレクトリチェック
-    if not user_dir.exists():
-        return ErrorResponse.from_error(
-            ImageGenError.FILE_NOT_FOUND,
-            HTTPStatus.NOT_FOUND
-        )
+@bp.get("/images/<path_type>/<date_dir>/<image_id>")
+@public_endpoint
+def get_image(path_type: str, date_dir: str, image_id: str):
+    """
+    画像取得API
+    
+    - size指定: original(既定) / thumb / medium
+      thumb・mediumは派生画像を返す(未生成の場合は生成してから返す)
+    - uid/exp/sig指定: 署名付きURL。署名検証のみで認可する(ユーザー情報の問い合わせを行わない)
+    - ETag/Last-Modifiedは画像のインデックス情報(content_hash / created_at)から作成する
+    - 署名なし: Bearerトークンで認証する
+    """
     
-    # ファイルパス取得(パストラバーサル対策あり)
+    # 配信サイズ
     try:
-        file_path: Path = user_dir / image_id
-        if user_dir not in file_path.resolve().parents:
+        variant = ImageVariant(request.args.get("size", ImageVariant.ORIGINAL.value))
+    except ValueError:
+        return ErrorResponse.from_error(RequestError.INVALID_REQUEST, HTTPStatus.BAD_REQUEST)
+    
+    # 署名付きURLの検証、または認証チェック
+    uid = request.args.get("uid")
+    max_age = None
+    if uid is not None:
+        exp = request.args.get("exp")
+        if not ImageUrlService.verify(uid, path_type, date_dir, image_id, exp, request.args.get("sig")):
             return ErrorResponse.from_error(
-                ImageGenError.PATH_TRAVERSAL_DETECTED,
+                ImageGenError.INVALID_IMAGE_SIGNATURE,
                 HTTPStatus.FORBIDDEN
             )
+        # 署名はUUID文字列に対して作成するため、検証後は必ず変換できる(インデックス検索用)
+        owner_id = uuid.UUID(uid)
+        
+        # URLの有効期限を超えてキャッシュさせない
+        max_age = min(settings.IMAGE_CACHE_MAX_AGE, int(exp) - int(time.time()))
+    else:
+        current_user, error, status = get_current_user()
+        if error:
+            return ErrorResponse.from_error(error, status)
+        owner_id = current_user.id
 
-    except Exception:
+    # パストラバーサル対策(各要素は単一のファイル名・フォルダ名のみ許可し、隠しファイルは対象外)
+    if any(part in ("", ".", "..") or part.startswith(".") or "\\" in part for part in (date_dir, image_id)):
         return ErrorResponse.from_error(
             ImageGenError.PATH_TRAVERSAL_DETECTED,
             HTTPStatus.FORBIDDEN
         )
-        
+    
+    # ストレージキー・インデックス情報取得(登録済みの画像は実体から読む。未登録の画像は新旧両方式を探す)
+    key, image = ImageGenService.resolve_image(path_type, date_dir, owner_id, image_id)
+    
     # ファイル存在チェック
-    if not file_path.is_file():
+    if key is None:
         return ErrorResponse.from_error(
             ImageGenError.FILE_NOT_FOUND,
             HTTPStatus.NOT_FOUND
         )
     
-    # 画像を返却する
-    response = send_file(file_path)
-    response.headers["Cache-Control"]  ="public, max-age=3600"
-    return response
\ No newline at end of file
+    try:
+        # 派生画像に切り替える
+        mimetype = None
+        if variant != ImageVariant.ORIGINAL:
+            key = DerivativeService.get_or_create(key, variant)
+            mimetype = DerivativeService.mimetype()
+        
+        # 画像を返却する(ETag/条件付きGET/Range対応。S3の場合は期限付きURLへリダイレクト)
+        # 署名付きURLは共有キャッシュ(CDN)に保存可能、Bearer認証の場合は保存させない
+        etag, last_modified = ImageDeliveryService.validators(image, variant)
+        return ImageDeliveryService.send_object(
+            key, mimetype=mimetype, private=(uid is None), max_age=max_age,
+            etag=etag, last_modified=last_modified
+        )
+    except FileNotFoundError:
+        # 存在確認後に削除された場合
+        return ErrorResponse.from_error(
+            ImageGenError.FILE_NOT_FOUND,
+            HTTPStatus.NOT_FOUND
+        )
@@ -0,0 +1,29 @@
+from flask import Blueprint
+from http import HTTPStatus
+from app.core.security import get_current_user
+from app.services.job_service import JobService
+from app.models.response.errors import ErrorResponse
+from app.models.response.success import SuccessResponse
+
+bp = Blueprint("jobs_api", __name__, url_prefix="/api/v1")
+
+@bp.get("/jobs/<job_id>")
+def get_job(job_id: str):
+    """
+    非同期ジョブの状態・結果取得エンドポイント
+    """
+    
+    # 認証チェック
+    current_user, error, status = get_current_user()
+    if error:
+        return ErrorResponse.from_error(error, status)
+    
+    # ジョブ情報取得
+    results, status = JobService.get_job(current_user.id, job_id)
+    if status == HTTPStatus.OK:
+        return SuccessResponse.ok(
+            data=results,
+            status=status
+        )
+    else:
+        return ErrorResponse.from_error(results, status)
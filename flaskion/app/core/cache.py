@@ -0,0 +1,148 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+class TTLCache:
+    """
+    有効期限付きのサイズ上限LRUキャッシュ
+
+    - プロセス内(ワーカーごと)のインメモリキャッシュ
+    - 上限件数を超えた場合は最も参照されていないエントリから破棄する
+    - 有効期限切れのエントリは参照時に破棄する
+    - ttlが0以下の場合はキャッシュを無効化する(常にミス)
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        コンストラクタ
+
+        Parameters
+        ----------
+        maxsize : int
+            最大エントリ数
+        ttl : float
+            有効期限(秒)
+        """
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.RLock()
+
+    @property
+    def enabled(self) -> bool:
+        """
+        キャッシュが有効かどうか
+        """
+
+        return self.ttl > 0 and self.maxsize > 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        キャッシュから値を取得する
+
+        Parameters
+        ----------
+        key : Hashable
+            キャッシュキー
+        default : Any
+            キャッシュミス時の戻り値
+
+        Returns
+        -------
+        Any
+            キャッシュされた値
+        """
+
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                # 有効期限切れ
+                del self._data[key]
+                return default
+
+            # LRU順を更新
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        キャッシュに値を登録する
+
+        Parameters
+        ----------
+        key : Hashable
+            キャッシュキー
+        value : Any
+            キャッシュする値
+        """
+
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+
+            # 上限を超えた分を古い順に破棄
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """
+        キャッシュからエントリを破棄する
+
+        Parameters
+        ----------
+        key : Hashable
+            キャッシュキー
+        default : Any
+            エントリが存在しない場合の戻り値
+
+        Returns
+        -------
+        Any
+            破棄された値
+        """
+
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return default if entry is None else entry[1]
+
+    def pop_matching(self, predicate: Callable[[Hashable], bool]) -> int:
+        """
+        条件に一致するキーのエントリをまとめて破棄する
+
+        Parameters
+        ----------
+        predicate : Callable[[Hashable], bool]
+            破棄対象のキーでTrueを返す関数
+
+        Returns
+        -------
+        int
+            破棄したエントリ数
+        """
+
+        with self._lock:
+            keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        """
+        全エントリを破棄する
+        """
+
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
@@ -0,0 +1,108 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable
+from gevent import monkey
+from gevent.threadpool import ThreadPool
+from app.core.config import settings
+
+def is_gevent_patched() -> bool:
+    """
+    geventのモンキーパッチが適用されているかどうかを判定する
+    (gunicorn -k gevent で起動した場合はTrue)
+    """
+
+    return monkey.is_module_patched("threading")
+
+class BlockingPool:
+    """
+    ブロッキング処理(ファイルI/O、CPU処理)をネイティブスレッドで実行するプール
+
+    - gevent環境ではgeventのThreadPoolを使い、呼び出し元のグリーンレットだけを待機させる
+      (ハブを止めないため、他のリクエストは処理を継続できる)
+    - gevent以外(開発サーバー等)では通常のスレッドプールを使う(同時実行数の上限はどちらもmaxsize)
+    - プールはワーカープロセスごとに初回使用時に生成する(fork後に生成するため)
+    """
+
+    def __init__(self, name: str, maxsize: int):
+        """
+        コンストラクタ
+
+        Parameters
+        ----------
+        name : str
+            プール名(スレッド名の接頭辞)
+        maxsize : int
+            最大スレッド数
+        """
+
+        self.name = name
+        self.maxsize = max(maxsize, 1)
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        ブロッキング処理を実行し、結果を返す
+
+        Parameters
+        ----------
+        func : Callable
+            実行する関数
+        *args, **kwargs
+            関数の引数
+
+        Returns
+        -------
+        Any
+            関数の戻り値(例外は呼び出し元に送出される)
+        """
+
+        if not is_gevent_patched():
+            # スレッドプールで実行する(開発サーバー等でも同時実行数をmaxsizeに制限する)
+            return self._get_pool().submit(func, *args, **kwargs).result()
+        return self._get_pool().apply(func, args, kwargs)
+
+    def map(self, func: Callable, items: Iterable) -> list:
+        """
+        ブロッキング処理を並列に実行し、入力順の結果リストを返す
+
+        Parameters
+        ----------
+        func : Callable
+            実行する関数(1引数)
+        items : Iterable
+            入力
+
+        Returns
+        -------
+        list
+            関数の戻り値(いずれかが失敗した場合は例外を送出する)
+        """
+
+        items = list(items)
+        if len(items) <= 1:
+            return [self.run(func, item) for item in items]
+        return list(self._get_pool().map(func, items))
+
+    def _get_pool(self):
+        """
+        プールを取得する(未生成の場合は生成する)
+        """
+
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    if is_gevent_patched():
+                        self._pool = ThreadPool(self.maxsize)
+                    else:
+                        self._pool = ThreadPoolExecutor(
+                            max_workers=self.maxsize,
+                            thread_name_prefix=self.name
+                        )
+        return self._pool
+
+# メディアファイル書き込み用プール
+io_pool = BlockingPool("media-io", settings.MEDIA_IO_THREADS)
+
+# パスワードハッシュ計算用プール(ログイン集中時もハッシュ計算の同時実行数を抑える)
+password_pool = BlockingPool("password-hash", settings.PASSWORD_HASH_THREADS)
@@ -20,4 +20,71 @@ class ImagePathType(Enum):
     """ 画像生成 """
     
     EDITED = "edit"
-    """ 画像編集 """
\ No newline at end of file
+    """ 画像編集 """
+
+class ImageVariant(Enum):
+    """
+    画像配信サイズ(派生画像)種類
+    """
+    
+    ORIGINAL = "original"
+    """ 元画像 """
+    
+    THUMB = "thumb"
+    """ サムネイル(ギャラリー一覧用) """
+    
+    MEDIUM = "medium"
+    """ プレビュー(モーダル表示用) """
+
+class ImageDeliveryMode(Enum):
+    """
+    画像配信方式
+    """
+    
+    DIRECT = "direct"
+    """ Flask(send_file)から送信する """
+    
+    X_ACCEL_REDIRECT = "x-accel-redirect"
+    """ nginxの内部ロケーションに委譲する """
+    
+    X_SENDFILE = "x-sendfile"
+    """ X-Sendfile対応プロキシ(Apache mod_xsendfile等)に委譲する """
+
+class StorageBackendType(Enum):
+    """
+    メディアストレージ種類
+    """
+    
+    LOCAL = "local"
+    """ ローカルファイルシステム(MEDIA_ROOT) """
+    
+    S3 = "s3"
+    """ S3互換オブジェクトストレージ """
+
+class MediaLayout(Enum):
+    """
+    メディアファイルの配置方式
+    """
+    
+    DATED = "dated"
+    """ <user>/<種類>/<YYYY-MM-DD>/<ファイル名>(旧方式) """
+    
+    SHARDED = "sharded"
+    """ <user>/<種類>/<ハッシュ2桁>/<ハッシュ2桁>/<ファイル名> """
+
+class JobStatus(Enum):
+    """
+    非同期ジョブの状態
+    """
+    
+    QUEUED = "queued"
+    """ 実行待ち """
+    
+    RUNNING = "running"
+    """ 実行中 """
+    
+    SUCCEEDED = "succeeded"
+    """ 正常終了 """
+    
+    FAILED = "failed"
+    """ 異常終了 """
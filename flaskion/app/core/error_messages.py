@@ -1,15 +1,17 @@
-from .errors import AuthError, RequestError, UserError, ImageGenError, ImageEditError
+from .errors import AuthError, RequestError, UserError, ImageGenError, ImageEditError, JobError
 
 AUTH_ERROR_MESSAGES = {
     AuthError.EMAIL_EXISTS: "入力されたEmailアドレスは既に登録されています",
     AuthError.INVALID_CREDENTIALS: "Emailアドレスまたはパスワードが間違っています",
     AuthError.INACTIVE_ACCOUNT: "このアカウントは無効です",
     AuthError.WEAK_PASSWORD: "パスワード強度が低すぎます",
+    AuthError.INVALID_REFRESH_TOKEN: "ログインの有効期限が切れました。再度サインインしてください",
 }
 """ 認証系レスポンスエラーメッセージ """
 
 REQUEST_ERROR_MESSAGE = {
     RequestError.INVALID_REQUEST: "リクエストの内容が不正です",
+    RequestError.PAYLOAD_TOO_LARGE: "アップロードサイズが上限を超えています",
 }
 """ リクエスト系エラーメッセージ """
 
@@ -29,15 +31,27 @@ IMAGE_GEN_ERROR_MESSAGE = {
     ImageGenError.FILE_NOT_FOUND: "画像ファイルが見つかりません",
     ImageGenError.PATH_TRAVERSAL_DETECTED: "不正なパスが指定されました",
     ImageGenError.IMAGE_NO_CANDIDATES: "画像を生成できませんでした。プロンプトを変えて再度実行してください",
-    ImageGenError.IMAGE_INTERNAL_ERROR: "画像生成中に予期しないエラーが発生しました。時間をおいて再度実行してください"
+    ImageGenError.IMAGE_INTERNAL_ERROR: "画像生成中に予期しないエラーが発生しました。時間をおいて再度実行してください",
+    ImageGenError.UPSTREAM_BUSY: "画像生成が混み合っています。時間をおいて再度実行してください",
+    ImageGenError.INVALID_IMAGE_SIGNATURE: "画像URLが無効、または有効期限切れです",
 }
 """ 画像生成処理系エラーメッセージ """
 
 IMAGE_EDIT_ERROR_MESSAGE = {
     ImageEditError.MISSING_SOURCE_IMAGE_NOT_FOUND: "元画像ファイルが指定されていません",
+    ImageEditError.INVALID_SOURCE_IMAGE: "元画像の形式が不正です(PNG / JPEG / WEBPのみ対応)",
+    ImageEditError.SOURCE_IMAGE_TOO_LARGE: "元画像の画素数が上限を超えています",
+    ImageEditError.SOURCE_IMAGE_NOT_FOUND: "指定された元画像が見つかりません。画像を再度アップロードしてください",
 }
 """ 画像編集処理系エラーメッセージ """
 
+JOB_ERROR_MESSAGE = {
+    JobError.JOB_QUEUE_FULL: "処理待ちのリクエストが多すぎます。時間をおいて再度実行してください",
+    JobError.JOB_NOT_FOUND: "ジョブが見つかりません",
+    JobError.JOB_INTERRUPTED: "処理が中断されました。再度実行してください",
+}
+""" 非同期ジョブ系エラーメッセージ """
+
 def get_error_message(err) -> str:
     """
     エラーレスポンスクラスごとにメッセージを取得する
@@ -72,6 +86,10 @@ def get_error_message(err) -> str:
     # ImageEditErrorの場合
     if isinstance(err, ImageEditError):
         return IMAGE_EDIT_ERROR_MESSAGE.get(err, "Unknown user error")
+
+    # JobErrorの場合
+    if isinstance(err, JobError):
+        return JOB_ERROR_MESSAGE.get(err, "Unknown job error")
     
     # その他エラー
     return "Unknown error"
\ No newline at end of file
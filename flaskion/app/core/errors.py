@@ -46,6 +46,9 @@ class AuthError(Enum):
     WEAK_PASSWORD = "weak_password"
     """ パスワードが弱すぎる """
     
+    INVALID_REFRESH_TOKEN = "invalid_refresh_token"
+    """ リフレッシュトークンが無効(存在しない・期限切れ・失効済み) """
+    
 class RequestError(Enum):
     """
     リクエスト処理で発生するエラーコード一覧
@@ -54,6 +57,9 @@ class RequestError(Enum):
     INVALID_REQUEST = "invalid_request"
     """ リクエスト無効 """
     
+    PAYLOAD_TOO_LARGE = "payload_too_large"
+    """ リクエストサイズが上限を超えている """
+    
 class UserError(Enum):
     """
     ユーザー情報登録処理で発生するエラーコード一覧
@@ -100,6 +106,12 @@ class ImageGenError(Enum):
     IMAGE_INTERNAL_ERROR = "image_internal_error"
     """ 画像生成中に予期しないエラーが発生しました。時間をおいて再度実行してください """
     
+    UPSTREAM_BUSY = "upstream_busy"
+    """ 画像生成の実行待ちが上限時間を超えた """
+    
+    INVALID_IMAGE_SIGNATURE = "invalid_image_signature"
+    """ 画像URLが無効、または有効期限切れです """
+    
 class ImageEditError(Enum):
     """
     画像編集処理で発生するエラーコード一覧
@@ -107,4 +119,26 @@ class ImageEditError(Enum):
     
     MISSING_SOURCE_IMAGE_NOT_FOUND = "missing_source_image_not_found"
     """ 元画像ファイルが指定されていない """
-    
\ No newline at end of file
+    
+    INVALID_SOURCE_IMAGE = "invalid_source_image"
+    """ 元画像の形式が不正 """
+    
+    SOURCE_IMAGE_TOO_LARGE = "source_image_too_large"
+    """ 元画像の画素数が上限を超えている """
+    
+    SOURCE_IMAGE_NOT_FOUND = "source_image_not_found"
+    """ 指定されたIDの元画像が見つからない """
+
+class JobError(Enum):
+    """
+    非同期ジョブ処理で発生するエラーコード一覧
+    """
+    
+    JOB_QUEUE_FULL = "job_queue_full"
+    """ ジョブキューが満杯 """
+    
+    JOB_NOT_FOUND = "job_not_found"
+    """ ジョブが見つからない """
+    
+    JOB_INTERRUPTED = "job_interrupted"
+    """ ジョブが完了前に中断された(ワーカーの再起動等) """
@@ -1,19 +1,24 @@
 import bcrypt
+import hashlib
+import hmac
 import jwt
 import secrets
-from flask import request, session
+from flask import g, request, session
 from http import HTTPStatus
 from jwt import ExpiredSignatureError, InvalidTokenError
 from datetime import datetime, timedelta, timezone
+from app.core.concurrency import password_pool
 from app.core.config import settings
 from app.core.errors import UserError
-from app.models.user import User
-from app.db.session import db
+from app.core.user_cache import load_user, load_user_by_api_key_digest
 
 def hash_password(password: str) -> str:
     """
     bcryptを使ってパスワードのハッシュを生成する
 
+    - コストはBCRYPT_ROUNDS
+    - 計算はネイティブスレッドで実行し、geventハブを止めない
+
     Parameters
     ----------
     
@@ -26,13 +31,16 @@ def hash_password(password: str) -> str:
         ハッシュ化されたパスワード
     """
     
-    hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
+    hashed = password_pool.run(bcrypt.hashpw, password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
 def verify_password(password: str, hashed_password: str) -> bool:
     """
     bcryptを使ってパスワードの検証を行う
 
+    - 計算はネイティブスレッドで実行し、geventハブを止めない
+
     Parameters
     ----------
     
@@ -47,7 +55,29 @@ def verify_password(password: str, hashed_password: str) -> bool:
     bool
         パスワードが一致する場合はTrue、一致しない場合はFalse
     """
-    return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+    return password_pool.run(bcrypt.checkpw, password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    ハッシュのコストがBCRYPT_ROUNDSと異なるかどうかを判定する
+
+    Parameters
+    ----------
+    
+    hashed_password : str
+        ハッシュ化されたパスワード($2b$<コスト>$...)
+        
+    Returns
+    -------
+    bool
+        再ハッシュが必要な場合はTrue
+    """
+    
+    try:
+        rounds = int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return True
+    return rounds != settings.BCRYPT_ROUNDS
 
 def create_access_token(payload: dict) -> str:
     """
@@ -92,6 +122,30 @@ def generate_api_key_value() -> str:
     """
     return secrets.token_urlsafe(32)
 
+def api_key_digest(api_key: str) -> str:
+    """
+    APIキーの照合用HMAC-SHA256を取得する
+
+    - 同じAPIキーからは常に同じ値になるため、インデックス付きの列で検索できる
+    
+    Parameters
+    ----------
+    
+    api_key : str
+        APIキー
+    
+    Returns
+    -------
+    str
+        HMAC-SHA256(16進数)
+    """
+    
+    return hmac.new(
+        settings.API_KEY_DIGEST_SECRET.encode('utf-8'),
+        api_key.encode('utf-8'),
+        hashlib.sha256
+    ).hexdigest()
+
 def decode_access_token(token: str):
     """
     JWTアクセストークンをデコードしてpayloadを返す
@@ -122,6 +176,44 @@ def decode_access_token(token: str):
         # 不正なトークン
         raise
     
+def public_endpoint(view):
+    """
+    認証ユーザーの解決が不要なエンドポイントであることを宣言するデコレーター
+    
+    - before_requestでのJWTデコード、ユーザー取得をスキップする
+    - ルート登録デコレーターの内側(下)に記述すること
+    
+    Parameters
+    ----------
+    view : Callable
+        ビュー関数
+    
+    Returns
+    -------
+    Callable
+        属性を付与したビュー関数
+    """
+    
+    view.public_endpoint = True
+    return view
+
+def is_public_endpoint(view) -> bool:
+    """
+    認証ユーザーの解決が不要なエンドポイントかどうかを判定する
+    
+    Parameters
+    ----------
+    view : Callable | None
+        ビュー関数
+    
+    Returns
+    -------
+    bool
+        public_endpointが宣言されている場合はTrue
+    """
+    
+    return getattr(view, "public_endpoint", False)
+
 def get_current_user():
     """
     AuthorizationヘッダーからJWTを取得し、
@@ -129,10 +221,33 @@ def get_current_user():
     
     - トークンが無い、無効なトークン、ユーザーが存在しない
     - 上記いずれかの場合はNoneを返す
+    - 結果はリクエスト単位でgにメモ化する(同一リクエスト内の再呼び出しはDBに問い合わせない)
+    """
+    
+    if "auth_result" not in g:
+        g.auth_result = _resolve_current_user()
+    return g.auth_result
+
+def _resolve_current_user():
+    """
+    AuthorizationヘッダーのJWT、またはX-API-KeyヘッダーのAPIキーからユーザー情報を解決する
+    
+    - Authorizationヘッダーがある場合はJWTを優先する
+    
+    Returns
+    -------
+    tuple[User | None, UserError | None, HTTPStatus | None]
+        (ユーザー情報, エラーコード, HTTPステータス)
     """
     
     # Authorizationヘッダーを取得する
     auth_header = request.headers.get("Authorization")
+
+    # APIキー認証(プログラムからの利用。ログインせずにインデックス検索1回で解決する)
+    api_key = request.headers.get("X-API-Key")
+    if not auth_header and api_key:
+        return _resolve_api_key_user(api_key)
+
     # ヘッダーの存在、ヘッダーに"Bearer "を含むか(Bearerは大文字小文字を許容)
     if not auth_header or not auth_header.lower().startswith("bearer "):
         return None, UserError.AUTH_HEADER_MISSING, HTTPStatus.UNAUTHORIZED
@@ -153,8 +268,23 @@ def get_current_user():
     if not user_id:
         return None, UserError.USER_NOT_FOUND, HTTPStatus.UNAUTHORIZED
     
-    # ユーザー情報を返す
-    return db.query(User).filter_by(id=user_id).first(), None, None
+    # ユーザー情報を返す(プロセス内キャッシュ経由)
+    return load_user(user_id), None, None
+
+def _resolve_api_key_user(api_key: str):
+    """
+    APIキーからユーザー情報を解決する
+    
+    Returns
+    -------
+    tuple[User | None, UserError | None, HTTPStatus | None]
+        (ユーザー情報, エラーコード, HTTPステータス)
+    """
+    
+    user = load_user_by_api_key_digest(api_key_digest(api_key))
+    if user is None or not user.is_active:
+        return None, UserError.INVALID_API_KEY, HTTPStatus.UNAUTHORIZED
+    return user, None, None
 
 def get_user_from_session():
     """
@@ -169,7 +299,7 @@ def get_user_from_session():
     id = session.get("id")
     if not id:
         return None
-    return db.query(User).filter_by(id=id).first()
+    return load_user(id)
     
 def mask_api_key(key: str | None) -> str:
     """
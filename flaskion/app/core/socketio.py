@@ -0,0 +1,5 @@
+from flask_socketio import SocketIO
+
+# SocketIOインスタンス(app.mainでFlaskアプリケーションに登録する)
+# - サービス層から循環importなしでイベントを送信できるように分離している
+socketio = SocketIO()
@@ -0,0 +1,16 @@
+from tempfile import SpooledTemporaryFile
+from typing import IO, Optional
+from flask import Request
+from app.core.config import settings
+
+class UploadRequest(Request):
+    """
+    アップロードファイルの受信方法を調整したリクエストクラス
+
+    - アップロードファイルはUPLOAD_SPOOL_MAX_MEMORYまでメモリに保持し、超過分は一時ファイルに退避する
+    - リクエスト全体のサイズはMAX_CONTENT_LENGTHで制限する(超過時は413)
+    """
+
+    def _get_file_stream(self, total_content_length: Optional[int], content_type: Optional[str],
+                         filename: Optional[str] = None, content_length: Optional[int] = None) -> IO[bytes]:
+        return SpooledTemporaryFile(max_size=settings.UPLOAD_SPOOL_MAX_MEMORY, mode="rb+")
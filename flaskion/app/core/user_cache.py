@@ -0,0 +1,110 @@
+from typing import Optional
+from sqlalchemy.orm import make_transient_to_detached
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import User
+from app.db.session import db
+
+# ユーザー情報キャッシュ(キー: ユーザーID文字列, 値: カラム値のスナップショット)
+_user_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS
+)
+
+# APIキー照合キャッシュ(キー: APIキーのHMAC, 値: ユーザーID)
+_api_key_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS
+)
+
+def load_user(user_id) -> Optional[User]:
+    """
+    ユーザー情報をキャッシュ経由で取得する
+
+    - キャッシュヒット時はDBに問い合わせず、現在のセッションにアタッチしたUserを返す
+    - キャッシュにはORMオブジェクトではなくカラム値のスナップショットを保持する
+      (リクエスト間でオブジェクトを共有しないため)
+
+    Parameters
+    ----------
+    user_id : UUID | str
+        ユーザーID(JWTのsub)
+
+    Returns
+    -------
+    User | None
+        ユーザー情報
+    """
+
+    key = str(user_id)
+    snapshot = _user_cache.get(key)
+    if snapshot is not None:
+        # スナップショットからDetached状態のUserを復元し、DBを読まずにセッションへ取り込む
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+    # キャッシュミス時はDBから取得する
+    user = db.query(User).filter_by(id=user_id).first()
+    if user is not None:
+        _user_cache.set(key, {
+            col.key: getattr(user, col.key)
+            for col in User.__table__.columns
+        })
+    return user
+
+def invalidate_user(user_id) -> None:
+    """
+    ユーザー情報のキャッシュを破棄する
+
+    - ユーザー情報を更新した場合はコミット後に必ず呼び出す
+
+    Parameters
+    ----------
+    user_id : UUID | str
+        ユーザーID
+    """
+
+    _user_cache.pop(str(user_id))
+
+def load_user_by_api_key_digest(digest: str) -> Optional[User]:
+    """
+    APIキーのHMACからユーザー情報をキャッシュ経由で取得する
+
+    - キャッシュミス時はuwgen_api_key_digestのインデックスで検索する
+    - ユーザー情報自体はload_userのキャッシュを使う
+
+    Parameters
+    ----------
+    digest : str
+        APIキーのHMAC-SHA256
+
+    Returns
+    -------
+    User | None
+        ユーザー情報(該当するAPIキーがない場合はNone)
+    """
+
+    user_id = _api_key_cache.get(digest)
+    if user_id is None:
+        row = db.query(User.id).filter_by(uwgen_api_key_digest=digest).first()
+        if row is None:
+            return None
+        user_id = row.id
+        _api_key_cache.set(digest, user_id)
+    return load_user(user_id)
+
+def invalidate_api_key(digest: Optional[str]) -> None:
+    """
+    APIキー照合キャッシュを破棄する
+
+    - APIキーを再発行した場合は旧キーのHMACを指定して呼び出す
+
+    Parameters
+    ----------
+    digest : str | None
+        APIキーのHMAC-SHA256
+    """
+
+    if digest:
+        _api_key_cache.pop(digest)
@@ -1,12 +1,62 @@
+import gevent
+import psycopg2
+from psycopg2 import extensions
+from gevent.socket import wait_read, wait_write
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, scoped_session
+from app.core.concurrency import is_gevent_patched
 from app.core.config import settings
 
+def gevent_wait_callback(conn, timeout=None):
+    """
+    psycopg2の待機コールバック(gevent用)
+
+    - クエリ結果・接続確立を待つ間、ソケットが読み書き可能になるまで現在のグリーンレットだけを待機させる
+      (psycopg2はC拡張のため、コールバックがないとクエリ中はハブ全体が止まる)
+
+    Parameters
+    ----------
+    conn : psycopg2.extensions.connection
+        接続
+    timeout : float | None
+        未使用(psycopg2のコールバック仕様)
+    """
+
+    while True:
+        state = conn.poll()
+        if state == extensions.POLL_OK:
+            break
+        elif state == extensions.POLL_READ:
+            wait_read(conn.fileno(), timeout=timeout)
+        elif state == extensions.POLL_WRITE:
+            wait_write(conn.fileno(), timeout=timeout)
+        else:
+            raise psycopg2.OperationalError(f"Bad result from poll: {state}")
+
+def _connect_args() -> dict:
+    """
+    接続時の引数を取得する(statement_timeoutの設定)
+    """
+
+    if settings.DB_STATEMENT_TIMEOUT_MS <= 0:
+        return {}
+    return {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+
+# gevent環境(gunicorn -k gevent)ではDB待ちの間に他のグリーンレットを実行する
+if is_gevent_patched():
+    extensions.set_wait_callback(gevent_wait_callback)
+
 # データベースエンジン
 engine = create_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
-    future=True
+    future=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    connect_args=_connect_args()
 )
 
 # セッションメーカー
@@ -17,5 +67,7 @@ SessionLocal = sessionmaker(
     future=True
 )
 
-# スレッドローカルなセッション
-db = scoped_session(SessionLocal)
+# リクエスト(グリーンレット)ごとのセッション
+# - gevent環境ではグリーンレット単位、それ以外(開発サーバー・ツール)ではスレッド単位
+# - 破棄はteardown_request(ジョブはコピーしたリクエストコンテキストのteardown)で行う
+db = scoped_session(SessionLocal, scopefunc=gevent.getcurrent if is_gevent_patched() else None)
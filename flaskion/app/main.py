@@ -1,24 +1,38 @@
 import os
 import sys
 import time
-from flask import Flask, g
-from flask_socketio import SocketIO
+from http import HTTPStatus
+from flask import Flask, g, request
+from werkzeug.exceptions import RequestEntityTooLarge
 from watchdog.events import FileSystemEventHandler
 from watchdog.observers.polling import PollingObserver
 from app.routes import register_routes
 from app.core.config import settings
+from app.core.errors import RequestError
 from app.core.logging import init_logging
-from app.core.security import get_current_user
+from app.core.security import get_current_user, is_public_endpoint
+from app.core.socketio import socketio
+from app.core.upload import UploadRequest
 from app.core.version import APP_VERSION
 from app.db.session import db
+from app.models.response.errors import ErrorResponse
 
 # FlaskアプリケーションとSocketIOの初期化
 app = Flask(__name__)
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode="gevent")
+socketio.init_app(
+    app,
+    cors_allowed_origins="*",
+    async_mode="gevent",
+    message_queue=settings.SOCKETIO_MESSAGE_QUEUE or None
+)
 
 # Flask Secret-Keyを設定
 app.config["SECRET_KEY"] = settings.SECRET_KEY
 
+# アップロードサイズ上限・受信方法を設定
+app.config["MAX_CONTENT_LENGTH"] = settings.MAX_UPLOAD_BYTES
+app.request_class = UploadRequest
+
 # ロガーを初期化する
 init_logging()
 
@@ -26,10 +40,28 @@ init_logging()
 def load_user():
     """
     リクエストごとにユーザーをロードする
+    
+    - 静的ファイル、未定義ルート、public_endpointはJWTデコード・DB問い合わせを行わない
     """
+    
+    # 静的ファイル・未定義ルート(404)はユーザーを解決しない
+    if request.endpoint is None or request.endpoint == "static":
+        return
+    
+    # 認証不要なエンドポイントはユーザーを解決しない
+    if is_public_endpoint(app.view_functions.get(request.endpoint)):
+        return
+    
     current_user, _, _ = get_current_user()
     g.current_user = current_user
 
+@app.errorhandler(RequestEntityTooLarge)
+def handle_request_entity_too_large(error):
+    """
+    リクエストサイズ上限超過(413)をJSONで返す
+    """
+    return ErrorResponse.from_error(RequestError.PAYLOAD_TOO_LARGE, HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+
 @app.context_processor
 def inject_user():
     """
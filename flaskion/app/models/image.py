@@ -0,0 +1,86 @@
+from sqlalchemy import Column, String, Float, BigInteger, TIMESTAMP, ForeignKey, Index, UniqueConstraint, text
+from sqlalchemy.dialects.postgresql import UUID
+from pydbx_hng.models.base.base_model import BaseModel
+
+class Image(BaseModel):
+    """
+    生成・編集画像のメタデータを管理するモデル
+
+    - ギャラリー一覧をディレクトリ走査せずに取得するためのインデックス
+    - 画像ファイルの書き込み時に登録する
+    """
+
+    # テーブル名指定
+    __tablename__ = "images"
+    # スキーマ名指定、インデックス定義
+    __table_args__ = (
+        UniqueConstraint("user_id", "path_type", "date_dir", "filename", name="uq_images_user_file"),
+        Index("ix_images_user_sort", "user_id", "date_dir", "mtime", "filename"),
+        Index("ix_images_user_type_sort", "user_id", "path_type", "date_dir", "mtime", "filename"),
+        Index("ix_images_content_hash", "content_hash"),
+        {"schema": "uwgen"},
+    )
+
+    # 主キー(UUIDはDB側で自動生成)
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        server_default=text("gen_random_uuid()")
+    )
+
+    # 所有ユーザーID
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("uwgen.users.id", ondelete="CASCADE"),
+        nullable=False
+    )
+
+    # 画像種類(ImagePathTypeの値)
+    path_type = Column(
+        String,
+        nullable=False
+    )
+
+    # 日付フォルダ名(YYYY-MM-DD)
+    date_dir = Column(
+        String(10),
+        nullable=False
+    )
+
+    # ファイル名
+    filename = Column(
+        String,
+        nullable=False
+    )
+
+    # ファイル更新日時(UNIXタイムスタンプ)
+    mtime = Column(
+        Float,
+        nullable=False
+    )
+
+    # ファイルサイズ(バイト)
+    size_bytes = Column(
+        BigInteger,
+        nullable=False
+    )
+
+    # 画像内容のSHA-256ハッシュ(BlobStoreの実体キー。再構築ツールで登録した画像はNULL)
+    content_hash = Column(
+        String(64),
+        nullable=True
+    )
+
+    # ユーザーごとの画像キー(配置方式の移行ツールで書き換える。NULLの場合は旧方式の位置)
+    # content_hashがある画像は実体(BlobStore)から配信する。S3ではこのキーにオブジェクトは作成しない
+    storage_key = Column(
+        String,
+        nullable=True
+    )
+
+    # 作成日時(デフォルトは現在時刻)
+    created_at = Column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=text("NOW()")
+    )
@@ -0,0 +1,79 @@
+from sqlalchemy import Column, String, TIMESTAMP, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from pydbx_hng.models.base.base_model import BaseModel
+
+class ImageJob(BaseModel):
+    """
+    画像生成・編集の非同期ジョブを管理するモデル
+
+    - ジョブの受付から完了までの状態と結果を保持する
+    - 状態はDBに保持するため、どのワーカープロセスからも参照できる
+    """
+
+    # テーブル名指定
+    __tablename__ = "image_jobs"
+    # スキーマ名指定、インデックス定義
+    __table_args__ = (
+        Index("ix_image_jobs_user_created", "user_id", "created_at"),
+        {"schema": "uwgen"},
+    )
+
+    # 主キー(UUIDはDB側で自動生成)
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        server_default=text("gen_random_uuid()")
+    )
+
+    # 所有ユーザーID
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("uwgen.users.id", ondelete="CASCADE"),
+        nullable=False
+    )
+
+    # ジョブ種類(ImagePathTypeの値)
+    kind = Column(
+        String,
+        nullable=False
+    )
+
+    # ジョブ状態(JobStatusの値)
+    status = Column(
+        String,
+        nullable=False
+    )
+
+    # 実行結果(画像参照[画像種類, 日付フォルダ名, ファイル名]のリスト。URLは取得時に署名する)
+    result = Column(
+        JSONB
+    )
+
+    # 失敗時のエラーコード
+    error_code = Column(
+        String
+    )
+
+    # 作成日時(デフォルトは現在時刻)
+    created_at = Column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=text("NOW()")
+    )
+
+    # 更新日時(デフォルトは現在時刻)
+    updated_at = Column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=text("NOW()")
+    )
+
+    # 実行開始日時
+    started_at = Column(
+        TIMESTAMP(timezone=True)
+    )
+
+    # 実行終了日時
+    finished_at = Column(
+        TIMESTAMP(timezone=True)
+    )
@@ -0,0 +1,66 @@
+from sqlalchemy import Column, String, TIMESTAMP, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import UUID
+from pydbx_hng.models.base.base_model import BaseModel
+
+class RefreshToken(BaseModel):
+    """
+    リフレッシュトークンを管理するモデル
+
+    - トークン本体は保存せず、HMAC-SHA256のみを保持する
+    - 使用するたびに失効させて新しいトークンを発行する(ローテーション)
+    - 同じサインインから派生したトークンはfamily_idで束ね、失効済みトークンの再使用時にまとめて失効させる
+    """
+
+    # テーブル名指定
+    __tablename__ = "refresh_tokens"
+    # スキーマ名指定、インデックス定義
+    __table_args__ = (
+        Index("ix_refresh_tokens_family", "family_id"),
+        Index("ix_refresh_tokens_user_expires", "user_id", "expires_at"),
+        {"schema": "uwgen"},
+    )
+
+    # 主キー(UUIDはDB側で自動生成)
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        server_default=text("gen_random_uuid()")
+    )
+
+    # 所有ユーザーID
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("uwgen.users.id", ondelete="CASCADE"),
+        nullable=False
+    )
+
+    # トークン系列ID(サインインごとに採番し、ローテーションで引き継ぐ)
+    family_id = Column(
+        UUID(as_uuid=True),
+        nullable=False
+    )
+
+    # トークンのHMAC-SHA256(16進数)
+    token_hash = Column(
+        String(64),
+        nullable=False,
+        unique=True
+    )
+
+    # 有効期限
+    expires_at = Column(
+        TIMESTAMP(timezone=True),
+        nullable=False
+    )
+
+    # 失効日時(ローテーション・ログアウト・再使用検知で設定する)
+    revoked_at = Column(
+        TIMESTAMP(timezone=True)
+    )
+
+    # 作成日時(デフォルトは現在時刻)
+    created_at = Column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=text("NOW()")
+    )
@@ -85,17 +85,23 @@ class User(BaseModel):
         info={"updatable": True}
     )
 
-    # Uwgen APIキー (暗号化)
+    # Uwgen APIキー (暗号化。発行はUserService.generate_uwgen_api_keyで行い、設定APIでは更新しない)
     uwgen_api_key = Column(
         String,
         unique=True,
         nullable=True,
-        info={"updatable": True, "encrypt": True, "key": EncryptionKeyType.UWGEN}
+        info={"encrypt": True, "key": EncryptionKeyType.UWGEN}
+    )
+    
+    # Uwgen APIキーの照合用HMAC-SHA256(X-API-Key認証でインデックス検索する)
+    uwgen_api_key_digest = Column(
+        String(64),
+        unique=True,
+        nullable=True
     )
     
     # Uwgen APIキーの最終更新日時
     uwgen_api_key_updated_at = Column(
-        TIMESTAMP(timezone=True),
-        info={"updatable": True}
+        TIMESTAMP(timezone=True)
     )
     
\ No newline at end of file
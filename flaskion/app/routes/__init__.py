@@ -30,3 +30,10 @@ def register_routes(app:Flask):
     # galleryルート
     from app.api.v1.gallery import bp as image_gallery_bp
     app.register_blueprint(image_gallery_bp)
+
+    # jobsルート
+    from app.api.v1.jobs import bp as jobs_bp
+    app.register_blueprint(jobs_bp)
+
+    # SocketIOイベントハンドラ
+    from app.api.v1 import events  # noqa: F401
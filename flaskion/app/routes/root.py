@@ -2,12 +2,13 @@ from flask import Blueprint, render_template, jsonify, request
 from typing import Any, Optional
 from pycorex.gemini_client import GeminiClient
 from app.services.image_service import ImageGenService
-from app.core.security import get_user_from_session, mask_api_key
+from app.core.security import get_user_from_session, mask_api_key, public_endpoint
 
 # Blueprint定義
 root_bp = Blueprint('root', __name__)
 
 @root_bp.get("/")
+@public_endpoint
 def index():
     """
     インデックスページを表示するルート 
@@ -20,18 +21,22 @@ def index():
     return render_template("index.html")
 
 @root_bp.get("/signin")
+@public_endpoint
 def signin():
     return render_template("signin.html", hide_nav_items=True)
 
 @root_bp.get("/signup")
+@public_endpoint
 def signup():
     return render_template("signup.html", hide_nav_items=True)
 
 @root_bp.get("/gallery")
+@public_endpoint
 def gallery():
     return render_template("gallery.html")
 
 @root_bp.get("/settings")
+@public_endpoint
 def settings():
     
     # ログインユーザーを取得
@@ -64,6 +69,7 @@ def settings():
     )
 
 @root_bp.get("/image_gen")
+@public_endpoint
 def image_gen():
     """
     画像生成ページを表示するルート
@@ -105,6 +111,7 @@ def image_gen():
     )
 
 @root_bp.get("/image_edit")
+@public_endpoint
 def image_edit():
     """
     画像編集ページを表示するルート
@@ -144,6 +151,7 @@ def image_edit():
     )
     
 @root_bp.route("/test", methods=["GET", "POST"])
+@public_endpoint
 def test():
     
     prompt:str = ""
@@ -32,5 +32,15 @@ class SigninResponseSchema(Schema):
     サインイン成功時のレスポンススキーマ
     """
     access_token = fields.String(required=True)
+    refresh_token = fields.String(required=True)
     token_type = fields.String(required=True, dump_default="Bearer")
+
+class RefreshRequestSchema(Schema):
+    """
+    トークン更新・ログアウトリクエストのバリデーションスキーマ
+    """
+    refresh_token = fields.String(
+        required=True,
+        validate=validate.Length(min=1)
+    )
     
\ No newline at end of file
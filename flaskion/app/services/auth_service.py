@@ -1,8 +1,9 @@
 from datetime import datetime, timezone
 from app.models.user import User
 from app.db.session import db
-from app.core.security import hash_password, verify_password, create_access_token
+from app.core.security import hash_password, verify_password, password_needs_rehash, create_access_token
 from app.core.errors import AuthError
+from app.core.user_cache import invalidate_user
 
 class AuthService:
     
@@ -61,15 +62,15 @@ class AuthService:
         
         # ユーザー存在チェック
         if not user:
-            return None, AuthError.INVALID_CREDENTIALS
+            return None, None, AuthError.INVALID_CREDENTIALS
         
         # パスワード検証
         if not verify_password(password, user.password_hash):
-            return None, AuthError.INVALID_CREDENTIALS
+            return None, None, AuthError.INVALID_CREDENTIALS
         
         # アカウント有効チェック
         if not user.is_active:
-            return None, AuthError.INACTIVE_ACCOUNT
+            return None, None, AuthError.INACTIVE_ACCOUNT
         
         # トークン生成
         token = create_access_token({
@@ -77,10 +78,15 @@ class AuthService:
             "email": user.email
         })
         
+        # コスト設定が変わった場合はパスワードを再ハッシュする(平文が手元にあるログイン時のみ可能)
+        if password_needs_rehash(user.password_hash):
+            user.password_hash = hash_password(password)
+        
         # 最終ログイン日時更新
         user.last_login_at = datetime.now(timezone.utc)
         db.commit()
         db.refresh(user)
+        invalidate_user(user.id)
         
         # ユーザーModel, トークン返却
         return user, token, None
\ No newline at end of file
@@ -0,0 +1,138 @@
+import json
+import libcore_hng.utils.app_logger as app_logger
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from http import HTTPStatus
+from typing import Iterator
+from flask import copy_current_request_context
+from app.core.config import settings
+from app.core.errors import ImageGenError, RequestError
+from app.core.error_messages import get_error_message
+from app.models.user import User
+from app.services.image_service import ImageGenService
+
+class ImageBatchService:
+    """
+    複数の画像生成リクエストをまとめて実行するサービス
+
+    - 各アイテムのGemini呼び出しを並列に実行し、完了した順に結果を返す
+    - ユーザーごとの同時実行数はGeminiScheduler(GEMINI_USER_CONCURRENCY)で制限する
+      (同一ユーザーの複数バッチ・ジョブをまたいで適用する。ワーカープロセスごと)
+    - 画像の保存は単体生成と同じImageGenService.run_generateで行う
+    """
+
+    @staticmethod
+    def prepare(current_user: User, items) -> tuple:
+        """
+        バッチの入力チェックを行う
+
+        - リスト自体が不正な場合のみエラーを返す
+        - 個々のアイテムの入力エラーは結果ストリームでアイテムごとに返す
+
+        Parameters
+        ----------
+        current_user : User
+            ログインユーザー
+        items : Any
+            画像生成パラメーターのリスト
+
+        Returns
+        -------
+        tuple
+            成功時は(アイテムごとの準備結果リスト, HTTPStatus.OK)、失敗時は(エラーコード, HTTPステータス)
+        """
+
+        if not isinstance(items, list) or not items or len(items) > settings.BATCH_MAX_ITEMS:
+            app_logger.warning(f"[ImageBatchService] Invalid batch. user_id={current_user.id}")
+            return RequestError.INVALID_REQUEST, HTTPStatus.BAD_REQUEST
+
+        prepared = [
+            ImageGenService.prepare_generate(current_user, item if isinstance(item, dict) else {})
+            for item in items
+        ]
+        return prepared, HTTPStatus.OK
+
+    @staticmethod
+    def stream(current_user_id, prepared: list[tuple]) -> Iterator[str]:
+        """
+        バッチを実行し、完了した順に結果をNDJSONで返す
+
+        - リクエストコンテキスト内(stream_with_context)で反復すること
+
+        Parameters
+        ----------
+        current_user_id : UUID | str
+            ユーザーID
+        prepared : list[tuple]
+            prepareで作成したアイテムごとの準備結果
+
+        Yields
+        ------
+        str
+            1アイテム分の結果(JSON+改行)。最後にサマリー行を返す
+        """
+
+        app_logger.info(f"[ImageBatchService] Start batch. user_id={current_user_id} count={len(prepared)}")
+        succeeded = failed = 0
+
+        # 入力エラーのアイテムは即時に返す
+        runnable = []
+        for index, (result, status) in enumerate(prepared):
+            if status == HTTPStatus.OK:
+                runnable.append((index, result))
+            else:
+                failed += 1
+                yield ImageBatchService._line(index, result, status)
+
+        if runnable:
+            # ユーザー上限を超えるスレッドは実行枠を待つだけのため、上限と同数にする
+            workers = min(settings.GEMINI_USER_CONCURRENCY, len(runnable))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-batch") as executor:
+                futures = {
+                    executor.submit(ImageBatchService._task(current_user_id, params, api_key)): index
+                    for index, (params, api_key) in runnable
+                }
+                for future in as_completed(futures):
+                    try:
+                        result, status = future.result()
+                    except Exception as e:
+                        app_logger.error(e)
+                        result, status = ImageGenError.IMAGE_INTERNAL_ERROR, HTTPStatus.INTERNAL_SERVER_ERROR
+
+                    if status == HTTPStatus.OK:
+                        succeeded += 1
+                    else:
+                        failed += 1
+                    yield ImageBatchService._line(futures[future], result, status)
+
+        app_logger.info(f"[ImageBatchService] Batch completed. user_id={current_user_id} succeeded={succeeded} failed={failed}")
+        yield json.dumps({"done": True, "succeeded": succeeded, "failed": failed}) + "\n"
+
+    @staticmethod
+    def _task(current_user_id, params, api_key: str):
+        """
+        1アイテム分の実行処理を作成する
+
+        - url_for(_external=True)のため、リクエストコンテキストをタスクごとに複製して引き継ぐ
+        """
+
+        @copy_current_request_context
+        def run():
+            return ImageGenService.run_generate(current_user_id, api_key, params)
+
+        return run
+
+    @staticmethod
+    def _line(index: int, result, status: HTTPStatus) -> str:
+        """
+        1アイテム分の結果行を作成する
+        """
+
+        if status == HTTPStatus.OK:
+            data = {"index": index, "status": "succeeded", "generated": result}
+        else:
+            data = {
+                "index": index,
+                "status": "failed",
+                "error": {"errors": result.value, "message": get_error_message(result)},
+            }
+        return json.dumps(data, ensure_ascii=False) + "\n"
@@ -0,0 +1,96 @@
+import hashlib
+import mimetypes
+from pathlib import PurePosixPath
+from app.core.concurrency import io_pool
+from app.core.config import settings
+from app.storage.factory import get_storage
+
+class BlobStore:
+    """
+    内容アドレス方式(SHA-256)で画像バイナリを保存するサービス
+
+    - 実体はキー <MEDIA_BLOB_DIR>/<ハッシュ先頭2桁>/<次の2桁>/<ハッシュ>.<拡張子> に1つだけ保存する
+    - ローカルストレージではユーザーごとの画像キー(<user>/<種類>/<日付>/<ファイル名>)に
+      ハードリンク(非対応の場合はコピー)で参照を作成する。S3では参照を作成しない(実体のみ)
+    - 同一内容の画像(リトライ、元画像をそのまま返す編集等)はユーザーをまたいで実体を共有する
+    - 画像取得(get_image)はインデックス(images.content_hash)から実体のキーを求めて読む
+    """
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        """
+        バイナリのSHA-256ハッシュを取得する
+        """
+
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def blob_key(content_hash: str, suffix: str) -> str:
+        """
+        実体のストレージキーを取得する
+
+        Parameters
+        ----------
+        content_hash : str
+            SHA-256ハッシュ(16進数)
+        suffix : str
+            拡張子(.png等)
+
+        Returns
+        -------
+        str
+            実体のストレージキー
+        """
+
+        return f"{settings.MEDIA_BLOB_DIR}/{content_hash[:2]}/{content_hash[2:4]}/{content_hash}{suffix}"
+
+    @staticmethod
+    def store_many(items: list[tuple[str, bytes]]) -> list[str]:
+        """
+        複数の画像を実体として保存し、参照を作成する(参照を持たないストレージでは実体のみ。並列・ネイティブスレッドで実行)
+
+        Parameters
+        ----------
+        items : list[tuple[str, bytes]]
+            (参照キー, バイナリ)のリスト
+
+        Returns
+        -------
+        list[str]
+            画像のSHA-256ハッシュ(入力順)
+        """
+
+        return io_pool.map(lambda item: BlobStore.store(*item), items)
+
+    @staticmethod
+    def store(ref_key: str, data: bytes) -> str:
+        """
+        画像を実体として保存し、参照を作成する(参照を持たないストレージでは実体のみ)
+
+        - 同一内容の実体が既にある場合は書き込まない
+        - 実体・既存の参照の更新日時は変更しない(配信時のETag/Last-Modifiedは内容ハッシュ・登録日時から作成する)
+
+        Parameters
+        ----------
+        ref_key : str
+            参照キー
+        data : bytes
+            バイナリ
+
+        Returns
+        -------
+        str
+            SHA-256ハッシュ
+        """
+
+        storage = get_storage()
+        content_hash = BlobStore.digest(data)
+        blob_key = BlobStore.blob_key(content_hash, PurePosixPath(ref_key).suffix)
+
+        # 実体を保存する(既存の場合は残す)
+        if not storage.exists(blob_key):
+            storage.put(blob_key, data, content_type=mimetypes.guess_type(ref_key)[0], overwrite=False)
+
+        # 参照を作成する
+        storage.link(blob_key, ref_key)
+        return content_hash
@@ -0,0 +1,152 @@
+import io
+import libcore_hng.utils.app_logger as app_logger
+from pathlib import PurePosixPath
+from typing import Optional
+from PIL import Image as PIL_image
+from app.core.concurrency import io_pool
+from app.core.config import settings
+from app.core.enums import ImageVariant
+from app.storage.factory import get_storage
+
+class DerivativeService:
+    """
+    ギャラリー配信用の派生画像(サムネイル/プレビュー)を生成するサービス
+
+    - 派生画像は元画像と同じフォルダ内の隠しディレクトリ(キー)に保存する
+      <元画像のフォルダ>/.derivatives/<variant>/<元画像のstem>.<拡張子>
+      (インデックス登録済みの画像は実体(BlobStore)のフォルダ。同一内容の画像で共有する)
+    - 画像保存時に生成し、未生成の画像(導入前の画像等)は初回要求時に生成する
+    """
+
+    # 派生画像ディレクトリ名
+    DERIVATIVE_DIR = ".derivatives"
+
+    # 派生画像形式ごとの拡張子・MIMEタイプ
+    FORMATS = {
+        "WEBP": ("webp", "image/webp"),
+        "JPEG": ("jpg", "image/jpeg"),
+    }
+
+    @staticmethod
+    def max_edge(variant: ImageVariant) -> int:
+        """
+        派生画像の長辺ピクセル数を取得する
+        """
+
+        if variant == ImageVariant.THUMB:
+            return settings.THUMBNAIL_MAX_EDGE
+        return settings.PREVIEW_MAX_EDGE
+
+    @staticmethod
+    def mimetype() -> str:
+        """
+        派生画像のMIMEタイプを取得する
+        """
+
+        return DerivativeService.FORMATS[settings.DERIVATIVE_FORMAT][1]
+
+    @staticmethod
+    def derivative_key(original_key: str, variant: ImageVariant) -> str:
+        """
+        派生画像のストレージキーを取得する
+
+        Parameters
+        ----------
+        original_key : str
+            元画像のストレージキー
+        variant : ImageVariant
+            派生画像種類
+
+        Returns
+        -------
+        str
+            派生画像のストレージキー
+        """
+
+        original = PurePosixPath(original_key)
+        ext = DerivativeService.FORMATS[settings.DERIVATIVE_FORMAT][0]
+        return str(original.parent / DerivativeService.DERIVATIVE_DIR / variant.value / f"{original.stem}.{ext}")
+
+    @staticmethod
+    def create_many(items: list[tuple[str, bytes]]) -> None:
+        """
+        保存した画像の派生画像をまとめて生成する
+
+        - 生成に失敗しても元画像の保存結果には影響させない(初回要求時に再生成される)
+
+        Parameters
+        ----------
+        items : list[tuple[str, bytes]]
+            (元画像のストレージキー, 元画像バイナリ)のリスト
+        """
+
+        try:
+            io_pool.map(lambda item: DerivativeService._create(*item), items)
+        except Exception as e:
+            app_logger.error(f"[DerivativeService] Derivative generation failed. error={e}")
+
+    @staticmethod
+    def get_or_create(original_key: str, variant: ImageVariant) -> str:
+        """
+        派生画像のストレージキーを取得する(未生成の場合は生成する)
+
+        Parameters
+        ----------
+        original_key : str
+            元画像のストレージキー(存在チェック済み)
+        variant : ImageVariant
+            派生画像種類(ORIGINAL以外)
+
+        Returns
+        -------
+        str
+            派生画像のストレージキー
+        """
+
+        key = DerivativeService.derivative_key(original_key, variant)
+        if not io_pool.run(get_storage().exists, key):
+            io_pool.run(DerivativeService._create, original_key, None, (variant,))
+        return key
+
+    @staticmethod
+    def _create(original_key: str, data: Optional[bytes], variants: tuple = (ImageVariant.THUMB, ImageVariant.MEDIUM)) -> None:
+        """
+        派生画像を生成して保存する(ネイティブスレッドで実行される)
+
+        Parameters
+        ----------
+        original_key : str
+            元画像のストレージキー
+        data : bytes | None
+            元画像バイナリ(Noneの場合はストレージから読み込む)
+        variants : tuple[ImageVariant]
+            生成する派生画像種類
+        """
+
+        storage = get_storage()
+        if data is None:
+            with storage.open(original_key) as f:
+                data = f.read()
+
+        source = PIL_image.open(io.BytesIO(data))
+        source.load()
+
+        # JPEGは透過を扱えないためRGBに変換する
+        if settings.DERIVATIVE_FORMAT == "JPEG" and source.mode != "RGB":
+            source = source.convert("RGB")
+        elif source.mode not in ("RGB", "RGBA"):
+            source = source.convert("RGBA")
+
+        for variant in variants:
+            edge = DerivativeService.max_edge(variant)
+            image = source.copy()
+            image.thumbnail((edge, edge), PIL_image.Resampling.LANCZOS)
+
+            buffer = io.BytesIO()
+            image.save(buffer, format=settings.DERIVATIVE_FORMAT, quality=settings.DERIVATIVE_QUALITY)
+
+            storage.put(
+                DerivativeService.derivative_key(original_key, variant),
+                buffer.getvalue(),
+                content_type=DerivativeService.mimetype()
+            )
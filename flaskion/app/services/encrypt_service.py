@@ -1,10 +1,15 @@
+import hashlib
 import os
 from cryptography.fernet import Fernet
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.enums import EncryptionKeyType
 
 class EncryptService:
     """
     カラムごとに異なる暗号鍵を使い分ける暗号化サービス
+    
+    - 復号結果は暗号文のダイジェストをキーとしてメモリ上にのみキャッシュする(永続化しない)
     """
     
     _ciphers = {
@@ -12,6 +17,12 @@ class EncryptService:
         EncryptionKeyType.UWGEN: Fernet(os.environ["UWGEN_KEY_SECRET"]),
     }
     
+    # 復号結果キャッシュ(キー: (鍵タイプ, 暗号文のSHA-256), 値: 平文)
+    _plaintext_cache = TTLCache(
+        maxsize=settings.DECRYPT_CACHE_MAX_SIZE,
+        ttl=settings.DECRYPT_CACHE_TTL_SECONDS
+    )
+    
     @classmethod
     def encrypt(cls, plaintext: str, key_type: EncryptionKeyType) -> str:
         """
@@ -51,5 +62,36 @@ class EncryptService:
             復号化された暗号化文字列
         """
 
+        # キャッシュヒット時は復号しない
+        cache_key = cls._cache_key(ciphertext, key_type)
+        plaintext = cls._plaintext_cache.get(cache_key)
+        if plaintext is not None:
+            return plaintext
+
         cipher = cls._ciphers[key_type]
-        return cipher.decrypt(ciphertext.encode()).decode()
\ No newline at end of file
+        plaintext = cipher.decrypt(ciphertext.encode()).decode()
+        cls._plaintext_cache.set(cache_key, plaintext)
+        return plaintext
+    
+    @classmethod
+    def forget(cls, ciphertext: str, key_type: EncryptionKeyType) -> None:
+        """
+        指定された暗号文の復号結果をキャッシュから破棄する
+        
+        Parameters
+        ----------
+        ciphertext : str
+            暗号化された文字列
+        key_type : str
+            暗号鍵タイプ
+        """
+        
+        cls._plaintext_cache.pop(cls._cache_key(ciphertext, key_type))
+    
+    @staticmethod
+    def _cache_key(ciphertext: str, key_type: EncryptionKeyType) -> tuple:
+        """
+        復号結果キャッシュのキーを取得する(暗号文そのものは保持しない)
+        """
+        
+        return key_type, hashlib.sha256(ciphertext.encode()).hexdigest()
\ No newline at end of file
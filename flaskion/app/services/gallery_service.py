@@ -1,61 +1,143 @@
-from flask import url_for
-from app.core.config import settings
-from app.core.enums import ImagePathType
-from app.services.image_service import ImageGenService
+import base64
+import json
+from typing import Optional
+from app.core.enums import ImagePathType, ImageVariant
+from app.services.image_index_service import ImageIndexService
+from app.services.image_url_service import ImageUrlService
 
 class GalleryService:
-    
+
     @staticmethod
-    def get_user_images(current_user_id, filter_type, sort_order, offset=0, limit=20):
-        
-        # 画像保存ルートパス取得
-        root_path = ImageGenService.get_root_image_path(current_user_id)
-        
-        targets = []
+    def get_user_images(current_user_id, filter_type, sort_order, offset=0, limit=20, cursor: Optional[str] = None):
+        """
+        ユーザーの画像一覧を1ページ分取得する
+
+        Parameters
+        ----------
+        current_user_id : UUID | str
+            ユーザーID
+        filter_type : str
+            画像種類フィルタ(all / gen / edit)
+        sort_order : str
+            並び順(newest / oldest)
+        offset : int
+            読み飛ばす件数(オフセットモード)
+        limit : int
+            取得件数
+        cursor : str | None
+            前ページのnext_cursor(カーソルモード)。空文字は先頭ページ
+
+        Returns
+        -------
+        dict
+            images, total(カーソルモードではNone), next_cursor, has_more
+
+        Raises
+        ------
+        ValueError
+            カーソルが不正な場合
+        """
+
+        # 対象の画像種類
+        path_types = []
         if filter_type in ("all", ImagePathType.GENERATED.value):
-            targets.append((ImagePathType.GENERATED.value, settings.GEN_IMAGE_DIR))
+            path_types.append(ImagePathType.GENERATED.value)
         if filter_type in ("all", ImagePathType.EDITED.value):
-            targets.append((ImagePathType.EDITED.value, settings.EDIT_IMAGE_DIR))
-            
-        results = []
-        
-        for img_type, dir_name in targets:
-            img_dir = root_path / str(dir_name)
-            if not img_dir.exists():
-                continue
-            
-            # 日付フォルダを走査
-            for date_dir in sorted(img_dir.iterdir()):
-                if not date_dir.is_dir():
-                    continue
-                
-                for img_file in date_dir.iterdir():
-                    if img_file.is_file():
-                        public_url = url_for(
-                            "image_gen_api.get_image",
-                            path_type=img_type,
-                            date_dir=date_dir.name,
-                            image_id=img_file.name,
-                            _external=False
-                        )
-                        results.append({
-                            "path": public_url,
-                            "type": img_type,
-                            "date": date_dir.name,
-                            "mtime": img_file.stat().st_mtime
-                        })
-        
-        # ソート
-        reverse = (sort_order == "newest")
-        results.sort(
-            key=lambda x: (x["date"], x["mtime"]), 
-            reverse=reverse
+            path_types.append(ImagePathType.EDITED.value)
+
+        # カーソルモードでは前ページ末尾の続きから取得する
+        cursor_mode = cursor is not None
+        after = GalleryService.decode_cursor(cursor) if cursor else None
+
+        # インデックスから1ページ分を取得(次ページ有無の判定用に1件多く取得する)
+        rows = ImageIndexService.fetch_page(
+            current_user_id=current_user_id,
+            path_types=path_types,
+            newest=(sort_order == "newest"),
+            after=after,
+            offset=0 if cursor_mode else offset,
+            limit=limit + 1
         )
-        
-        # ページング
-        paged = results[offset: offset + limit]
-        
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        results = []
+        for row in rows:
+            # 署名付きURL(imgタグから認証ヘッダーなしで取得できる)
+            url_args = (current_user_id, row.path_type, row.date_dir, row.filename)
+            results.append({
+                "path": ImageUrlService.build(*url_args),
+                "thumbnail": ImageUrlService.build(*url_args, variant=ImageVariant.THUMB),
+                "preview": ImageUrlService.build(*url_args, variant=ImageVariant.MEDIUM),
+                "source_image_id": row.content_hash,
+                "type": row.path_type,
+                "date": row.date_dir,
+                "mtime": row.mtime
+            })
+
+        # 次ページのカーソル
+        next_cursor = None
+        if has_more and rows:
+            last = rows[-1]
+            next_cursor = GalleryService.encode_cursor(last.date_dir, last.mtime, last.filename)
+
+        # 総件数はオフセットモードのみ算出する(カーソルモードではページごとの件数走査を避ける)
+        total = None if cursor_mode else ImageIndexService.count(current_user_id, path_types)
+
         return {
-            "images": paged,
-            "total": len(results)
-        }
\ No newline at end of file
+            "images": results,
+            "total": total,
+            "next_cursor": next_cursor,
+            "has_more": has_more
+        }
+
+    @staticmethod
+    def encode_cursor(date_dir: str, mtime: float, filename: str) -> str:
+        """
+        ソートキーを不透明なカーソル文字列に変換する
+
+        Parameters
+        ----------
+        date_dir : str
+            日付フォルダ名
+        mtime : float
+            ファイル更新日時
+        filename : str
+            ファイル名
+
+        Returns
+        -------
+        str
+            URLセーフなカーソル文字列
+        """
+
+        raw = json.dumps([date_dir, mtime, filename], separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple[str, float, str]:
+        """
+        カーソル文字列をソートキーに復元する
+
+        Parameters
+        ----------
+        cursor : str
+            encode_cursorで生成したカーソル文字列
+
+        Returns
+        -------
+        tuple[str, float, str]
+            (date_dir, mtime, filename)
+
+        Raises
+        ------
+        ValueError
+            カーソルが不正な場合
+        """
+
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            date_dir, mtime, filename = json.loads(base64.urlsafe_b64decode(padded))
+            return str(date_dir), float(mtime), str(filename)
+        except Exception as e:
+            raise ValueError(f"Invalid gallery cursor: {cursor}") from e
@@ -0,0 +1,77 @@
+import hashlib
+from pycorex.gemini_client import GeminiClient
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+class GeminiClientPool:
+    """
+    GeminiClientをユーザー・APIキー単位で再利用するプール
+
+    - キーは(ユーザーID, APIキーのフィンガープリント)。平文のAPIキーはキーに含めない
+    - 再利用によりHTTPコネクションプール・TLSセッションを使い回す
+    - 上限件数・有効期限付き。APIキー変更時はinvalidateで破棄する
+    """
+
+    _clients = TTLCache(
+        maxsize=settings.GEMINI_CLIENT_POOL_SIZE,
+        ttl=settings.GEMINI_CLIENT_TTL_SECONDS
+    )
+
+    @staticmethod
+    def get(current_user_id, api_key: str) -> GeminiClient:
+        """
+        GeminiClientを取得する(未生成の場合は生成してプールする)
+
+        Parameters
+        ----------
+        current_user_id : UUID | str
+            ユーザーID
+        api_key : str
+            復号済みGemini APIキー
+
+        Returns
+        -------
+        GeminiClient
+            GeminiClientインスタンス
+        """
+
+        key = (str(current_user_id), GeminiClientPool.fingerprint(api_key))
+        client = GeminiClientPool._clients.get(key)
+        if client is None:
+            client = GeminiClient(
+                api_key=api_key
+            )
+            GeminiClientPool._clients.set(key, client)
+        return client
+
+    @staticmethod
+    def invalidate(current_user_id) -> None:
+        """
+        ユーザーのGeminiClientを破棄する
+
+        Parameters
+        ----------
+        current_user_id : UUID | str
+            ユーザーID
+        """
+
+        user_key = str(current_user_id)
+        GeminiClientPool._clients.pop_matching(lambda key: key[0] == user_key)
+
+    @staticmethod
+    def fingerprint(api_key: str) -> str:
+        """
+        APIキーのフィンガープリントを取得する
+
+        Parameters
+        ----------
+        api_key : str
+            APIキー
+
+        Returns
+        -------
+        str
+            SHA-256ダイジェストの先頭16文字
+        """
+
+        return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
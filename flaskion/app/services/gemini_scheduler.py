@@ -0,0 +1,244 @@
+import threading
+import libcore_hng.utils.app_logger as app_logger
+from collections import deque
+from contextlib import contextmanager
+from typing import Optional
+from pycorex.gemini_client import GeminiClient
+from app.core.config import settings
+
+class GeminiSchedulerTimeout(Exception):
+    """
+    実行枠を待機時間内に確保できなかった場合の例外
+    """
+    pass
+
+class _Waiter:
+    """
+    実行待ちのGemini呼び出し
+    """
+
+    def __init__(self, user_key: str, finish_tag: float):
+        self.user_key = user_key
+        self.finish_tag = finish_tag
+        self.start_tag = 0.0
+        self.event = threading.Event()
+        self.dispatched = False
+
+class GeminiScheduler:
+    """
+    Gemini呼び出しの実行枠を割り当てるスケジューラー(重み付き公平キューイング)
+
+    - 全体の同時実行数をGEMINI_MAX_CONCURRENCY、ユーザーごとの同時実行数をGEMINI_USER_CONCURRENCYで制限する
+    - 空いた枠は、ユーザーごとの仮想終了時刻(これまでの利用量の累計)が最も小さい呼び出しに割り当てる
+      (大量に投入したユーザーの待ち行列が、他のユーザーの呼び出しを後ろに押し出さない)
+    - 呼び出しのコストは出力解像度で重み付けする(1K=1, 2K=2, 4K=4)
+    - ワーカープロセスごとのスケジューラー(gevent環境ではグリーンレットを待機させる)
+    """
+
+    # 出力解像度ごとのコスト
+    COSTS = {
+        GeminiClient.ImageSize.ONE_K: 1.0,
+        GeminiClient.ImageSize.TWO_K: 2.0,
+        GeminiClient.ImageSize.FOUR_K: 4.0,
+    }
+
+    _lock = threading.Lock()
+
+    # 仮想時刻(最後に割り当てた呼び出しの開始タグ)
+    _virtual_time = 0.0
+
+    # ユーザーごとの最終仮想終了時刻
+    _finish_tags: dict[str, float] = {}
+
+    # ユーザーごとの実行待ち(仮想終了時刻順)
+    _queues: dict[str, deque] = {}
+
+    # 実行中の件数(全体, ユーザーごと)
+    _running = 0
+    _user_running: dict[str, int] = {}
+
+    @staticmethod
+    def cost(image_size: Optional[GeminiClient.ImageSize]) -> float:
+        """
+        出力解像度に対応するコストを取得する(Noneや不明な値は1K)
+        """
+
+        return GeminiScheduler.COSTS.get(image_size, GeminiScheduler.COSTS[GeminiClient.ImageSize.ONE_K])
+
+    @staticmethod
+    @contextmanager
+    def slot(current_user_id, cost: float = 1.0, timeout: Optional[float] = None):
+        """
+        Gemini呼び出しの実行枠を確保する(withブロックを抜けると解放する)
+
+        Parameters
+        ----------
+        current_user_id : UUID | str
+            ユーザーID
+        cost : float
+            呼び出しのコスト
+        timeout : float | None
+            待機時間の上限秒(Noneの場合はGEMINI_QUEUE_TIMEOUT_SECONDS)
+
+        Raises
+        ------
+        GeminiSchedulerTimeout
+            待機時間内に実行枠を確保できなかった場合
+        """
+
+        user_key = str(current_user_id)
+        GeminiScheduler._acquire(user_key, cost, settings.GEMINI_QUEUE_TIMEOUT_SECONDS if timeout is None else timeout)
+        try:
+            yield
+        finally:
+            GeminiScheduler._release(user_key)
+
+    @staticmethod
+    def stats() -> dict:
+        """
+        現在の実行数・待機数を取得する(ログ・監視用)
+        """
+
+        with GeminiScheduler._lock:
+            return {
+                "running": GeminiScheduler._running,
+                "waiting": sum(len(q) for q in GeminiScheduler._queues.values()),
+                "users": len(set(GeminiScheduler._queues) | set(GeminiScheduler._user_running)),
+            }
+
+    @staticmethod
+    def _acquire(user_key: str, cost: float, timeout: float) -> None:
+        """
+        実行待ちに登録し、実行枠が割り当てられるまで待機する
+        """
+
+        with GeminiScheduler._lock:
+            # 仮想開始時刻は、仮想時刻とユーザーの直前の終了時刻の遅い方
+            start_tag = max(GeminiScheduler._virtual_time, GeminiScheduler._finish_tags.get(user_key, 0.0))
+            waiter = _Waiter(user_key, start_tag + max(cost, 0.0))
+            waiter.start_tag = start_tag
+            GeminiScheduler._finish_tags[user_key] = waiter.finish_tag
+            GeminiScheduler._queues.setdefault(user_key, deque()).append(waiter)
+            GeminiScheduler._dispatch()
+
+        try:
+            if waiter.event.wait(timeout if timeout > 0 else None):
+                return
+        except BaseException:
+            # 待機中に中断された場合(グリーンレットのkill・リクエストのタイムアウト等)は
+            # 実行待ちから取り除き、割り当て済みの実行枠は解放する
+            if GeminiScheduler._cancel(waiter):
+                GeminiScheduler._release(user_key)
+            raise
+
+        # 待機終了と割り当てが競合した場合は割り当てを優先する
+        if GeminiScheduler._cancel(waiter):
+            return
+
+        app_logger.warning(f"[GeminiScheduler] Queue timeout. user_id={user_key} timeout={timeout}")
+        raise GeminiSchedulerTimeout(f"Gemini scheduler queue timeout. user_id={user_key}")
+
+    @staticmethod
+    def _release(user_key: str) -> None:
+        """
+        実行枠を解放し、次の呼び出しに割り当てる
+        """
+
+        with GeminiScheduler._lock:
+            GeminiScheduler._running -= 1
+            remaining = GeminiScheduler._user_running.get(user_key, 1) - 1
+            if remaining > 0:
+                GeminiScheduler._user_running[user_key] = remaining
+            else:
+                GeminiScheduler._user_running.pop(user_key, None)
+            GeminiScheduler._dispatch()
+            GeminiScheduler._forget_idle()
+
+    @staticmethod
+    def _dispatch() -> None:
+        """
+        空いている実行枠を、仮想終了時刻が最も小さい実行待ちに割り当てる(ロック内で呼び出す)
+        """
+
+        while GeminiScheduler._running < settings.GEMINI_MAX_CONCURRENCY:
+            # ユーザー上限に達していないユーザーの先頭のうち、仮想終了時刻が最小のもの
+            candidate = None
+            for user_key, queue in GeminiScheduler._queues.items():
+                if GeminiScheduler._user_running.get(user_key, 0) >= settings.GEMINI_USER_CONCURRENCY:
+                    continue
+                head = queue[0]
+                if candidate is None or head.finish_tag < candidate.finish_tag:
+                    candidate = head
+            if candidate is None:
+                return
+
+            queue = GeminiScheduler._queues[candidate.user_key]
+            queue.popleft()
+            if not queue:
+                del GeminiScheduler._queues[candidate.user_key]
+
+            GeminiScheduler._virtual_time = max(GeminiScheduler._virtual_time, candidate.start_tag)
+            GeminiScheduler._running += 1
+            GeminiScheduler._user_running[candidate.user_key] = GeminiScheduler._user_running.get(candidate.user_key, 0) + 1
+            candidate.dispatched = True
+            candidate.event.set()
+
+    @staticmethod
+    def _cancel(waiter: _Waiter) -> bool:
+        """
+        待機を打ち切る(割り当て済みでなければ実行待ちから取り除く)
+
+        Returns
+        -------
+        bool
+            既に実行枠が割り当てられていた場合はTrue(呼び出し元で使用または解放する)
+        """
+
+        with GeminiScheduler._lock:
+            if waiter.dispatched:
+                return True
+            GeminiScheduler._remove(waiter)
+            return False
+
+    @staticmethod
+    def _remove(waiter: _Waiter) -> None:
+        """
+        待機を打ち切った呼び出しを実行待ちから取り除く(ロック内で呼び出す)
+
+        - 取り除いた分のコストはユーザーの仮想終了時刻から差し引かない(待機した時間は利用量とみなす)
+        """
+
+        queue = GeminiScheduler._queues.get(waiter.user_key)
+        if queue is None:
+            return
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            return
+        if not queue:
+            del GeminiScheduler._queues[waiter.user_key]
+        GeminiScheduler._forget_idle()
+
+    @staticmethod
+    def _forget_idle() -> None:
+        """
+        実行中・実行待ちがなく、仮想時刻に追い越されたユーザーの終了時刻を破棄する(ロック内で呼び出す)
+
+        - 破棄しても次回はmax(仮想時刻, 0)から始まるため、結果は変わらない
+        - 実行中・実行待ちがなくなった場合は、仮想時刻を最大の終了時刻まで進めてすべて破棄する
+        """
+
+        if GeminiScheduler._running == 0 and not GeminiScheduler._queues:
+            if GeminiScheduler._finish_tags:
+                GeminiScheduler._virtual_time = max(GeminiScheduler._virtual_time, *GeminiScheduler._finish_tags.values())
+                GeminiScheduler._finish_tags.clear()
+            return
+
+        idle = [
+            user_key for user_key, finish_tag in GeminiScheduler._finish_tags.items()
+            if finish_tag <= GeminiScheduler._virtual_time
+            and user_key not in GeminiScheduler._queues
+            and user_key not in GeminiScheduler._user_running
+        ]
+        for user_key in idle:
+            del GeminiScheduler._finish_tags[user_key]
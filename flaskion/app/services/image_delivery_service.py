@@ -0,0 +1,233 @@
+import mimetypes
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+from flask import Response, redirect, request, send_file
+from werkzeug.http import is_resource_modified
+from app.core.config import settings
+from app.core.enums import ImageDeliveryMode, ImageVariant
+from app.models.image import Image
+from app.storage.factory import get_storage
+
+class ImageDeliveryService:
+    """
+    画像ファイルの配信レスポンスを作成するサービス
+
+    - 画像ファイル名はタイムスタンプ+UUIDで上書きされないため、不変リソースとして配信する
+    - ETagは画像内容のSHA-256、Last-Modifiedはインデックスの登録日時から作成する
+      (実体を共有する他の参照が作成されても変わらない。インデックス未登録・ハッシュ未登録の画像はstatから作成する)
+    - If-None-Match / If-Modified-Since が一致する場合はファイルを開かずに304を返す
+    - Rangeリクエストはsend_file(conditional=True)で206を返す
+    - IMAGE_DELIVERY_MODEがdirect以外の場合、ファイル本体の送信はフロントプロキシに委譲する
+      (ワーカーは認証・パス検証・ヘッダー作成のみ行う)
+    """
+
+    @staticmethod
+    def send_object(key: str, mimetype: Optional[str] = None, private: bool = True,
+                    max_age: Optional[int] = None, etag: Optional[str] = None,
+                    last_modified: Optional[datetime] = None) -> Response:
+        """
+        ストレージ上の画像の配信レスポンスを作成する
+
+        - ローカルストレージ: sendで配信する
+        - ローカル以外(S3等): 期限付きURLへリダイレクトする(アプリを経由せずに配信する)
+
+        Parameters
+        ----------
+        key : str
+            ストレージキー(存在チェック済み)
+        mimetype : str | None
+            MIMEタイプ(ローカルストレージのみ使用)
+        private : bool
+            共有キャッシュ(CDN・プロキシ)への保存を禁止するかどうか
+        max_age : int | None
+            キャッシュ有効期間(秒)。Noneの場合はIMAGE_CACHE_MAX_AGE
+        etag : str | None
+            ETag(Noneの場合はファイル情報から作成する)
+        last_modified : datetime | None
+            更新日時(Noneの場合はファイルの更新日時)
+
+        Returns
+        -------
+        Response
+            配信レスポンス
+        """
+
+        storage = get_storage()
+        file_path = storage.local_path(key)
+        if file_path is not None:
+            return ImageDeliveryService.send(
+                file_path, mimetype=mimetype, private=private, max_age=max_age,
+                etag=etag, last_modified=last_modified
+            )
+
+        # 期限付きURLより長くリダイレクトをキャッシュさせない
+        expires_in = settings.S3_PRESIGN_EXPIRE_SECONDS
+        response = redirect(storage.presigned_url(key, expires_in), code=302)
+        response.headers["Cache-Control"] = f"private, max-age={max(expires_in // 2, 0)}"
+        return response
+
+    @staticmethod
+    def send(file_path: Path, mimetype: Optional[str] = None, private: bool = True,
+             max_age: Optional[int] = None, etag: Optional[str] = None,
+             last_modified: Optional[datetime] = None) -> Response:
+        """
+        画像ファイルの配信レスポンスを作成する
+
+        Parameters
+        ----------
+        file_path : Path
+            画像ファイルパス(存在チェック・パス検証済み)
+        mimetype : str | None
+            MIMEタイプ(Noneの場合は拡張子から判定する)
+        private : bool
+            共有キャッシュ(CDN・プロキシ)への保存を禁止するかどうか
+        max_age : int | None
+            キャッシュ有効期間(秒)。Noneの場合はIMAGE_CACHE_MAX_AGE
+        etag : str | None
+            ETag(Noneの場合はファイル情報から作成する)
+        last_modified : datetime | None
+            更新日時(Noneの場合はファイルの更新日時)
+
+        Returns
+        -------
+        Response
+            200 / 206 / 304 レスポンス
+        """
+
+        max_age = settings.IMAGE_CACHE_MAX_AGE if max_age is None else max_age
+        if etag is None or last_modified is None:
+            stat = file_path.stat()
+            etag = etag or ImageDeliveryService.make_etag(stat)
+            last_modified = last_modified or datetime.fromtimestamp(int(stat.st_mtime), tz=timezone.utc)
+        last_modified = last_modified.replace(microsecond=0)
+
+        # 条件付きリクエストでキャッシュが有効な場合はファイルを開かずに304を返す
+        if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+            response = Response(status=304)
+            response.set_etag(etag)
+            response.last_modified = last_modified
+        elif ImageDeliveryService.delivery_mode() != ImageDeliveryMode.DIRECT:
+            response = ImageDeliveryService._offload(file_path, mimetype)
+            response.set_etag(etag)
+            response.last_modified = last_modified
+        else:
+            response = send_file(
+                file_path,
+                mimetype=mimetype,
+                conditional=True,
+                etag=etag,
+                last_modified=last_modified,
+                max_age=max_age
+            )
+
+        response.headers["Cache-Control"] = ImageDeliveryService.cache_control(private, max_age)
+        return response
+
+    @staticmethod
+    def delivery_mode() -> ImageDeliveryMode:
+        """
+        設定された画像配信方式を取得する
+
+        Raises
+        ------
+        ValueError
+            IMAGE_DELIVERY_MODEが不正な場合
+        """
+
+        return ImageDeliveryMode(settings.IMAGE_DELIVERY_MODE)
+
+    @staticmethod
+    def _offload(file_path: Path, mimetype: Optional[str]) -> Response:
+        """
+        ファイル送信をフロントプロキシに委譲するレスポンスを作成する
+
+        - X-Accel-Redirect: MEDIA_ROOTからの相対パスを内部ロケーションに連結する
+        - X-Sendfile: 絶対パスを指定する
+        - Rangeリクエスト・本文の送信はプロキシ側で処理される
+
+        Parameters
+        ----------
+        file_path : Path
+            画像ファイルパス
+        mimetype : str | None
+            MIMEタイプ(Noneの場合は拡張子から判定する)
+
+        Returns
+        -------
+        Response
+            本文なしのレスポンス
+        """
+
+        response = Response(
+            status=200,
+            mimetype=mimetype or mimetypes.guess_type(file_path.name)[0] or "application/octet-stream"
+        )
+
+        if ImageDeliveryService.delivery_mode() == ImageDeliveryMode.X_ACCEL_REDIRECT:
+            relative = file_path.resolve().relative_to(settings.MEDIA_ROOT.resolve()).as_posix()
+            prefix = settings.IMAGE_DELIVERY_INTERNAL_PREFIX.rstrip("/")
+            response.headers["X-Accel-Redirect"] = f"{prefix}/{relative}"
+        else:
+            response.headers["X-Sendfile"] = str(file_path.resolve())
+
+        return response
+
+    @staticmethod
+    def validators(image: Optional[Image], variant: ImageVariant = ImageVariant.ORIGINAL) -> tuple[Optional[str], Optional[datetime]]:
+        """
+        インデックス情報からETag・Last-Modifiedを作成する
+
+        - ETagは画像内容のSHA-256(派生画像は種類・形式を付加する)
+        - 同じ内容の画像は同じETagになるが、URLが異なるためキャッシュの衝突はない
+
+        Parameters
+        ----------
+        image : Image | None
+            画像のインデックス情報
+        variant : ImageVariant
+            配信サイズ
+
+        Returns
+        -------
+        tuple[str | None, datetime | None]
+            (ETag, 更新日時)。作成できない項目はNone(ファイル情報から作成する)
+        """
+
+        if image is None:
+            return None, None
+
+        etag = None
+        if image.content_hash:
+            etag = image.content_hash
+            if variant != ImageVariant.ORIGINAL:
+                etag = f"{etag}-{variant.value}-{settings.DERIVATIVE_FORMAT.lower()}"
+        return etag, image.created_at
+
+    @staticmethod
+    def make_etag(stat: os.stat_result) -> str:
+        """
+        ファイル情報から強いETagを作成する(インデックス未登録の画像用)
+
+        Parameters
+        ----------
+        stat : os.stat_result
+            ファイル情報
+
+        Returns
+        -------
+        str
+            ETag(引用符なし)
+        """
+
+        return f"{stat.st_ino:x}-{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+    @staticmethod
+    def cache_control(private: bool, max_age: int) -> str:
+        """
+        Cache-Controlヘッダー値を取得する
+        """
+
+        scope = "private" if private else "public"
+        return f"{scope}, max-age={max_age}, immutable"
@@ -0,0 +1,164 @@
+import time
+from typing import Optional
+from sqlalchemy import func, tuple_
+from app.db.session import db
+from app.db.transaction import transactional
+from app.models.image import Image
+
+class ImageIndexService:
+    """
+    画像メタデータ(imagesテーブル)の登録・検索を行うサービス
+
+    - ギャラリー一覧はディレクトリを走査せずにこのインデックスから取得する
+    - ページングは(date_dir, mtime, filename)によるキーセット方式
+    """
+
+    @staticmethod
+    @transactional
+    def register(current_user_id, path_type: str, date_dir: str, filenames: list[str], sizes: list[int],
+                 content_hashes: Optional[list[str]] = None, storage_keys: Optional[list[str]] = None):
+        """
+        書き込み済みの画像ファイルをインデックスに登録する
+
+        Parameters
+        ----------
+        current_user_id : UUID | str
+            所有ユーザーID
+        path_type : str
+            画像種類(ImagePathTypeの値)
+        date_dir : str
+            日付フォルダ名
+        filenames : list[str]
+            書き込み済みの画像ファイル名
+        sizes : list[int]
+            ファイルサイズ(filenamesと同順)
+        content_hashes : list[str] | None
+            画像内容のSHA-256ハッシュ(filenamesと同順)
+        storage_keys : list[str] | None
+            ストレージキー(filenamesと同順)
+        """
+
+        # 更新日時は登録時刻とする(ストレージへの問い合わせを行わない)
+        mtime = time.time()
+        hashes = content_hashes or [None] * len(filenames)
+        keys = storage_keys or [None] * len(filenames)
+        for filename, size_bytes, content_hash, storage_key in zip(filenames, sizes, hashes, keys):
+            db.add(Image(
+                user_id=current_user_id,
+                path_type=path_type,
+                date_dir=date_dir,
+                filename=filename,
+                mtime=mtime,
+                size_bytes=size_bytes,
+                content_hash=content_hash,
+                storage_key=storage_key,
+            ))
+
+        # DBに反映
+        db.commit()
+
+    @staticmethod
+    def fetch_page(
+        current_user_id,
+        path_types: list[str],
+        newest: bool = True,
+        after: Optional[tuple[str, float, str]] = None,
+        offset: int = 0,
+        limit: int = 20):
+        """
+        インデックスから画像を1ページ分取得する
+
+        Parameters
+        ----------
+        current_user_id : UUID | str
+            所有ユーザーID
+        path_types : list[str]
+            対象の画像種類
+        newest : bool
+            Trueの場合は新しい順、Falseの場合は古い順
+        after : tuple[str, float, str] | None
+            直前ページ末尾の(date_dir, mtime, filename)。指定時はその次から取得する
+        offset : int
+            読み飛ばす件数(afterと併用しない想定)
+        limit : int
+            取得件数
+
+        Returns
+        -------
+        list[Image]
+            画像メタデータ
+        """
+
+        sort_key = tuple_(Image.date_dir, Image.mtime, Image.filename)
+
+        query = db.query(Image).filter(
+            Image.user_id == current_user_id,
+            Image.path_type.in_(path_types)
+        )
+
+        # キーセット条件(ソートキーの続きから取得する)
+        if after is not None:
+            query = query.filter(sort_key < tuple_(*after) if newest else sort_key > tuple_(*after))
+
+        # インデックス順に並べる
+        if newest:
+            query = query.order_by(Image.date_dir.desc(), Image.mtime.desc(), Image.filename.desc())
+        else:
+            query = query.order_by(Image.date_dir.asc(), Image.mtime.asc(), Image.filename.asc())
+
+        if offset:
+            query = query.offset(offset)
+
+        return query.limit(limit).all()
+
+    @staticmethod
+    def find(current_user_id, path_type: str, date_dir: str, filename: str) -> Optional[Image]:
+        """
+        画像のインデックス情報を取得する(uq_images_user_fileによる検索)
+
+        Parameters
+        ----------
+        current_user_id : UUID | str
+            所有ユーザーID
+        path_type : str
+            画像種類
+        date_dir : str
+            日付フォルダ名
+        filename : str
+            ファイル名
+
+        Returns
+        -------
+        Image | None
+            画像メタデータ(未登録の場合はNone)
+        """
+
+        return db.query(Image).filter_by(
+            user_id=current_user_id,
+            path_type=path_type,
+            date_dir=date_dir,
+            filename=filename
+        ).first()
+
+    @staticmethod
+    def count(current_user_id, path_types: list[str]) -> int:
+        """
+        インデックスに登録された画像件数を取得する
+
+        Parameters
+        ----------
+        current_user_id : UUID | str
+            所有ユーザーID
+        path_types : list[str]
+            対象の画像種類
+
+        Returns
+        -------
+        int
+            画像件数
+        """
+
+        return db.query(func.count(Image.id)).filter(
+            Image.user_id == current_user_id,
+            Image.path_type.in_(path_types)
+        ).scalar() or 0
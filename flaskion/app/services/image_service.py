@@ -1,21 +1,34 @@
+import hashlib
 import uuid
 import libcore_hng.utils.app_logger as app_logger
 from datetime import datetime, timezone
 from http import HTTPStatus
-from flask import url_for
 from pydantic import ValidationError
 from PIL import Image as PIL_image
 from werkzeug.datastructures import FileStorage
 from datetime import date
+from pathlib import PurePosixPath
+from typing import Optional
 from pycorex.gemini_client import GeminiClient
 from pycorex.exceptions.no_candidates_error import NoCandidatesError
+from app.core.concurrency import io_pool
 from app.core.config import settings
-from app.core.enums import EncryptionKeyType, ImagePathType
+from app.core.enums import EncryptionKeyType, ImagePathType, MediaLayout
 from app.core.errors import ImageGenError, ImageEditError
 from app.models.image_gen_params import ImageGenParams
+from app.models.image import Image
 from app.models.image_edit_params import ImageEditParams
 from app.models.user import User
+from app.services.blob_store import BlobStore
+from app.services.derivative_service import DerivativeService
 from app.services.encrypt_service import EncryptService
+from app.services.gemini_client_pool import GeminiClientPool
+from app.services.gemini_scheduler import GeminiScheduler, GeminiSchedulerTimeout
+from app.services.image_index_service import ImageIndexService
+from app.services.image_url_service import ImageUrlService
+from app.services.result_cache_service import ResultCacheService
+from app.services.source_image_service import SourceImageService
+from app.storage.factory import get_storage
 
 class ImageGenService:
 
@@ -24,6 +37,35 @@ class ImageGenService:
         
         app_logger.info(f"[ImageGenService] Start image generation. user_id={current_user.id}")
 
+        # 入力チェック・APIキー復号
+        prepared, status = ImageGenService.prepare_generate(current_user, param_data)
+        if status != HTTPStatus.OK:
+            return prepared, status
+        params, api_key = prepared
+
+        # 画像生成・保存
+        return ImageGenService.run_generate(current_user.id, api_key, params)
+
+    @staticmethod
+    def prepare_generate(current_user: User, param_data: dict):
+        """
+        画像生成の入力チェックとAPIキーの復号を行う
+        
+        - リクエスト内で実行する(非同期ジョブの場合も投入前に実行する)
+        
+        Parameters
+        ----------
+        current_user : User
+            ログインユーザー
+        param_data : dict
+            画像生成パラメーター
+        
+        Returns
+        -------
+        tuple
+            成功時は((ImageGenParams, APIキー), HTTPStatus.OK)、失敗時は(エラーコード, HTTPステータス)
+        """
+
         try:
             # フォームの入力値をパラメーターモデルクラスに設定する
             params = ImageGenParams(**param_data)
@@ -48,25 +90,92 @@ class ImageGenService:
         api_key = ImageGenService.get_api_key(ciphertext)
         app_logger.info(f"[ImageGenService] API key decrypted. user_id={current_user.id}")
 
-        # GeminiClientを初期化
-        client = GeminiClient(
-            api_key=api_key
+        return (params, api_key), HTTPStatus.OK
+
+    @staticmethod
+    def run_generate(current_user_id, api_key: str, params: ImageGenParams):
+        """
+        画像生成を実行し、生成画像を保存する
+        
+        - prepare_generateで検証済みのパラメーターを受け取る
+        - リクエスト外(バッチ)からも呼び出される
+        
+        Parameters
+        ----------
+        current_user_id : UUID | str
+            ユーザーID
+        api_key : str
+            復号済みGemini APIキー
+        params : ImageGenParams
+            画像生成パラメーター
+        
+        Returns
+        -------
+        tuple
+            成功時は(公開URLリスト, HTTPStatus.OK)、失敗時は(エラーコード, HTTPステータス)
+        """
+
+        refs, status = ImageGenService.generate_refs(current_user_id, api_key, params)
+        if status != HTTPStatus.OK:
+            return refs, status
+        
+        # 生成した画像の公開URLを返す
+        app_logger.info(f"[ImageGenService] Completed successfully. user_id={current_user_id}")
+        return ImageGenService.to_public_urls(current_user_id, refs), HTTPStatus.OK
+
+    @staticmethod
+    def generate_refs(current_user_id, api_key: str, params: ImageGenParams):
+        """
+        画像生成を実行し、生成画像を保存して画像参照を返す
+        
+        - 非同期ジョブは画像参照を保存し、取得時に署名付きURLへ変換する
+        
+        Returns
+        -------
+        tuple
+            成功時は(画像参照リスト, HTTPStatus.OK)、失敗時は(エラーコード, HTTPステータス)
+        """
+
+        # 画像生成・保存(結果キャッシュが有効な場合は同一パラメーターの結果の再利用・実行中の重複排除あり)
+        return ResultCacheService.get_or_run(
+            ResultCacheService.make_key(current_user_id, params),
+            lambda: ImageGenService._generate_and_store(current_user_id, api_key, params),
+            is_valid=lambda cached: ImageGenService.refs_exist(current_user_id, cached)
         )
-        app_logger.info(f"[ImageGenService] GeminiClient initialized.")
+
+    @staticmethod
+    def _generate_and_store(current_user_id, api_key: str, params: ImageGenParams):
+        """
+        Gemini APIで画像を生成し、保存する
+        
+        Returns
+        -------
+        tuple
+            成功時は(画像参照リスト, HTTPStatus.OK)、失敗時は(エラーコード, HTTPステータス)
+        """
+
+        # GeminiClientを取得(ユーザー・APIキー単位で再利用する)
+        client = GeminiClientPool.get(current_user_id, api_key)
+        app_logger.info(f"[ImageGenService] GeminiClient acquired.")
         
         # 画像生成を実行
         try:
-            app_logger.info(f"[ImageGenService] Generating image... user_id={current_user.id}")
-            response = client.generate_image(
-                prompt=params.prompt,
-                model=params.model,
-                aspect_ratio=params.aspect,
-                image_size=params.resolution,
-                harm_category = params.safety_filter,
-                safety_filter_level = params.safety_level
-            )
+            app_logger.info(f"[ImageGenService] Generating image... user_id={current_user_id}")
+            # 実行枠を確保してから呼び出す(ユーザー間で公平に割り当てる)
+            with GeminiScheduler.slot(current_user_id, GeminiScheduler.cost(params.resolution)):
+                response = client.generate_image(
+                    prompt=params.prompt,
+                    model=params.model,
+                    aspect_ratio=params.aspect,
+                    image_size=params.resolution,
+                    harm_category = params.safety_filter,
+                    safety_filter_level = params.safety_level
+                )
             app_logger.info(f"[ImageGenService] Image generation completed. result_count={len(response['result'])}")
             
+        except GeminiSchedulerTimeout as e:
+            app_logger.warning(e)
+            return ImageGenError.UPSTREAM_BUSY, HTTPStatus.SERVICE_UNAVAILABLE
         except NoCandidatesError as e:
             app_logger.error(e)
             return ImageGenError.IMAGE_NO_CANDIDATES, HTTPStatus.BAD_REQUEST
@@ -74,40 +183,56 @@ class ImageGenService:
             app_logger.error(e)
             return ImageGenError.IMAGE_INTERNAL_ERROR, HTTPStatus.INTERNAL_SERVER_ERROR
 
-        # 日付フォルダ名取得
-        date_dir = date.today().isoformat()
-
-        # 出力先パス取得・作成
-        MEDIA_DIR = ImageGenService.get_image_path(ImagePathType.GENERATED.value, date_dir, current_user.id)
-        MEDIA_DIR.mkdir(parents=True, exist_ok=True)
-        app_logger.info(f"[ImageGenService] Output directory prepared: {MEDIA_DIR}")
-        
-        # 画像ファイルを出力する
-        results: list[str] = []
-        for _, image_bytes in enumerate(response["result"]):
-            filename = ImageGenService.get_gen_filename()
-            output_path = MEDIA_DIR / filename
-            with open(output_path, "wb") as f:
-                f.write(image_bytes)
-            results.append(filename)
-            app_logger.info(f"[ImageGenService] Saved image: {filename}")
-
-        # public URLに変換してリスト化する
-        public_urls = [
-            url_for("image_gen_api.get_image", path_type=ImagePathType.GENERATED.value, date_dir=date_dir, image_id=image_id, _external=True)
-            for image_id in results
-        ]
-        app_logger.info(f"[ImageGenService] Public URLs generated. count={len(public_urls)}")
-        
-        # 生成した画像のパスを返す
-        app_logger.info(f"[ImageGenService] Completed successfully. user_id={current_user.id}")
-        return public_urls, HTTPStatus.OK
+        # 画像を保存して参照を返す
+        try:
+            refs = ImageGenService.store_results(current_user_id, ImagePathType.GENERATED.value, response["result"])
+        except Exception as e:
+            app_logger.error(f"[ImageGenService] Failed to store images. user_id={current_user_id} error={e}")
+            return ImageGenError.IMAGE_INTERNAL_ERROR, HTTPStatus.INTERNAL_SERVER_ERROR
+        return refs, HTTPStatus.OK
     
     @staticmethod
-    def edit_image(current_user: User, param_data: dict, source_image: FileStorage):
+    def edit_image(current_user: User, param_data: dict, source_image: Optional[FileStorage], source_image_id: Optional[str] = None):
         
         app_logger.info(f"[ImageGenService] Start image edit. user_id={current_user.id}")
 
+        # 入力チェック・APIキー復号・元画像読込
+        prepared, status = ImageGenService.prepare_edit(current_user, param_data, source_image, source_image_id)
+        if status != HTTPStatus.OK:
+            return prepared, status
+        params, api_key, base_image, source_image_id = prepared
+
+        # 画像編集・保存
+        results, status = ImageGenService.run_edit(current_user.id, api_key, params, base_image)
+        if status != HTTPStatus.OK:
+            return results, status
+        return {"generated": results, "source_image_id": source_image_id}, status
+
+    @staticmethod
+    def prepare_edit(current_user: User, param_data: dict, source_image: Optional[FileStorage], source_image_id: Optional[str] = None):
+        """
+        画像編集の入力チェック、APIキーの復号、元画像の読込を行う
+        
+        - リクエスト内で実行する(アップロードファイルはリクエスト終了時に閉じられるため)
+        - 元画像はファイルまたは元画像ID(前回の編集で返したID・保存済み画像のcontent_hash)で指定する
+        
+        Parameters
+        ----------
+        current_user : User
+            ログインユーザー
+        param_data : dict
+            画像編集パラメーター
+        source_image : FileStorage | None
+            元画像ファイル
+        source_image_id : str | None
+            元画像ID
+        
+        Returns
+        -------
+        tuple
+            成功時は((ImageEditParams, APIキー, 元画像, 元画像ID), HTTPStatus.OK)、失敗時は(エラーコード, HTTPステータス)
+        """
+
         try:
             # フォームの入力値をパラメーターモデルクラスに設定する
             params = ImageEditParams(**param_data)
@@ -122,7 +247,7 @@ class ImageGenService:
             return ImageGenError.MISSING_PROMPT, HTTPStatus.BAD_REQUEST
         
         # 元画像入力チェック
-        if not source_image:
+        if not source_image and not source_image_id:
             app_logger.warning(f"[ImageGenService] Missing source image file. user_id={current_user.id}")
             return ImageEditError.MISSING_SOURCE_IMAGE_NOT_FOUND, HTTPStatus.BAD_REQUEST
         
@@ -137,29 +262,82 @@ class ImageGenService:
         api_key = ImageGenService.get_api_key(ciphertext)
         app_logger.info(f"[ImageGenService] API key decrypted. user_id={current_user.id}")
 
-        # 元画像のバイナリデータを取得する
-        base_image = PIL_image.open(source_image.stream)
+        # 元画像を取得する(キャッシュ済みでなければ形式・画素数チェック、出力解像度への縮小を行う)
+        loaded, status = SourceImageService.load(current_user.id, params.resolution, source_image, source_image_id)
+        if status != HTTPStatus.OK:
+            return loaded, status
+        base_image, source_image_id = loaded
+
+        return (params, api_key, base_image, source_image_id), HTTPStatus.OK
+
+    @staticmethod
+    def run_edit(current_user_id, api_key: str, params: ImageEditParams, base_image: PIL_image.Image):
+        """
+        画像編集を実行し、編集画像を保存する
         
-        # GeminiClientを初期化
-        client = GeminiClient(
-            api_key=api_key
-        )
-        app_logger.info(f"[ImageGenService] GeminiClient initialized.")
+        - prepare_editで検証済みのパラメーターを受け取る
+        
+        Parameters
+        ----------
+        current_user_id : UUID | str
+            ユーザーID
+        api_key : str
+            復号済みGemini APIキー
+        params : ImageEditParams
+            画像編集パラメーター
+        base_image : PIL.Image.Image
+            元画像
+        
+        Returns
+        -------
+        tuple
+            成功時は(公開URLリスト, HTTPStatus.OK)、失敗時は(エラーコード, HTTPステータス)
+        """
+
+        refs, status = ImageGenService.edit_refs(current_user_id, api_key, params, base_image)
+        if status != HTTPStatus.OK:
+            return refs, status
+
+        # 編集した画像の公開URLを返す
+        app_logger.info(f"[ImageGenService] Completed successfully. user_id={current_user_id}")
+        return ImageGenService.to_public_urls(current_user_id, refs), HTTPStatus.OK
+
+    @staticmethod
+    def edit_refs(current_user_id, api_key: str, params: ImageEditParams, base_image: PIL_image.Image):
+        """
+        画像編集を実行し、編集画像を保存して画像参照を返す
+        
+        - 非同期ジョブは画像参照を保存し、取得時に署名付きURLへ変換する
+        
+        Returns
+        -------
+        tuple
+            成功時は(画像参照リスト, HTTPStatus.OK)、失敗時は(エラーコード, HTTPステータス)
+        """
+
+        # GeminiClientを取得(ユーザー・APIキー単位で再利用する)
+        client = GeminiClientPool.get(current_user_id, api_key)
+        app_logger.info(f"[ImageGenService] GeminiClient acquired.")
         
         # 画像編集を実行
         try:
-            app_logger.info(f"[ImageGenService] Editing image... user_id={current_user.id}")
-            response = client.edit_image(
-                prompt=params.prompt,
-                model=params.model,
-                base_image=base_image,
-                aspect_ratio=params.aspect,
-                image_size=params.resolution,
-                harm_category = params.safety_filter,
-                safety_filter_level = params.safety_level
-            )
+            app_logger.info(f"[ImageGenService] Editing image... user_id={current_user_id}")
+            # 実行枠を確保してから呼び出す(ユーザー間で公平に割り当てる)
+            with GeminiScheduler.slot(current_user_id, GeminiScheduler.cost(params.resolution)):
+                response = client.edit_image(
+                    prompt=params.prompt,
+                    model=params.model,
+                    base_image=base_image,
+                    aspect_ratio=params.aspect,
+                    image_size=params.resolution,
+                    harm_category = params.safety_filter,
+                    safety_filter_level = params.safety_level
+                )
             app_logger.info(f"[ImageGenService] Image edit completed. result_count={len(response['result'])}")
             
+        except GeminiSchedulerTimeout as e:
+            app_logger.warning(e)
+            return ImageGenError.UPSTREAM_BUSY, HTTPStatus.SERVICE_UNAVAILABLE
         except NoCandidatesError as e:
             app_logger.error(e)
             return ImageGenError.IMAGE_NO_CANDIDATES, HTTPStatus.BAD_REQUEST
@@ -167,33 +345,121 @@ class ImageGenService:
             app_logger.error(e)
             return ImageGenError.IMAGE_INTERNAL_ERROR, HTTPStatus.INTERNAL_SERVER_ERROR
         
+        # 画像を保存して参照を返す
+        try:
+            refs = ImageGenService.store_results(current_user_id, ImagePathType.EDITED.value, response["result"])
+        except Exception as e:
+            app_logger.error(f"[ImageGenService] Failed to store images. user_id={current_user_id} error={e}")
+            return ImageGenError.IMAGE_INTERNAL_ERROR, HTTPStatus.INTERNAL_SERVER_ERROR
+        return refs, HTTPStatus.OK
+
+    @staticmethod
+    def store_results(current_user_id, path_type: str, images: list[bytes]) -> list[tuple[str, str, str]]:
+        """
+        生成・編集結果の画像を保存し、ギャラリーインデックスに登録する
+        
+        - インデックスへの登録に失敗した場合は作成した参照を削除する(ギャラリーに表示されない画像を残さない)
+        - 派生画像はインデックス登録後、実体のキーに対して生成する(失敗しても初回要求時に再生成される)
+        
+        Parameters
+        ----------
+        current_user_id : UUID | str
+            ユーザーID
+        path_type : str
+            画像種類(ImagePathTypeの値)
+        images : list[bytes]
+            画像バイナリ
+        
+        Returns
+        -------
+        list[tuple[str, str, str]]
+            画像参照(画像種類, 日付フォルダ名, ファイル名)
+        """
+
         # 日付フォルダ名取得
         date_dir = date.today().isoformat()
-        # 出力先パス取得・作成
-        MEDIA_DIR = ImageGenService.get_image_path(ImagePathType.EDITED.value, date_dir, current_user.id)
-        MEDIA_DIR.mkdir(parents=True, exist_ok=True)
-        app_logger.info(f"[ImageGenService] Output directory prepared: {MEDIA_DIR}")
-        
-        # 画像ファイルを出力する
-        results: list[str] = []
-        for _, image_bytes in enumerate(response["result"]):
-            filename = ImageGenService.get_gen_filename()
-            output_path = MEDIA_DIR / filename
-            with open(output_path, "wb") as f:
-                f.write(image_bytes)
-            results.append(filename)
-            app_logger.info(f"[ImageGenService] Saved image: {filename}")
-
-        # public URLに変換してリスト化する
+
+        # 画像を内容アドレス方式で保存し、ユーザーの画像キーに参照を作成する(並列・ネイティブスレッドで実行)
+        filenames = [ImageGenService.get_gen_filename() for _ in images]
+        output_keys = [
+            ImageGenService.get_image_key(path_type, date_dir, current_user_id, filename)
+            for filename in filenames
+        ]
+        try:
+            content_hashes = BlobStore.store_many(list(zip(output_keys, images)))
+            for filename, content_hash in zip(filenames, content_hashes):
+                app_logger.info(f"[ImageGenService] Saved image: {filename} sha256={content_hash[:12]}")
+
+            # ギャラリーインデックスに登録する
+            ImageIndexService.register(
+                current_user_id, path_type, date_dir, filenames,
+                sizes=[len(image_bytes) for image_bytes in images],
+                content_hashes=content_hashes,
+                storage_keys=output_keys
+            )
+            app_logger.info(f"[ImageGenService] Gallery index updated. count={len(filenames)}")
+        except Exception:
+            # 参照のみ削除する(実体は他の参照と共有されている可能性があるため残す)
+            ImageGenService._delete_refs(output_keys)
+            raise
+
+        # ギャラリー用の派生画像(サムネイル/プレビュー)を生成する(配信時と同じく実体のキーを使う)
+        blob_keys = [
+            BlobStore.blob_key(content_hash, PurePosixPath(filename).suffix)
+            for filename, content_hash in zip(filenames, content_hashes)
+        ]
+        DerivativeService.create_many(list(zip(blob_keys, images)))
+
+        return [(path_type, date_dir, filename) for filename in filenames]
+
+    @staticmethod
+    def _delete_refs(keys: list[str]) -> None:
+        """
+        保存に失敗した画像の参照を削除する(削除の失敗はログのみ)
+        """
+
+        storage = get_storage()
+        for key in keys:
+            try:
+                io_pool.run(storage.delete, key)
+            except Exception as e:
+                app_logger.error(f"[ImageGenService] Failed to delete orphaned image. key={key} error={e}")
+
+    @staticmethod
+    def to_public_urls(current_user_id, refs: list[tuple[str, str, str]]) -> list[str]:
+        """
+        画像参照を署名付きpublic URLに変換する
+        
+        Parameters
+        ----------
+        current_user_id : UUID | str
+            ユーザーID
+        refs : list[tuple[str, str, str]]
+            画像参照(画像種類, 日付フォルダ名, ファイル名)
+        
+        Returns
+        -------
+        list[str]
+            画像の公開URL
+        """
+
         public_urls = [
-            url_for("image_gen_api.get_image", path_type=ImagePathType.EDITED.value, date_dir=date_dir, image_id=image_id, _external=True)
-            for image_id in results
+            ImageUrlService.build(current_user_id, path_type, date_dir, filename, external=True)
+            for path_type, date_dir, filename in refs
         ]
         app_logger.info(f"[ImageGenService] Public URLs generated. count={len(public_urls)}")
-        
-        # 生成した画像のパスを返す
-        app_logger.info(f"[ImageGenService] Completed successfully. user_id={current_user.id}")
-        return public_urls, HTTPStatus.OK
+        return public_urls
+
+    @staticmethod
+    def refs_exist(current_user_id, refs: list[tuple[str, str, str]]) -> bool:
+        """
+        画像参照のファイルがすべて存在するか確認する
+        """
+
+        return all(
+            ImageGenService.resolve_image(path_type, date_dir, current_user_id, filename)[0] is not None
+            for path_type, date_dir, filename in refs
+        )
     
     @staticmethod
     def get_gen_filename():
@@ -206,21 +472,127 @@ class ImageGenService:
         return f"{timestamp}_{unique}.png"
 
     @staticmethod
-    def get_root_image_path(current_user_id):
-        return settings.MEDIA_ROOT / str(current_user_id)
-    
+    def get_image_key(path_type: str, date_str: str, current_user_id, filename: str,
+                      layout: Optional[MediaLayout] = None) -> str:
+        """
+        画像のストレージキーを取得する(MEDIA_ROOTからの相対パス形式)
+        
+        - sharded: <user>/<種類>/<ファイル名ハッシュ2桁>/<次の2桁>/<ファイル名>
+        - dated: <user>/<種類>/<日付>/<ファイル名>(旧方式)
+        
+        Parameters
+        ----------
+        path_type : str
+            画像種類(ImagePathTypeの値)
+        date_str : str
+            日付フォルダ名(dated方式のみ使用)
+        current_user_id : UUID | str
+            ユーザーID
+        filename : str
+            ファイル名
+        layout : MediaLayout | None
+            配置方式(Noneの場合はMEDIA_LAYOUT)
+        
+        Returns
+        -------
+        str
+            ストレージキー
+        """
+
+        layout = layout or MediaLayout(settings.MEDIA_LAYOUT)
+        type_dir = ImageGenService.get_type_dir(path_type)
+        if type_dir is None:
+            return f"{current_user_id}/{filename}"
+        
+        if layout == MediaLayout.SHARDED:
+            shard = hashlib.sha256(filename.encode("utf-8")).hexdigest()
+            return f"{current_user_id}/{type_dir}/{shard[:2]}/{shard[2:4]}/{filename}"
+        return f"{current_user_id}/{type_dir}/{date_str}/{filename}"
+
     @staticmethod
-    def get_image_path(path_type: str, date_str: str, current_user_id):
+    def resolve_image(path_type: str, date_str: str, current_user_id, filename: str) -> tuple[Optional[str], Optional[Image]]:
+        """
+        画像の読み込み先のストレージキーとインデックス情報を取得する
+        
+        - content_hashが登録済みの画像は実体(BlobStore)のキーを返す
+        - 実体が存在しない画像・再構築ツールで登録した画像はstorage_key、未登録の画像は新旧両方式の位置を探す
+        
+        Parameters
+        ----------
+        path_type : str
+            画像種類(ImagePathTypeの値)
+        date_str : str
+            日付フォルダ名
+        current_user_id : UUID | str
+            ユーザーID
+        filename : str
+            ファイル名
+        
+        Returns
+        -------
+        tuple[str | None, Image | None]
+            (ストレージキー, インデックス情報)。画像が見つからない場合のキーはNone
+        """
+
+        storage = get_storage()
+        image = ImageIndexService.find(current_user_id, path_type, date_str, filename)
+        if image is not None and image.content_hash:
+            blob_key = BlobStore.blob_key(image.content_hash, PurePosixPath(filename).suffix)
+            if storage.exists(blob_key):
+                return blob_key, image
+        if image is not None and image.storage_key and storage.exists(image.storage_key):
+            return image.storage_key, image
+        return ImageGenService.resolve_image_key(path_type, date_str, current_user_id, filename), image
+
+    @staticmethod
+    def resolve_image_key(path_type: str, date_str: str, current_user_id, filename: str) -> Optional[str]:
+        """
+        既存画像のストレージキーを取得する
+        
+        - 配置方式の移行中は両方式に画像が存在するため、MEDIA_LAYOUTの方式から順に探す
+        
+        Returns
+        -------
+        str | None
+            ストレージキー(どちらにも存在しない場合はNone)
+        """
+
+        storage = get_storage()
+        preferred = MediaLayout(settings.MEDIA_LAYOUT)
+        for layout in (preferred, *(l for l in MediaLayout if l != preferred)):
+            key = ImageGenService.get_image_key(path_type, date_str, current_user_id, filename, layout)
+            if storage.exists(key):
+                return key
+        return None
+
+    @staticmethod
+    def get_type_dir(path_type: str) -> Optional[str]:
+        """
+        画像種類のディレクトリ名を取得する(不明な種類はNone)
+        """
 
-        # ルートパス
-        root_path = ImageGenService.get_root_image_path(current_user_id)
-        # 出力先パス構成
         if path_type == ImagePathType.GENERATED.value:
-            return root_path / settings.GEN_IMAGE_DIR / date_str
+            return settings.GEN_IMAGE_DIR
         elif path_type == ImagePathType.EDITED.value:
-            return root_path / settings.EDIT_IMAGE_DIR / date_str
-        return root_path
-    
+            return settings.EDIT_IMAGE_DIR
+        return None
+
+    @staticmethod
+    def date_from_filename(filename: str) -> Optional[str]:
+        """
+        生成画像のファイル名(YYYYMMDDTHHMMSSZ_xxx)から日付フォルダ名を取得する
+        
+        Returns
+        -------
+        str | None
+            日付フォルダ名(YYYY-MM-DD)。形式が異なる場合はNone
+        """
+
+        try:
+            return datetime.strptime(filename[:16], "%Y%m%dT%H%M%SZ").date().isoformat()
+        except ValueError:
+            return None
+
     @staticmethod
     def get_api_key(ciphertext):
         """
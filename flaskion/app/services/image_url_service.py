@@ -0,0 +1,121 @@
+import hashlib
+import hmac
+import time
+from typing import Optional
+from flask import url_for
+from app.core.config import settings
+from app.core.enums import ImageVariant
+
+class ImageUrlService:
+    """
+    署名付き画像URLを作成・検証するサービス
+
+    - URLに所有ユーザーID(uid)・有効期限(exp)・HMAC署名(sig)を付与する
+    - 検証は署名の比較のみで行い、DBへの問い合わせを行わない
+    - 有効期限はIMAGE_URL_BUCKET_SECONDS単位に切り上げるため、同じ画像のURLは一定期間同一になる
+    - 署名対象は画像ファイルの特定情報のみ(sizeは含めない。同じ画像の派生画像も同じ署名で取得できる)
+    """
+
+    @staticmethod
+    def build(current_user_id, path_type: str, date_dir: str, filename: str,
+              variant: Optional[ImageVariant] = None, external: bool = False) -> str:
+        """
+        署名付き画像URLを作成する
+
+        Parameters
+        ----------
+        current_user_id : UUID | str
+            画像の所有ユーザーID
+        path_type : str
+            画像種類(ImagePathTypeの値)
+        date_dir : str
+            日付フォルダ名
+        filename : str
+            ファイル名
+        variant : ImageVariant | None
+            配信サイズ(Noneの場合は元画像)
+        external : bool
+            絶対URLにするかどうか
+
+        Returns
+        -------
+        str
+            署名付き画像URL
+        """
+
+        uid = str(current_user_id)
+        exp = ImageUrlService.expires_at()
+        params = {
+            "path_type": path_type,
+            "date_dir": date_dir,
+            "image_id": filename,
+            "uid": uid,
+            "exp": exp,
+            "sig": ImageUrlService._signature(uid, path_type, date_dir, filename, exp),
+            "_external": external,
+        }
+        if variant is not None and variant != ImageVariant.ORIGINAL:
+            params["size"] = variant.value
+        return url_for("image_gen_api.get_image", **params)
+
+    @staticmethod
+    def verify(uid: str, path_type: str, date_dir: str, filename: str,
+               exp: Optional[str], sig: Optional[str]) -> bool:
+        """
+        署名付き画像URLを検証する
+
+        Parameters
+        ----------
+        uid : str
+            URLのuid
+        path_type : str
+            画像種類
+        date_dir : str
+            日付フォルダ名
+        filename : str
+            ファイル名
+        exp : str | None
+            URLのexp
+        sig : str | None
+            URLのsig
+
+        Returns
+        -------
+        bool
+            署名が正しく、有効期限内の場合True
+        """
+
+        if not exp or not sig:
+            return False
+        try:
+            expires = int(exp)
+        except ValueError:
+            return False
+        if expires < time.time():
+            return False
+
+        expected = ImageUrlService._signature(uid, path_type, date_dir, filename, expires)
+        return hmac.compare_digest(expected, sig)
+
+    @staticmethod
+    def expires_at(now: Optional[float] = None) -> int:
+        """
+        新しく作成するURLの有効期限(UNIX時刻)を取得する
+
+        - 現在時刻+IMAGE_URL_TTL_SECONDSを丸め単位に切り上げる
+        """
+
+        now = time.time() if now is None else now
+        bucket = max(settings.IMAGE_URL_BUCKET_SECONDS, 1)
+        deadline = int(now) + settings.IMAGE_URL_TTL_SECONDS
+        return -(-deadline // bucket) * bucket
+
+    @staticmethod
+    def _signature(uid: str, path_type: str, date_dir: str, filename: str, exp: int) -> str:
+        """
+        HMAC-SHA256署名を作成する
+        """
+
+        message = "\n".join((uid, path_type, date_dir, filename, str(exp))).encode("utf-8")
+        key = settings.IMAGE_URL_SECRET.encode("utf-8")
+        return hmac.new(key, message, hashlib.sha256).hexdigest()
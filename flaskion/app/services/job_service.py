@@ -0,0 +1,368 @@
+import threading
+import uuid
+import libcore_hng.utils.app_logger as app_logger
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from typing import Callable, Optional
+from flask import copy_current_request_context
+from werkzeug.datastructures import FileStorage
+from app.core.config import settings
+from app.core.enums import ImagePathType, JobStatus
+from app.core.errors import ImageGenError, ImageEditError, JobError
+from app.core.error_messages import get_error_message
+from app.db.session import db
+from app.db.transaction import transactional
+from app.models.image_job import ImageJob
+from app.models.user import User
+from app.services.image_service import ImageGenService
+from app.services.image_url_service import ImageUrlService
+from app.services.notification_service import NotificationService
+
+class JobService:
+    """
+    画像生成・編集を非同期ジョブとして実行するサービス
+
+    - 投入時はリクエスト内で入力チェックのみ行い、ジョブIDを即時に返す
+    - Gemini呼び出しと画像保存はワーカープロセスごとの有限プールで実行する
+    - 実行中+実行待ちの件数が上限に達した場合は投入を拒否する(バックプレッシャー)
+    - ジョブの状態はimage_jobsテーブルに保持する
+    - 状態の遷移はSocketIOでユーザーに通知する(image.started / image.completed / image.failed)
+    - ワーカーの再起動等で終了しなかったジョブは、取得時にJOB_STALE_SECONDSを過ぎていれば失敗状態にする
+    """
+
+    # ジョブ実行プール(gevent環境ではモンキーパッチによりグリーンレットで動作する)
+    _executor = ThreadPoolExecutor(
+        max_workers=settings.JOB_WORKERS,
+        thread_name_prefix="image-job"
+    )
+
+    # 実行中+実行待ちのジョブ数の上限
+    _slots = threading.BoundedSemaphore(settings.JOB_WORKERS + settings.JOB_QUEUE_SIZE)
+
+    @staticmethod
+    def submit_generate(current_user: User, param_data: dict):
+        """
+        画像生成ジョブを投入する
+
+        Parameters
+        ----------
+        current_user : User
+            ログインユーザー
+        param_data : dict
+            画像生成パラメーター
+
+        Returns
+        -------
+        tuple
+            成功時は(ジョブ情報dict, HTTPStatus.ACCEPTED)、失敗時は(エラーコード, HTTPステータス)
+        """
+
+        # 入力チェック・APIキー復号はリクエスト内で行う
+        prepared, status = ImageGenService.prepare_generate(current_user, param_data)
+        if status != HTTPStatus.OK:
+            return prepared, status
+        params, api_key = prepared
+
+        user_id = current_user.id
+        return JobService._submit(
+            user_id,
+            ImagePathType.GENERATED.value,
+            lambda: ImageGenService.generate_refs(user_id, api_key, params)
+        )
+
+    @staticmethod
+    def submit_edit(current_user: User, param_data: dict, source_image: Optional[FileStorage], source_image_id: Optional[str] = None):
+        """
+        画像編集ジョブを投入する
+
+        Parameters
+        ----------
+        current_user : User
+            ログインユーザー
+        param_data : dict
+            画像編集パラメーター
+        source_image : FileStorage | None
+            元画像ファイル
+        source_image_id : str | None
+            元画像ID(前回の編集で返したID・保存済み画像のcontent_hash)
+
+        Returns
+        -------
+        tuple
+            成功時は(ジョブ情報dict(source_image_idを含む), HTTPStatus.ACCEPTED)、失敗時は(エラーコード, HTTPステータス)
+        """
+
+        # 入力チェック・APIキー復号・元画像読込はリクエスト内で行う
+        prepared, status = ImageGenService.prepare_edit(current_user, param_data, source_image, source_image_id)
+        if status != HTTPStatus.OK:
+            return prepared, status
+        params, api_key, base_image, source_image_id = prepared
+
+        user_id = current_user.id
+        results, status = JobService._submit(
+            user_id,
+            ImagePathType.EDITED.value,
+            lambda: ImageGenService.edit_refs(user_id, api_key, params, base_image)
+        )
+
+        # 次回の編集で同じ元画像を再アップロードせずに指定できるようにIDを返す
+        if status == HTTPStatus.ACCEPTED:
+            results["source_image_id"] = source_image_id
+        return results, status
+
+    @staticmethod
+    def get_job(current_user_id, job_id: str):
+        """
+        ジョブ情報を取得する
+
+        Parameters
+        ----------
+        current_user_id : UUID | str
+            ログインユーザーID
+        job_id : str
+            ジョブID
+
+        Returns
+        -------
+        tuple
+            成功時は(ジョブ情報dict, HTTPStatus.OK)、失敗時は(エラーコード, HTTPステータス)
+        """
+
+        try:
+            job_uuid = uuid.UUID(job_id)
+        except ValueError:
+            return JobError.JOB_NOT_FOUND, HTTPStatus.NOT_FOUND
+
+        # 他ユーザーのジョブは存在しないものとして扱う
+        job = db.query(ImageJob).filter_by(id=job_uuid, user_id=current_user_id).first()
+        if not job:
+            return JobError.JOB_NOT_FOUND, HTTPStatus.NOT_FOUND
+
+        # 実行中のプロセスが失われたジョブは失敗状態にする(クライアントが待ち続けないように)
+        if JobService._is_stale(job):
+            app_logger.warning(f"[JobService] Stale job marked as failed. job_id={job.id} status={job.status}")
+            JobService._fail(job.id, JobError.JOB_INTERRUPTED)
+
+        return JobService.to_dict(job), HTTPStatus.OK
+
+    @staticmethod
+    def to_dict(job: ImageJob) -> dict:
+        """
+        ジョブ情報をレスポンス用dictに変換する
+
+        Parameters
+        ----------
+        job : ImageJob
+            ジョブ
+
+        Returns
+        -------
+        dict
+            ジョブ情報
+        """
+
+        data = {
+            "id": str(job.id),
+            "kind": job.kind,
+            "status": job.status,
+            "generated": JobService._public_urls(job),
+            "created_at": job.created_at.isoformat() if job.created_at else None,
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        }
+        if job.error_code:
+            data["error"] = {
+                "errors": job.error_code,
+                "message": JobService._error_message(job.error_code),
+            }
+        return data
+
+    @staticmethod
+    def _public_urls(job: ImageJob) -> list[str]:
+        """
+        保存された画像参照を署名付きURLに変換する
+
+        - 取得のたびに署名するため、古いジョブでも有効期限内のURLを返す
+        - 旧形式(URL文字列)で保存された結果はそのまま返す
+        """
+
+        return [
+            item if isinstance(item, str)
+            else ImageUrlService.build(job.user_id, *item, external=True)
+            for item in job.result or []
+        ]
+
+    @staticmethod
+    def _submit(user_id, kind: str, task: Callable):
+        """
+        ジョブを登録し、実行プールに投入する
+
+        Parameters
+        ----------
+        user_id : UUID | str
+            ユーザーID
+        kind : str
+            ジョブ種類(ImagePathTypeの値)
+        task : Callable
+            実行処理。(画像参照リスト, HTTPステータス)を返す
+
+        Returns
+        -------
+        tuple
+            成功時は(ジョブ情報dict, HTTPStatus.ACCEPTED)、失敗時は(エラーコード, HTTPステータス)
+        """
+
+        # 実行枠を確保できなければ受け付けない
+        if not JobService._slots.acquire(blocking=False):
+            app_logger.warning(f"[JobService] Job queue is full. user_id={user_id}")
+            return JobError.JOB_QUEUE_FULL, HTTPStatus.SERVICE_UNAVAILABLE
+
+        try:
+            job = JobService._create(user_id, kind)
+            job_id = job.id
+
+            # リクエストコンテキストを引き継いで実行する(url_for(_external=True)のため)
+            @copy_current_request_context
+            def run():
+                JobService._run(job_id, task)
+
+            future = JobService._executor.submit(run)
+        except Exception:
+            JobService._slots.release()
+            raise
+
+        future.add_done_callback(lambda _: JobService._slots.release())
+        app_logger.info(f"[JobService] Job submitted. job_id={job_id} kind={kind} user_id={user_id}")
+        return JobService.to_dict(job), HTTPStatus.ACCEPTED
+
+    @staticmethod
+    def _run(job_id, task: Callable):
+        """
+        ジョブを実行し、状態を更新する
+
+        - セッションの破棄は引き継いだリクエストコンテキストのteardownで行われる
+
+        Parameters
+        ----------
+        job_id : UUID
+            ジョブID
+        task : Callable
+            実行処理
+        """
+
+        try:
+            job = JobService._update(job_id, status=JobStatus.RUNNING.value, started_at=datetime.now(timezone.utc))
+            if job is None:
+                # ジョブが削除された(ユーザー削除等)場合は実行しない
+                app_logger.warning(f"[JobService] Job not found, skipped. job_id={job_id}")
+                return
+            NotificationService.notify_user(job["user_id"], NotificationService.IMAGE_STARTED, job["data"])
+            app_logger.info(f"[JobService] Job started. job_id={job_id}")
+
+            try:
+                results, status = task()
+            except Exception as e:
+                app_logger.error(e)
+                results, status = ImageGenError.IMAGE_INTERNAL_ERROR, HTTPStatus.INTERNAL_SERVER_ERROR
+
+            now = datetime.now(timezone.utc)
+            if status == HTTPStatus.OK:
+                job = JobService._update(job_id, status=JobStatus.SUCCEEDED.value, result=results, finished_at=now)
+                event = NotificationService.IMAGE_COMPLETED
+                app_logger.info(f"[JobService] Job succeeded. job_id={job_id}")
+            else:
+                job = JobService._update(job_id, status=JobStatus.FAILED.value, error_code=results.value, finished_at=now)
+                event = NotificationService.IMAGE_FAILED
+                app_logger.warning(f"[JobService] Job failed. job_id={job_id} error={results.value}")
+
+            # 実行中にジョブが削除された場合は通知しない
+            if job is not None:
+                NotificationService.notify_user(job["user_id"], event, job["data"])
+        except Exception as e:
+            # 状態の更新に失敗した場合も実行中のまま残さない
+            app_logger.error(f"[JobService] Job aborted. job_id={job_id} error={e}")
+            JobService._fail(job_id, ImageGenError.IMAGE_INTERNAL_ERROR)
+
+    @staticmethod
+    def _fail(job_id, error) -> None:
+        """
+        ジョブを失敗状態にする
+
+        - 更新に失敗した場合はログのみ(取得時にJOB_STALE_SECONDSを過ぎていれば失敗状態になる)
+
+        Parameters
+        ----------
+        job_id : UUID
+            ジョブID
+        error : ImageGenError | JobError
+            エラーコード
+        """
+
+        try:
+            JobService._update(job_id, status=JobStatus.FAILED.value, error_code=error.value, finished_at=datetime.now(timezone.utc))
+        except Exception as e:
+            app_logger.error(f"[JobService] Failed to mark job as failed. job_id={job_id} error={e}")
+
+    @staticmethod
+    def _is_stale(job: ImageJob) -> bool:
+        """
+        実行待ち・実行中のままJOB_STALE_SECONDS以上更新されていないかどうか
+        """
+
+        if job.status not in (JobStatus.QUEUED.value, JobStatus.RUNNING.value) or job.updated_at is None:
+            return False
+        return job.updated_at < datetime.now(timezone.utc) - timedelta(seconds=settings.JOB_STALE_SECONDS)
+
+    @staticmethod
+    @transactional
+    def _create(user_id, kind: str) -> ImageJob:
+        """
+        実行待ち状態のジョブを登録する
+        """
+
+        now = datetime.now(timezone.utc)
+        job = ImageJob(
+            user_id=user_id,
+            kind=kind,
+            status=JobStatus.QUEUED.value,
+            created_at=now,
+            updated_at=now,
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        return job
+
+    @staticmethod
+    @transactional
+    def _update(job_id, **fields) -> dict:
+        """
+        ジョブの状態を更新する
+
+        Returns
+        -------
+        dict | None
+            user_id: 所有ユーザーID, data: 更新後のジョブ情報(通知用)。ジョブが存在しない場合はNone
+        """
+
+        job = db.get(ImageJob, job_id)
+        if not job:
+            return None
+        for key, value in fields.items():
+            setattr(job, key, value)
+        job.updated_at = datetime.now(timezone.utc)
+        db.commit()
+        return {"user_id": job.user_id, "data": JobService.to_dict(job)}
+
+    @staticmethod
+    def _error_message(error_code: str) -> str:
+        """
+        保存されたエラーコードからメッセージを取得する
+        """
+
+        for error_enum in (ImageGenError, ImageEditError, JobError):
+            try:
+                return get_error_message(error_enum(error_code))
+            except ValueError:
+                continue
+        return get_error_message(None)
@@ -0,0 +1,58 @@
+import libcore_hng.utils.app_logger as app_logger
+from app.core.socketio import socketio
+
+class NotificationService:
+    """
+    SocketIOでユーザーごとにイベントを通知するサービス
+
+    - 接続時にユーザー専用のルームへ参加させ、そのルーム宛てに送信する
+    """
+
+    IMAGE_STARTED = "image.started"
+    """ 画像生成・編集の開始 """
+
+    IMAGE_COMPLETED = "image.completed"
+    """ 画像生成・編集の完了 """
+
+    IMAGE_FAILED = "image.failed"
+    """ 画像生成・編集の失敗 """
+
+    @staticmethod
+    def user_room(user_id) -> str:
+        """
+        ユーザー専用ルーム名を取得する
+
+        Parameters
+        ----------
+        user_id : UUID | str
+            ユーザーID
+
+        Returns
+        -------
+        str
+            ルーム名
+        """
+
+        return f"user:{user_id}"
+
+    @staticmethod
+    def notify_user(user_id, event: str, payload: dict) -> None:
+        """
+        ユーザー専用ルームにイベントを送信する
+
+        - 通知の失敗は呼び出し元の処理に影響させない
+
+        Parameters
+        ----------
+        user_id : UUID | str
+            ユーザーID
+        event : str
+            イベント名
+        payload : dict
+            送信データ
+        """
+
+        try:
+            socketio.emit(event, payload, to=NotificationService.user_room(user_id))
+        except Exception as e:
+            app_logger.error(f"[NotificationService] Emit failed. event={event} user_id={user_id} error={e}")
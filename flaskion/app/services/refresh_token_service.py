@@ -0,0 +1,186 @@
+import hashlib
+import hmac
+import secrets
+import uuid
+import libcore_hng.utils.app_logger as app_logger
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from app.core.config import settings
+from app.core.errors import AuthError
+from app.core.security import create_access_token
+from app.core.user_cache import load_user
+from app.db.session import db
+from app.db.transaction import transactional
+from app.models.refresh_token import RefreshToken
+
+class RefreshTokenService:
+    """
+    リフレッシュトークンを発行・更新・失効するサービス
+
+    - トークンは推測不能な乱数。DBにはHMAC-SHA256のみを保存する
+    - 更新時はパスワード検証(bcrypt)を行わず、HMACとDB参照だけでアクセストークンを再発行する
+    - 更新のたびに使用したトークンを失効させ、新しいトークンを返す(ローテーション)
+    - 失効済みのトークンが再使用された場合は漏えいとみなし、同じ系列のトークンをすべて失効させる
+    """
+
+    @staticmethod
+    @transactional
+    def issue(user_id, family_id: Optional[uuid.UUID] = None) -> str:
+        """
+        リフレッシュトークンを発行する
+
+        - 同じユーザーの期限切れトークンは削除する
+
+        Parameters
+        ----------
+        user_id : UUID | str
+            ユーザーID
+        family_id : UUID | None
+            トークン系列ID(Noneの場合は新しい系列を作成する。サインイン時)
+
+        Returns
+        -------
+        str
+            リフレッシュトークン
+        """
+
+        now = datetime.now(timezone.utc)
+        RefreshTokenService._purge_expired(user_id, now)
+        token = RefreshTokenService._add(user_id, family_id or uuid.uuid4(), now)
+        db.commit()
+        return token
+
+    @staticmethod
+    @transactional
+    def rotate(token: str):
+        """
+        リフレッシュトークンを使用してアクセストークンを再発行する
+
+        - 同じユーザーの期限切れトークンは削除する(サインインせずに更新を続けても行が増え続けない)
+
+        Parameters
+        ----------
+        token : str
+            リフレッシュトークン
+
+        Returns
+        -------
+        tuple
+            成功時は(User, アクセストークン, 新しいリフレッシュトークン, None)、
+            失敗時は(None, None, None, エラーコード)
+        """
+
+        # 同時に同じトークンで更新された場合に備えて行ロックを取得する
+        row = (
+            db.query(RefreshToken)
+            .filter_by(token_hash=RefreshTokenService.hash_token(token))
+            .with_for_update()
+            .first()
+        )
+        if row is None:
+            return None, None, None, AuthError.INVALID_REFRESH_TOKEN
+
+        now = datetime.now(timezone.utc)
+
+        # 失効済みトークンの再使用(漏えいの可能性があるため系列ごと失効させる)
+        if row.revoked_at is not None:
+            RefreshTokenService._revoke_family(row.family_id, now)
+            db.commit()
+            app_logger.warning(f"[RefreshTokenService] Refresh token reuse detected. user_id={row.user_id} family_id={row.family_id}")
+            return None, None, None, AuthError.INVALID_REFRESH_TOKEN
+
+        # 期限切れ
+        if row.expires_at <= now:
+            return None, None, None, AuthError.INVALID_REFRESH_TOKEN
+
+        # ユーザー存在・有効チェック
+        user = load_user(row.user_id)
+        if user is None or not user.is_active:
+            RefreshTokenService._revoke_family(row.family_id, now)
+            db.commit()
+            return None, None, None, AuthError.INACTIVE_ACCOUNT if user else AuthError.INVALID_REFRESH_TOKEN
+
+        # ローテーション(使用したトークンを失効させ、同じ系列で新しいトークンを発行する)
+        row.revoked_at = now
+        RefreshTokenService._purge_expired(row.user_id, now)
+        new_token = RefreshTokenService._add(row.user_id, row.family_id, now)
+        db.commit()
+
+        access_token = create_access_token({
+            "sub": str(user.id),
+            "email": user.email
+        })
+        return user, access_token, new_token, None
+
+    @staticmethod
+    @transactional
+    def revoke(token: str) -> None:
+        """
+        リフレッシュトークンを系列ごと失効させる(ログアウト)
+
+        - 存在しないトークンの場合は何もしない
+
+        Parameters
+        ----------
+        token : str
+            リフレッシュトークン
+        """
+
+        row = db.query(RefreshToken).filter_by(token_hash=RefreshTokenService.hash_token(token)).first()
+        if row is None:
+            return
+
+        RefreshTokenService._revoke_family(row.family_id, datetime.now(timezone.utc))
+        db.commit()
+
+    @staticmethod
+    def hash_token(token: str) -> str:
+        """
+        リフレッシュトークンのDB保存用HMAC-SHA256を取得する
+        """
+
+        return hmac.new(
+            settings.REFRESH_TOKEN_SECRET.encode("utf-8"),
+            token.encode("utf-8"),
+            hashlib.sha256
+        ).hexdigest()
+
+    @staticmethod
+    def _add(user_id, family_id: uuid.UUID, now: datetime) -> str:
+        """
+        リフレッシュトークンを生成してセッションに追加する(コミットは呼び出し元で行う)
+        """
+
+        token = secrets.token_urlsafe(32)
+        db.add(RefreshToken(
+            user_id=user_id,
+            family_id=family_id,
+            token_hash=RefreshTokenService.hash_token(token),
+            expires_at=now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+            created_at=now,
+        ))
+        return token
+
+    @staticmethod
+    def _purge_expired(user_id, now: datetime) -> None:
+        """
+        ユーザーの期限切れトークンを削除する(コミットは呼び出し元で行う)
+
+        - 失効済みでも期限内のトークンは再使用の検知に使うため残す
+        """
+
+        db.query(RefreshToken).filter(
+            RefreshToken.user_id == user_id,
+            RefreshToken.expires_at < now
+        ).delete(synchronize_session=False)
+
+    @staticmethod
+    def _revoke_family(family_id: uuid.UUID, now: datetime) -> None:
+        """
+        同じ系列の有効なトークンをすべて失効させる(コミットは呼び出し元で行う)
+        """
+
+        db.query(RefreshToken).filter(
+            RefreshToken.family_id == family_id,
+            RefreshToken.revoked_at.is_(None)
+        ).update({RefreshToken.revoked_at: now}, synchronize_session=False)
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import threading
+import libcore_hng.utils.app_logger as app_logger
+from concurrent.futures import Future
+from http import HTTPStatus
+from typing import Callable, Optional
+from pydantic import BaseModel
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+class ResultCacheService:
+    """
+    同一パラメーターの画像生成結果を再利用するサービス
+
+    - キーはユーザーIDと正規化したパラメーターのSHA-256
+    - 成功した結果(保存済み画像の参照)のみ、RESULT_CACHE_TTL_SECONDSの間キャッシュする
+      (0の場合は結果を保持しない。既定。ワーカープロセスごとのキャッシュ)
+    - 同じキーの処理が実行中の場合は完了を待って結果を共有する(上流の呼び出しは1回)
+      結果キャッシュが有効な場合のみ行う(無効の場合、同じプロンプトの同時実行は呼び出しごとに別の画像を生成する)
+    """
+
+    # 生成結果キャッシュ(キー: パラメーターハッシュ, 値: 画像参照のリスト)
+    _results = TTLCache(
+        maxsize=settings.RESULT_CACHE_MAX_SIZE,
+        ttl=settings.RESULT_CACHE_TTL_SECONDS
+    )
+
+    # 実行中の処理(キー: パラメーターハッシュ, 値: 結果を受け取るFuture)
+    _inflight: dict[str, Future] = {}
+    _inflight_lock = threading.Lock()
+
+    @staticmethod
+    def make_key(current_user_id, params: BaseModel) -> str:
+        """
+        キャッシュキーを作成する
+
+        Parameters
+        ----------
+        current_user_id : UUID | str
+            ユーザーID
+        params : BaseModel
+            画像生成パラメーター
+
+        Returns
+        -------
+        str
+            キャッシュキー
+        """
+
+        normalized = params.model_dump(mode="json")
+        if isinstance(normalized.get("prompt"), str):
+            normalized["prompt"] = " ".join(normalized["prompt"].split())
+
+        raw = json.dumps([str(current_user_id), normalized], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def get_or_run(key: str, compute: Callable[[], tuple], is_valid: Optional[Callable[[list], bool]] = None) -> tuple:
+        """
+        キャッシュ済みの結果を返す。なければ処理を実行して結果をキャッシュする
+
+        Parameters
+        ----------
+        key : str
+            キャッシュキー
+        compute : Callable[[], tuple]
+            実行処理。(結果, HTTPステータス)を返す
+        is_valid : Callable[[list], bool] | None
+            キャッシュ済みの結果が利用可能か判定する関数(参照先ファイルの存在確認等)
+
+        Returns
+        -------
+        tuple
+            (結果, HTTPステータス)
+        """
+
+        # 結果キャッシュが無効の場合は常に実行する(同一パラメーターの複数枚生成を妨げない)
+        if not ResultCacheService._results.enabled:
+            return compute()
+
+        # キャッシュ済みの結果
+        cached = ResultCacheService._results.get(key)
+        if cached is not None:
+            if is_valid is None or is_valid(cached):
+                app_logger.info(f"[ResultCacheService] Cache hit. key={key[:12]}")
+                return cached, HTTPStatus.OK
+            ResultCacheService._results.pop(key)
+
+        # 実行中の同一処理があれば完了を待つ
+        with ResultCacheService._inflight_lock:
+            future = ResultCacheService._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                ResultCacheService._inflight[key] = future
+
+        if not owner:
+            app_logger.info(f"[ResultCacheService] Waiting for in-flight request. key={key[:12]}")
+            return future.result()
+
+        try:
+            result, status = compute()
+            if status == HTTPStatus.OK:
+                ResultCacheService._results.set(key, result)
+            future.set_result((result, status))
+            return result, status
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with ResultCacheService._inflight_lock:
+                ResultCacheService._inflight.pop(key, None)
@@ -0,0 +1,166 @@
+import hashlib
+import io
+import re
+import libcore_hng.utils.app_logger as app_logger
+from http import HTTPStatus
+from pathlib import PurePosixPath
+from typing import BinaryIO, Optional
+from pycorex.gemini_client import GeminiClient
+from werkzeug.datastructures import FileStorage
+from app.core.cache import TTLCache
+from app.core.concurrency import io_pool
+from app.core.config import settings
+from app.core.errors import ImageEditError
+from app.db.session import db
+from app.models.image import Image
+from app.services.blob_store import BlobStore
+from app.services.upload_service import UploadService
+from app.storage.factory import get_storage
+
+class SourceImageService:
+    """
+    画像編集の元画像を取得するサービス
+
+    - 元画像IDは画像内容のSHA-256(16進数)。アップロード画像・生成/編集済み画像で共通
+    - アップロード時はIDを算出し、デコード・縮小済みの元画像をキャッシュする
+      (同じ画像の再編集ではアップロード・デコードを省略できる)
+    - IDのみ指定された場合はキャッシュ、なければ保存済み画像(images.content_hash)から読み込む
+    - キャッシュはユーザー単位(他ユーザーの元画像は参照できない)。ワーカープロセスごとのキャッシュ
+    - キャッシュした画像は複数のジョブで共有するため、読み取り専用として扱う
+    """
+
+    # 元画像IDの形式
+    ID_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+    # 元画像キャッシュ(キー: (ユーザーID, 元画像ID, 長辺ピクセル数), 値: 元画像)
+    _images = TTLCache(
+        maxsize=settings.SOURCE_IMAGE_CACHE_MAX_SIZE,
+        ttl=settings.SOURCE_IMAGE_CACHE_TTL_SECONDS
+    )
+
+    @staticmethod
+    def load(
+        current_user_id,
+        image_size: Optional[GeminiClient.ImageSize],
+        source_image: Optional[FileStorage] = None,
+        source_image_id: Optional[str] = None
+    ):
+        """
+        元画像を取得する
+
+        - source_image_idを優先し、見つからない場合はsource_imageを読み込む
+
+        Parameters
+        ----------
+        current_user_id : UUID | str
+            ログインユーザーID
+        image_size : GeminiClient.ImageSize | None
+            出力解像度(Noneの場合は1K)
+        source_image : FileStorage | None
+            アップロードされた元画像ファイル
+        source_image_id : str | None
+            元画像ID
+
+        Returns
+        -------
+        tuple
+            成功時は((元画像, 元画像ID), HTTPStatus.OK)、失敗時は(エラーコード, HTTPステータス)
+        """
+
+        max_edge = UploadService.max_edge(image_size)
+
+        # 元画像ID指定
+        if source_image_id:
+            image_id = source_image_id.strip().lower()
+            image, status = SourceImageService._load_by_id(current_user_id, image_id, image_size, max_edge)
+            if status == HTTPStatus.OK:
+                return (image, image_id), status
+            if status != HTTPStatus.NOT_FOUND or not source_image:
+                return image, status
+
+            # キャッシュ切れ等で見つからない場合はアップロード画像を使う
+            app_logger.info(f"[SourceImageService] Source image id not found, falling back to upload. user_id={current_user_id}")
+
+        # 元画像入力チェック
+        if not source_image:
+            app_logger.warning(f"[SourceImageService] Missing source image file. user_id={current_user_id}")
+            return ImageEditError.MISSING_SOURCE_IMAGE_NOT_FOUND, HTTPStatus.BAD_REQUEST
+
+        # アップロード画像のIDを算出する(同じ画像がキャッシュ済みならデコードしない)
+        image_id = io_pool.run(SourceImageService._digest, source_image.stream)
+        cache_key = (str(current_user_id), image_id, max_edge)
+        image = SourceImageService._images.get(cache_key)
+        if image is not None:
+            app_logger.info(f"[SourceImageService] Source image cache hit. user_id={current_user_id} id={image_id}")
+            return (image, image_id), HTTPStatus.OK
+
+        image, status = UploadService.load_source_image(source_image, image_size)
+        if status != HTTPStatus.OK:
+            return image, status
+
+        SourceImageService._images.set(cache_key, image)
+        return (image, image_id), HTTPStatus.OK
+
+    @staticmethod
+    def _load_by_id(current_user_id, image_id: str, image_size: Optional[GeminiClient.ImageSize], max_edge: int):
+        """
+        元画像IDから元画像を取得する(キャッシュ → 保存済み画像の順)
+
+        Returns
+        -------
+        tuple
+            成功時は(元画像, HTTPStatus.OK)、失敗時は(エラーコード, HTTPステータス)
+        """
+
+        if not SourceImageService.ID_PATTERN.fullmatch(image_id):
+            return ImageEditError.SOURCE_IMAGE_NOT_FOUND, HTTPStatus.NOT_FOUND
+
+        cache_key = (str(current_user_id), image_id, max_edge)
+        image = SourceImageService._images.get(cache_key)
+        if image is not None:
+            app_logger.info(f"[SourceImageService] Source image cache hit. user_id={current_user_id} id={image_id}")
+            return image, HTTPStatus.OK
+
+        # ユーザーの保存済み画像から探す(実体はBlobStoreから読み込む)
+        row = (
+            db.query(Image.filename)
+            .filter_by(user_id=current_user_id, content_hash=image_id)
+            .first()
+        )
+        if row is None:
+            app_logger.warning(f"[SourceImageService] Source image not found. user_id={current_user_id} id={image_id}")
+            return ImageEditError.SOURCE_IMAGE_NOT_FOUND, HTTPStatus.NOT_FOUND
+
+        blob_key = BlobStore.blob_key(image_id, PurePosixPath(row.filename).suffix)
+        try:
+            data = io_pool.run(SourceImageService._read, blob_key)
+        except FileNotFoundError:
+            app_logger.warning(f"[SourceImageService] Source image blob missing. key={blob_key}")
+            return ImageEditError.SOURCE_IMAGE_NOT_FOUND, HTTPStatus.NOT_FOUND
+
+        image, status = UploadService.load_stream(io.BytesIO(data), image_size, row.filename)
+        if status != HTTPStatus.OK:
+            return image, status
+
+        SourceImageService._images.set(cache_key, image)
+        return image, HTTPStatus.OK
+
+    @staticmethod
+    def _digest(stream: BinaryIO) -> str:
+        """
+        ストリームのSHA-256ハッシュを取得し、先頭に戻す
+        """
+
+        stream.seek(0)
+        content_hash = hashlib.file_digest(stream, "sha256").hexdigest()
+        stream.seek(0)
+        return content_hash
+
+    @staticmethod
+    def _read(key: str) -> bytes:
+        """
+        ストレージからオブジェクトを読み込む
+        """
+
+        with get_storage().open(key) as f:
+            return f.read()
@@ -0,0 +1,137 @@
+import warnings
+import libcore_hng.utils.app_logger as app_logger
+from http import HTTPStatus
+from typing import BinaryIO, Optional
+from PIL import Image as PIL_image, UnidentifiedImageError
+from pycorex.gemini_client import GeminiClient
+from werkzeug.datastructures import FileStorage
+from app.core.concurrency import io_pool
+from app.core.config import settings
+from app.core.errors import ImageEditError
+
+class UploadService:
+    """
+    アップロードされた元画像を読み込むサービス
+
+    - ヘッダーのみで形式・画素数を確認してから画像をデコードする
+    - Geminiに送る前に、出力解像度(ImageSize)を超える画像は縮小する
+      (JPEGはデコード時点で縮小するため、元サイズでのデコードを行わない)
+    - デコード・縮小はネイティブスレッドで実行し、geventハブを止めない
+    """
+
+    # 対応する元画像形式
+    ALLOWED_FORMATS = ("PNG", "JPEG", "WEBP")
+
+    # 出力解像度ごとの長辺ピクセル数
+    MAX_EDGES = {
+        GeminiClient.ImageSize.ONE_K: 1024,
+        GeminiClient.ImageSize.TWO_K: 2048,
+        GeminiClient.ImageSize.FOUR_K: 4096,
+    }
+
+    @staticmethod
+    def load_source_image(source_image: FileStorage, image_size: Optional[GeminiClient.ImageSize]):
+        """
+        アップロードされた元画像を読み込み、出力解像度に合わせて縮小する
+
+        Parameters
+        ----------
+        source_image : FileStorage
+            元画像ファイル
+        image_size : GeminiClient.ImageSize | None
+            出力解像度(Noneの場合は1K)
+
+        Returns
+        -------
+        tuple
+            成功時は(元画像, HTTPStatus.OK)、失敗時は(エラーコード, HTTPステータス)
+        """
+
+        return UploadService.load_stream(source_image.stream, image_size, source_image.filename)
+
+    @staticmethod
+    def load_stream(stream: BinaryIO, image_size: Optional[GeminiClient.ImageSize], name: Optional[str] = None):
+        """
+        ストリームから元画像を読み込み、出力解像度に合わせて縮小する
+
+        Parameters
+        ----------
+        stream : BinaryIO
+            画像のストリーム(シーク可能であること)
+        image_size : GeminiClient.ImageSize | None
+            出力解像度(Noneの場合は1K)
+        name : str | None
+            ログ出力用の名前(ファイル名等)
+
+        Returns
+        -------
+        tuple
+            成功時は(元画像, HTTPStatus.OK)、失敗時は(エラーコード, HTTPステータス)
+        """
+
+        # ヘッダーのみ読み込む(画素データはまだデコードしない)
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("error", PIL_image.DecompressionBombWarning)
+                image = PIL_image.open(stream)
+        except (PIL_image.DecompressionBombError, PIL_image.DecompressionBombWarning):
+            app_logger.warning(f"[UploadService] Source image too large. filename={name}")
+            return ImageEditError.SOURCE_IMAGE_TOO_LARGE, HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+        except UnidentifiedImageError:
+            app_logger.warning(f"[UploadService] Unreadable source image. filename={name}")
+            return ImageEditError.INVALID_SOURCE_IMAGE, HTTPStatus.BAD_REQUEST
+
+        # 形式・画素数チェック
+        if image.format not in UploadService.ALLOWED_FORMATS:
+            app_logger.warning(f"[UploadService] Unsupported source image format. format={image.format}")
+            return ImageEditError.INVALID_SOURCE_IMAGE, HTTPStatus.BAD_REQUEST
+
+        width, height = image.size
+        if width * height > settings.UPLOAD_MAX_PIXELS:
+            app_logger.warning(f"[UploadService] Source image too large. size={width}x{height}")
+            return ImageEditError.SOURCE_IMAGE_TOO_LARGE, HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+
+        # デコード・縮小(ネイティブスレッドで実行)
+        try:
+            image = io_pool.run(UploadService._decode, image, UploadService.max_edge(image_size))
+        except (OSError, SyntaxError) as e:
+            app_logger.warning(f"[UploadService] Source image decode failed. error={e}")
+            return ImageEditError.INVALID_SOURCE_IMAGE, HTTPStatus.BAD_REQUEST
+
+        app_logger.info(f"[UploadService] Source image loaded. original={width}x{height} loaded={image.size[0]}x{image.size[1]}")
+        return image, HTTPStatus.OK
+
+    @staticmethod
+    def max_edge(image_size: Optional[GeminiClient.ImageSize]) -> int:
+        """
+        出力解像度に対応する長辺ピクセル数を取得する(Noneや不明な値は1K)
+        """
+
+        return UploadService.MAX_EDGES.get(image_size, UploadService.MAX_EDGES[GeminiClient.ImageSize.ONE_K])
+
+    @staticmethod
+    def _decode(image: PIL_image.Image, max_edge: int) -> PIL_image.Image:
+        """
+        画像をデコードし、長辺がmax_edgeを超える場合は縮小する
+
+        Parameters
+        ----------
+        image : PIL.Image.Image
+            ヘッダーのみ読み込んだ画像
+        max_edge : int
+            長辺の最大ピクセル数
+
+        Returns
+        -------
+        PIL.Image.Image
+            デコード済みの画像(アップロードストリームから切り離されている)
+        """
+
+        # JPEGは縮小デコード(1/2, 1/4, 1/8)で必要以上の画素を展開しない
+        if image.format == "JPEG":
+            image.draft("RGB", (max_edge, max_edge))
+
+        image.load()
+        if max(image.size) > max_edge:
+            image.thumbnail((max_edge, max_edge), PIL_image.Resampling.LANCZOS)
+        return image
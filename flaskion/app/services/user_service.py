@@ -1,18 +1,25 @@
 from datetime import datetime, timezone
 from app.models.user import User
 from app.db.session import db
-from app.core.security import generate_api_key_value
+from app.core.enums import EncryptionKeyType
+from app.core.security import api_key_digest, generate_api_key_value
+from app.core.user_cache import invalidate_api_key, invalidate_user
 from app.core.errors import UserError
 from app.db.transaction import transactional
 from app.services.encrypt_service import EncryptService
+from app.services.gemini_client_pool import GeminiClientPool
 
 class UserService:
     
     @staticmethod
+    @transactional
     def generate_uwgen_api_key(id: str):
         """
         Uwgen独自のAPIキーを生成し、ユーザーに紐づけて保存する
-        emailはunique前提
+        
+        - APIキーは暗号化して保存し、照合用にHMACも保存する(X-API-Keyヘッダーで認証できる)
+        - 旧APIキーは即時に無効になる(他のワーカープロセスではUSER_CACHE_TTL_SECONDS以内)
+        - 平文のAPIキーを返すのはこの時だけ
         
         Parameters
         ----------
@@ -32,6 +39,20 @@ class UserService:
         
         # APIキー生成
         new_key = generate_api_key_value()
+        old_ciphertext = user.uwgen_api_key
+        old_digest = user.uwgen_api_key_digest
+        
+        # 暗号化・照合用HMACを保存
+        user.uwgen_api_key = EncryptService.encrypt(new_key, EncryptionKeyType.UWGEN)
+        user.uwgen_api_key_digest = api_key_digest(new_key)
+        user.uwgen_api_key_updated_at = datetime.now(timezone.utc)
+        db.commit()
+        
+        # 旧APIキーの復号結果・照合結果と認証ユーザーのキャッシュを破棄
+        if old_ciphertext:
+            EncryptService.forget(old_ciphertext, EncryptionKeyType.UWGEN)
+        invalidate_api_key(old_digest)
+        invalidate_user(user.id)
         
         return new_key, None
 
@@ -55,7 +76,8 @@ class UserService:
             
         Notes
         -----
-        - updates: {"uwgen_api_key": "...", "gemini_api_key": "..."}
+        - updates: {"gemini_api_key_encrypted": "...", "gemini_api_key_changed": true, ...}
+        - Uwgen APIキーはgenerate_uwgen_api_keyで発行・保存する(ここでは更新しない)
         """
         
         # ユーザー情報チェック
@@ -76,13 +98,14 @@ class UserService:
                 if column.info.get("encrypt"):
                     key_type = column.info.get("key")
                     value = EncryptService.encrypt(value, key_type)
+                    
+                    # 旧い暗号文の復号結果キャッシュを破棄
+                    old_ciphertext = getattr(user, key)
+                    if old_ciphertext:
+                        EncryptService.forget(old_ciphertext, key_type)
                 
                 setattr(user, key, value)
         
-        # Uwgen APIキーに変更があれば変更日時を更新する
-        if updates.get("uwgen_api_key_changed"):
-            user.uwgen_api_key_updated_at = datetime.now(timezone.utc)
-
         # Gemini APIキーに変更があれば変更日時を更新する
         if updates.get("gemini_api_key_changed"):
             user.gemini_api_key_updated_at = datetime.now(timezone.utc)
@@ -95,4 +118,11 @@ class UserService:
         db.commit()
         db.refresh(user)
         
+        # 認証ユーザーキャッシュを破棄
+        invalidate_user(user.id)
+        
+        # Gemini APIキーが変更された場合はプール済みのGeminiClientを破棄
+        if updates.get("gemini_api_key_changed") or updates.get("gemini_api_key_vertexai_changed"):
+            GeminiClientPool.invalidate(user.id)
+        
         return None
\ No newline at end of file
@@ -99,9 +99,18 @@ async function setupAuthState() {
 }
 
 /**
- * ログアウト処理(JWTを解除する)
+ * ログアウト処理(リフレッシュトークンを失効させ、JWTを解除する)
  */
-window.logout = function() {
+window.logout = async function() {
+    const refreshToken = localStorage.getItem("refresh_token");
+    if (refreshToken) {
+        try {
+            await HttpClient.post("/api/v1/auth/logout", { refresh_token: refreshToken }, { auth: false });
+        } catch (err) {
+            // 通信エラーでもローカルのトークンは破棄する
+        }
+    }
     localStorage.removeItem("access_token");
+    localStorage.removeItem("refresh_token");
     window.location.href = "/signin";
 }
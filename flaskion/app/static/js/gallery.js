@@ -30,9 +30,9 @@ function setupGallery() {
 
     let currentFilter = "all";
     let currentSort = "newest";
-    let offset = 0;
+    let cursor = "";
     const limit = 20;
-    let total = 0;
+    let hasMore = false;
 
     // 初回ロード
     loadGallery();
@@ -63,12 +63,12 @@ function setupGallery() {
     async function loadGallery(isAppend = false) {
 
         if (!isAppend) {
-            offset = 0;
+            cursor = "";
             grid.innerHTML = "";
         }
 
-        // ギャラリー一覧をリクエスト
-        const url = `/api/v1/gallery?type=${currentFilter}&sort=${currentSort}&offset=${offset}&limit=${limit}`;
+        // ギャラリー一覧をリクエスト(カーソルモード)
+        const url = `/api/v1/gallery?type=${currentFilter}&sort=${currentSort}&cursor=${encodeURIComponent(cursor)}&limit=${limit}`;
         const response = await HttpClient.get(
             url,
             { auth: true }
@@ -85,10 +85,10 @@ function setupGallery() {
 
         // ギャラリーの取得
         const images = response.body.data.images;
-        total = response.body.data.total;
+        hasMore = response.body.data.has_more;
 
         // 画像0件の場合
-        if (images.length === 0) {
+        if (images.length === 0 && !isAppend) {
             grid.innerHTML = "<p class='empty'>画像がありません</p>";
             return;
         }
@@ -99,11 +99,11 @@ function setupGallery() {
             grid.appendChild(card);
         }
 
-        // 読み込んだ画像の分だけoffsetを加算
-        offset += images.length;
+        // 次ページのカーソルを保持
+        cursor = response.body.data.next_cursor || "";
 
         // 「もっと見る」ボタンの表示制御
-        loadMoreBtn.style.display = (offset < total) ? "block" : "none";
+        loadMoreBtn.style.display = hasMore ? "block" : "none";
 
     }
 
@@ -113,9 +113,8 @@ function setupGallery() {
         const card = node.querySelector(".gallery-card");
         const image = node.querySelector(".gallery-img");
         
-        // Blob URLを取得
+        // 一覧にはサムネイルを使用(署名付きURLのため直接読み込める)
         image.src = "";
-        const objectUrl = await HttpClient.getBlobUrl(img.path);
 
         // 画像読込完了イベント
         image.onload = () => {
@@ -124,21 +123,21 @@ function setupGallery() {
         };
 
         // 読み込み開始
-        image.src = objectUrl;
+        image.src = img.thumbnail;
 
         const previewBtn = node.querySelector(".preview-btn");
         previewBtn.onclick = (e) => {
             e.stopPropagation();
-            openModal(img.path);
+            openModal(img);
         };
 
         const editBtn = node.querySelector(".edit-btn");
         editBtn.onclick = (e) => {
             e.stopPropagation();
-            window.location.href = `/image_edit?src=${encodeURIComponent(img.path)}`;
+            window.location.href = editPageUrl(img.path, img.source_image_id);
         };
 
-        card.onclick = () => openModal(img.path);
+        card.onclick = () => openModal(img);
 
         return node;
     }
@@ -147,15 +146,15 @@ function setupGallery() {
     const modalImg = document.getElementById("modalImage");
     const closeModal = document.querySelector(".close-modal");
 
-    async function openModal(path) {
+    async function openModal(img) {
         modal.style.display = "flex";
 
-        // Blob URLを取得して表示
-        const blobUrl = await HttpClient.getBlobUrl(path);
-        modalImg.src = blobUrl;
+        // モーダルにはプレビューサイズを使用(署名付きURLのため直接読み込める)
+        modalImg.src = img.preview;
 
-        // 選択中の画像パスを保持
-        modal.dataset.currentPath = path;
+        // 選択中の画像パス(元画像)と元画像IDを保持
+        modal.dataset.currentPath = img.path;
+        modal.dataset.currentId = img.source_image_id || "";
 
     }
 
@@ -170,7 +169,7 @@ function setupGallery() {
     // モーダル：編集に送るボタンクリック時
     modalEditBtn.onclick = () => {
         const path = modal.dataset.currentPath;
-        window.location.href = `/image_edit?src=${encodeURIComponent(path)}`;
+        window.location.href = editPageUrl(path, modal.dataset.currentId);
     };
 
     // モーダル：ダウンロードボタンクリック時
@@ -186,11 +185,24 @@ function setupGallery() {
         // ダウンロード実行
         const a = document.createElement("a");
         a.href = blobUrl;
-        a.download = path.split("/").pop();
+        a.download = HttpClient.fileName(path);
         a.click();
 
         // メモリ開放
         URL.revokeObjectURL(blobUrl);
 
     }
-}
\ No newline at end of file
+}
+/**
+ * 画像編集ページのURLを作成する
+ * @param {string} path 画像URL
+ * @param {string} sourceImageId 元画像ID(ある場合は編集時に画像を再アップロードしない)
+ * @returns {string} 画像編集ページのURL
+ */
+function editPageUrl(path, sourceImageId) {
+    const params = new URLSearchParams({ src: path });
+    if (sourceImageId) {
+        params.set("id", sourceImageId);
+    }
+    return `/image_edit?${params.toString()}`;
+}
@@ -1,4 +1,4 @@
-import { HttpClient } from "./utils.js";
+import { HttpClient, JobClient } from "./utils.js";
 import { MessageType } from "./constants.js";
 import { MessageManager } from "./components.js";
 
@@ -43,6 +43,7 @@ async function loadEditImage() {
     const fileName = document.getElementById("fileName");
     const sourceImageUrl = document.getElementById("sourceImageUrl");
     const sourceImage = document.getElementById("sourceImage");
+    const sourceImageId = document.getElementById("sourceImageId");
 
     // プレビュー画像を表示
     previewImage.src = blobUrl;
@@ -54,8 +55,9 @@ async function loadEditImage() {
     fileNameInline.textContent = extractedName;
     fileName.textContent = extractedName;
 
-    // 画像をhiddenフィールドにセットする
+    // 画像をhiddenフィールドにセットする(元画像IDがあれば編集時はIDのみ送る)
     sourceImageUrl.value = src;
+    sourceImageId.value = params.get("id") || "";
     const blob = await HttpClient.getBlob(src);
     const file = new File([blob], extractedFileName(src), { type: blob.type });
 
@@ -71,7 +73,7 @@ async function loadEditImage() {
  * @returns ファイル名
  */
 function extractedFileName(path) {
-    return path.split("/").pop();
+    return HttpClient.fileName(path);
 }
 
 /**
@@ -107,6 +109,7 @@ function setupImagePreview() {
     const palceholder = document.querySelector("#previewPlaceholder");
     const fileSelectBtn = document.querySelector("#fileSelectBtn");
     const fileNameInline = document.querySelector("#fileNameInline");
+    const sourceImageId = document.querySelector("#sourceImageId");
 
     // ファイル選択ボタン -> inputクリック
     fileSelectBtn.addEventListener("click", () => {
@@ -116,6 +119,9 @@ function setupImagePreview() {
     // ファイル選択時
     input.addEventListener("change", () => {
 
+        // 別の画像が選択されたため元画像IDを破棄する
+        sourceImageId.value = "";
+
         // ファイル選択
         const file = input.files[0];
         if (!file) {
@@ -184,7 +190,7 @@ function setupImageEdit() {
             // ダウンロードリンク設定
             const a = document.createElement("a");
             a.href = objcetUrl;
-            a.download = apiUrl.split("/").pop();
+            a.download = HttpClient.fileName(apiUrl);
             a.click();
 
             // メモリ開放
@@ -194,12 +200,9 @@ function setupImageEdit() {
         // 画像拡大ボタンクリック時
         if (btn.classList.contains("preview-btn")) {
 
-            // blob URL生成
-            const objcetUrl = await HttpClient.getBlobUrl(card.dataset.path);
-
-            // 画像拡大モーダル表示
+            // 画像拡大モーダル表示(署名付きURLのため直接読み込める)
             modal.style.display = "block";
-            modalImg.src = objcetUrl;
+            modalImg.src = card.dataset.path;
         }
 
     });
@@ -213,30 +216,48 @@ function setupImageEdit() {
         overlay.style.display = "flex";
         editBtn.disabled = true;
 
-        // 入力値を回収
+        // 入力値を回収(元画像IDがある場合は画像ファイルを送らない)
+        const sourceImageId = document.getElementById("sourceImageId");
         const formData = new FormData(form);
+        if (sourceImageId.value) {
+            formData.delete("sourceImage");
+        }
 
         try {
-            // サーバーにPOSTリクエストを送信して結果を受け取る
-            const response = await HttpClient.post("/api/v1/image_edit", formData);
+            // サーバーにジョブを投入し、完了まで待機して結果を受け取る
+            let response = await HttpClient.post("/api/v1/image_edit/jobs", formData);
+
+            // 元画像IDが失効していた場合は画像ファイルを付けて再投入する
+            if (response.body?.errors === "source_image_not_found") {
+                sourceImageId.value = "";
+                response = await HttpClient.post("/api/v1/image_edit/jobs", new FormData(form));
+            }
+
+            if (response.isSuccess()) {
+                // 次回の編集では同じ元画像をIDで指定する
+                sourceImageId.value = response.body.data.source_image_id || "";
+                response = await JobClient.wait(response.body.data.id);
+            }
 
             // メッセージをクリア
             msgMgr.clear();
 
             // Httpリクエストコード判定
-            if (response.isSuccess()) {
+            if (response.isSuccess() && response.body.data.status === "failed") {
+                // ジョブ失敗メッセージ表示
+                const jobError = response.body.data.error;
+                msgMgr.show(jobError.message, MessageType.ERROR, "画像編集に失敗しました");
+
+            } else if (response.isSuccess()) {
 
                 response.body.data.generated.forEach(async (path) => {
                     
                     // カードテンプレート複製
                     const card = template.content.cloneNode(true);
                     
-                    // 画像パス取得(blob URL生成)
-                    const objcetUrl = await HttpClient.getBlobUrl(path);
-
-                    // 画像設定
+                    // 画像設定(署名付きURLのため直接読み込める)
                     const img = card.querySelector(".result-img");
-                    img.src = objcetUrl;
+                    img.src = path;
 
                     // カードにパスを保持
                     const root = card.querySelector(".result-card");
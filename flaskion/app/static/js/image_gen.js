@@ -1,4 +1,4 @@
-import { HttpClient } from "./utils.js";
+import { HttpClient, JobClient } from "./utils.js";
 import { MessageType } from "./constants.js";
 import { MessageManager } from "./components.js";
 
@@ -82,7 +82,7 @@ function setupImageGenerateion() {
             // ダウンロードリンク設定
             const a = document.createElement("a");
             a.href = objcetUrl;
-            a.download = apiUrl.split("/").pop();
+            a.download = HttpClient.fileName(apiUrl);
             a.click();
 
             // メモリ開放
@@ -92,12 +92,9 @@ function setupImageGenerateion() {
         // 画像拡大ボタンクリック時
         if (btn.classList.contains("preview-btn")) {
 
-            // blob URL生成
-            const objcetUrl = await HttpClient.getBlobUrl(card.dataset.path);
-
-            // 画像拡大モーダル表示
+            // 画像拡大モーダル表示(署名付きURLのため直接読み込める)
             modal.style.display = "block";
-            modalImg.src = objcetUrl;
+            modalImg.src = card.dataset.path;
         }
 
     });
@@ -111,26 +108,31 @@ function setupImageGenerateion() {
         const payload = Object.fromEntries(new FormData(form));
 
         try {
-            // サーバーにPOSTリクエストを送信して結果を受け取る
-            const response = await HttpClient.post("/api/v1/image_gen", payload);
+            // サーバーにジョブを投入し、完了まで待機して結果を受け取る
+            let response = await HttpClient.post("/api/v1/image_gen/jobs", payload);
+            if (response.isSuccess()) {
+                response = await JobClient.wait(response.body.data.id);
+            }
 
             // 結果リストをクリア
             msgMgr.clear();
 
             // Httpリクエストコード判定
-            if (response.isSuccess()) {
+            if (response.isSuccess() && response.body.data.status === "failed") {
+                // ジョブ失敗メッセージ表示
+                const jobError = response.body.data.error;
+                msgMgr.show(jobError.message, MessageType.ERROR, "画像生成に失敗しました");
+
+            } else if (response.isSuccess()) {
 
                 response.body.data.generated.forEach(async (path) => {
                     
                     // カードテンプレート複製
                     const card = template.content.cloneNode(true);
                     
-                    // 画像パス取得(blob URL生成)
-                    const objcetUrl = await HttpClient.getBlobUrl(path);
-
-                    // 画像設定
+                    // 画像設定(署名付きURLのため直接読み込める)
                     const img = card.querySelector(".result-img");
-                    img.src = objcetUrl;
+                    img.src = path;
 
                     // カードにパスを保持
                     const root = card.querySelector(".result-card");
@@ -53,10 +53,9 @@ function setupRegenerate() {
 
                 // 発行したAPIキーを画面に表示
                 document.getElementById("uwgen-api-key-display").textContent = uwgn_gen_api_key;
-                document.getElementById("uwgen-api-key").value = uwgn_gen_api_key;
 
-                // API発行注意メッセージを表示
-                warning.textContent = "APIを発行しました。保存ボタンを押して確定してください";
+                // API発行注意メッセージを表示(APIキーは発行時点で保存済み。平文はこの画面でのみ表示される)
+                warning.textContent = "APIキーを発行しました。画面を離れると再表示できないため、控えておいてください(X-API-Keyヘッダーで使用します)";
                 warning.style.display = "block";
 
             } else {
@@ -89,8 +88,6 @@ function setupRegenerate() {
  */
 function setupSaveSettings() {
     const saveSettingsBtn = document.getElementById("save-settings-btn");
-    const uwgenHidden = document.getElementById("uwgen-api-key");
-    const uwgenOrigin = document.getElementById("original-uwgen-api-key");
     const geminiInput = document.getElementById("gemini-api-key");
     const geminiVertexAiInput = document.getElementById("gemini-api-key-vertexai");
     const warning = document.getElementById("uwgen-api-key-warning");
@@ -109,8 +106,6 @@ function setupSaveSettings() {
         try {
             // payload
             const payload = {
-                uwgen_api_key: uwgenHidden.value || null,
-                uwgen_api_key_changed: uwgenHidden.value !== uwgenOrigin.value,
                 gemini_api_key_encrypted: geminiInput.value || null,
                 gemini_api_key_changed: geminiInput.value.trim() !== "",
                 gemini_api_key_vertexai_encrypted: geminiVertexAiInput.value || null,
@@ -55,7 +55,7 @@ function setupSignin() {
 
         try {
             // サインイン処理(非同期)
-            const response = await HttpClient.post("/api/v1/auth/signin", payload);
+            const response = await HttpClient.post("/api/v1/auth/signin", payload, { auth: false });
 
             // メッセージエリアクリア
             msgMgr.clear();
@@ -63,9 +63,10 @@ function setupSignin() {
             // レスポンス判定
             if (response.isSuccess()) {
 
-                // アクセストークン取得
+                // アクセストークン・リフレッシュトークン取得
                 const token = response.body.data.access_token;
                 localStorage.setItem("access_token", token);
+                localStorage.setItem("refresh_token", response.body.data.refresh_token);
                 
                 // 成功メッセージ表示
                 msgMgr.show("サインインに成功しました", MessageType.SUCCESS, "成功");
@@ -69,7 +69,7 @@ function setupSignup() {
 
         try {
             // APIへPOSTする(非同期)
-            const response = await HttpClient.post("/api/v1/auth/signup", payload);
+            const response = await HttpClient.post("/api/v1/auth/signup", payload, { auth: false });
             
             // メッセージエリアクリア
             msgMgr.clear();
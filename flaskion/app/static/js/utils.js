@@ -14,6 +14,68 @@ export class HttpClient {
         return token ? { "Authorization": `Bearer ${token}` } : {};
     }
 
+    /**
+     * 実行中のトークン更新処理(同時に複数のリクエストが401になっても更新は1回にする)
+     * @type {Promise<boolean>|null}
+     */
+    static refreshing = null;
+
+    /**
+     * リクエストを送信する(認証付きで401の場合はトークンを更新して1回だけ再送する)
+     * @param {string} url - リクエスト先のURL
+     * @param {RequestInit} init - fetchのオプション
+     * @param {boolean} auth - 認証ヘッダーを付与したリクエストかどうか
+     * @returns {Promise<Response>} - fetchのレスポンス
+     */
+    static async send(url, init, auth) {
+        const response = await fetch(url, init);
+        if (!auth || response.status !== 401 || !(await HttpClient.refreshToken())) {
+            return response;
+        }
+
+        // 更新後のアクセストークンで再送する
+        return fetch(url, {
+            ...init,
+            headers: { ...init.headers, ...HttpClient.defaultHeaders() }
+        });
+    }
+
+    /**
+     * リフレッシュトークンでアクセストークンを更新する
+     * @returns {Promise<boolean>} - 更新できた場合はtrue
+     */
+    static refreshToken() {
+        if (!HttpClient.refreshing) {
+            HttpClient.refreshing = (async () => {
+                const refreshToken = localStorage.getItem("refresh_token");
+                if (!refreshToken) {
+                    return false;
+                }
+                try {
+                    const response = await fetch("/api/v1/auth/refresh", {
+                        method: "POST",
+                        headers: { "Content-Type": "application/json" },
+                        body: JSON.stringify({ refresh_token: refreshToken })
+                    });
+                    if (!response.ok) {
+                        // 失効済みの場合は再サインインが必要
+                        localStorage.removeItem("refresh_token");
+                        return false;
+                    }
+                    const body = await response.json();
+                    localStorage.setItem("access_token", body.data.access_token);
+                    localStorage.setItem("refresh_token", body.data.refresh_token);
+                    return true;
+                } catch (error) {
+                    return false;
+                }
+            })().finally(() => {
+                HttpClient.refreshing = null;
+            });
+        }
+        return HttpClient.refreshing;
+    }
+
     /**
      * POSTリクエストを送信する
      * @param {string} url  - リクエスト先のURL
@@ -40,11 +102,11 @@ export class HttpClient {
                 };
 
             // fetch APIでPOSTリスエストを送信
-            const response = await fetch(url, {
+            const response = await HttpClient.send(url, {
                 method : "POST",
                 headers: finalHeaders,
                 body: isFormData ? payload : JSON.stringify(payload)
-            });
+            }, auth);
             
             // レスポンスチェック
             const body = await response.json();
@@ -80,10 +142,10 @@ export class HttpClient {
                 : headers;
 
             // fetch APIでGETリクエストを送信
-            const response = await fetch(url, { 
+            const response = await HttpClient.send(url, { 
                 method: "GET",
                 headers: finalHeaders
-            });
+            }, auth);
             
             // レスポンスチェック
             const body = await response.json();
@@ -123,11 +185,11 @@ export class HttpClient {
                 };
 
             // fetch APIでPATCHリスエストを送信
-            const response = await fetch(url, {
+            const response = await HttpClient.send(url, {
                 method : "PATCH",
                 headers: finalHeaders,
                 body: JSON.stringify(payload)
-            });
+            }, auth);
             
             // レスポンスチェック
             const body = await response.json();
@@ -163,10 +225,10 @@ export class HttpClient {
                 : headers;
 
             // Blob URLの生成
-            const response = await fetch(url, {
+            const response = await HttpClient.send(url, {
                 method: "GET",
                 headers: finalHeaders
-            });
+            }, auth);
             const blob = await response.blob();
 
             // Blob URLを返す
@@ -189,10 +251,10 @@ export class HttpClient {
             const finalHeaders = auth
                 ? { ...HttpClient.defaultHeaders(), ...headers }
                 : headers;
-            const response = await fetch(url, {
+            const response = await HttpClient.send(url, {
                 method: "GET",
                 headers: finalHeaders
-            });
+            }, auth);
 
             // Blobを返す
             return await response.blob();
@@ -201,4 +263,132 @@ export class HttpClient {
             throw error;
         }
     }
+
+    /**
+     * URLからファイル名を取得する(クエリ文字列は除く)
+     * @param {string} url 画像URL(署名付きURLを含む)
+     * @returns {string} - ファイル名
+     */
+    static fileName(url) {
+        return new URL(url, window.location.origin).pathname.split("/").pop();
+    }
+}
+
+/**
+ * 非同期ジョブの完了を待機するためのユーティリティクラス
+ *
+ * - SocketIO(window.io)が利用可能な場合は完了イベントを待つ
+ * - SocketIOが利用できない、または接続できない場合はポーリングで待つ
+ */
+export class JobClient {
+
+    /** @type {object|null} SocketIO接続(ページ内で共有) */
+    static socket = null;
+
+    /**
+     * SocketIO接続を取得する
+     * @returns {object|null} - SocketIO接続。利用できない場合はnull
+     */
+    static getSocket() {
+        if (typeof window.io !== "function") {
+            return null;
+        }
+        if (!JobClient.socket) {
+            JobClient.socket = window.io({
+                auth: { token: localStorage.getItem("access_token") },
+                transports: ["websocket", "polling"],
+            });
+        }
+        return JobClient.socket;
+    }
+
+    /**
+     * ジョブが完了(succeeded / failed)するまで待機する
+     * - イベントが届かない場合(メッセージキュー未設定の複数ワーカー構成等)に備えて、低頻度のポーリングを併用する
+     * @param {string} jobId - ジョブID
+     * @param {number} [options.interval=1500] - ポーリング間隔(ミリ秒。SocketIOが利用できない場合)
+     * @param {number} [options.fallbackInterval=5000] - SocketIO待機中のポーリング間隔(ミリ秒)
+     * @returns {Promise<ResponseModel>} - 完了したジョブのレスポンス
+     */
+    static async wait(jobId, { interval = 1500, fallbackInterval = 5000 } = {}) {
+        const socket = JobClient.getSocket();
+        if (!socket) {
+            return JobClient.poll(jobId, { interval });
+        }
+
+        return new Promise((resolve) => {
+            let settled = false;
+            let timer = null;
+
+            // 待機を終了してイベント購読・ポーリングを解除する
+            const settle = (result) => {
+                if (settled) return;
+                settled = true;
+                clearTimeout(timer);
+                socket.off("image.completed", onFinished);
+                socket.off("image.failed", onFinished);
+                socket.off("connect_error", onError);
+                resolve(result);
+            };
+
+            // 完了イベント受信時
+            const onFinished = (job) => {
+                if (job.id === jobId) {
+                    settle(new ResponseModel({ status: 200, body: { data: job } }));
+                }
+            };
+
+            // 接続できない場合はポーリングに切り替える
+            const onError = () => settle(JobClient.poll(jobId, { interval }));
+
+            // 状態を確認し、未完了なら次の確認を予約する(購読前に完了していた場合・イベントが届かない場合に備える)
+            const check = async () => {
+                try {
+                    const response = await HttpClient.get(`/api/v1/jobs/${jobId}`, { auth: true });
+                    if (!response.isSuccess() || JobClient.isFinished(response.body.data)) {
+                        settle(response);
+                        return;
+                    }
+                } catch (error) {
+                    console.warn("Job status check failed", error);
+                }
+                if (!settled) {
+                    timer = setTimeout(check, fallbackInterval);
+                }
+            };
+
+            socket.on("image.completed", onFinished);
+            socket.on("image.failed", onFinished);
+            socket.on("connect_error", onError);
+            check();
+        });
+    }
+
+    /**
+     * ジョブが完了(succeeded / failed)するまでポーリングする
+     * @param {string} jobId - ジョブID
+     * @param {number} [options.interval=1500] - ポーリング間隔(ミリ秒)
+     * @returns {Promise<ResponseModel>} - 完了したジョブのレスポンス
+     */
+    static async poll(jobId, { interval = 1500 } = {}) {
+        while (true) {
+            const response = await HttpClient.get(`/api/v1/jobs/${jobId}`, { auth: true });
+
+            // エラー、または完了したジョブはそのまま返す
+            if (!response.isSuccess() || JobClient.isFinished(response.body.data)) {
+                return response;
+            }
+
+            await new Promise(resolve => setTimeout(resolve, interval));
+        }
+    }
+
+    /**
+     * ジョブが完了しているかどうかを判定する
+     * @param {object} job - ジョブ情報
+     * @returns {boolean} - 完了していればtrue
+     */
+    static isFinished(job) {
+        return job.status === "succeeded" || job.status === "failed";
+    }
 }
@@ -0,0 +1,130 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, Union
+
+@dataclass(frozen=True)
+class StorageObject:
+    """
+    ストレージ上のオブジェクト情報
+    """
+
+    key: str
+    """ オブジェクトキー(MEDIA_ROOTからの相対パス形式。区切りは/) """
+
+    size: int
+    """ サイズ(バイト) """
+
+    mtime: float
+    """ 更新日時(UNIXタイムスタンプ) """
+
+class StorageBackend(ABC):
+    """
+    メディアストレージの基底クラス
+
+    - オブジェクトはキー(例: <user_id>/generated/2026-01-05/xxx.png)で扱う
+    - 実装はブロッキングI/Oを行うため、リクエスト内ではio_pool経由で呼び出すこと
+    """
+
+    @abstractmethod
+    def put(self, key: str, data: Union[bytes, BinaryIO], content_type: Optional[str] = None,
+            overwrite: bool = True) -> None:
+        """
+        オブジェクトを書き込む(書き込み途中の状態は公開しない)
+
+        Parameters
+        ----------
+        key : str
+            オブジェクトキー
+        data : bytes | BinaryIO
+            バイナリ、または読み込み可能なストリーム
+        content_type : str | None
+            MIMEタイプ
+        overwrite : bool
+            既存のオブジェクトを上書きするかどうか(Falseの場合は既存を残す)
+        """
+        pass
+
+    @abstractmethod
+    def open(self, key: str) -> BinaryIO:
+        """
+        オブジェクトを読み込み用に開く(ストリーム)
+
+        Raises
+        ------
+        FileNotFoundError
+            オブジェクトが存在しない場合
+        """
+        pass
+
+    @abstractmethod
+    def stat(self, key: str) -> Optional[StorageObject]:
+        """
+        オブジェクト情報を取得する(存在しない場合はNone)
+        """
+        pass
+
+    @abstractmethod
+    def list(self, prefix: str) -> Iterator[StorageObject]:
+        """
+        キーが指定の接頭辞で始まるオブジェクトを列挙する(書き込み途中の一時オブジェクトは除く)
+        """
+        pass
+
+    @abstractmethod
+    def copy(self, src_key: str, dst_key: str) -> None:
+        """
+        オブジェクトを複製する(ローカルはハードリンク、S3はサーバー側コピー)
+
+        - ハードリンクは実体(更新日時を含む)を共有する。複製元・複製先の更新日時は変更しない
+        """
+        pass
+
+    def link(self, src_key: str, dst_key: str) -> bool:
+        """
+        オブジェクトの参照を作成する(実体を複製しない)
+
+        - 参照を持たないストレージ(S3等)は何もしない。読み込み側は実体のキーを直接使うこと
+
+        Returns
+        -------
+        bool
+            参照を作成した場合はTrue
+        """
+
+        return False
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """
+        オブジェクトを削除する(存在しない場合は何もしない)
+        """
+        pass
+
+    def exists(self, key: str) -> bool:
+        """
+        オブジェクトが存在するかどうか
+        """
+
+        return self.stat(key) is not None
+
+    def local_path(self, key: str) -> Optional[Path]:
+        """
+        オブジェクトのローカルファイルパスを取得する(ローカルストレージ以外はNone)
+        """
+
+        return None
+
+    def presigned_url(self, key: str, expires_in: int) -> Optional[str]:
+        """
+        オブジェクトを直接取得できる期限付きURLを作成する(非対応の場合はNone)
+
+        Parameters
+        ----------
+        key : str
+            オブジェクトキー
+        expires_in : int
+            有効期間(秒)
+        """
+
+        return None
@@ -0,0 +1,51 @@
+import threading
+from typing import Optional
+from app.core.config import settings
+from app.core.enums import StorageBackendType
+from app.storage.base import StorageBackend
+
+_storage: Optional[StorageBackend] = None
+_lock = threading.Lock()
+
+def get_storage() -> StorageBackend:
+    """
+    設定(STORAGE_BACKEND)に応じたメディアストレージを取得する
+
+    - ワーカープロセスごとに1インスタンスを共有する
+
+    Returns
+    -------
+    StorageBackend
+        メディアストレージ
+
+    Raises
+    ------
+    ValueError
+        STORAGE_BACKENDが不正な場合
+    """
+
+    global _storage
+    if _storage is None:
+        with _lock:
+            if _storage is None:
+                _storage = _create_storage(StorageBackendType(settings.STORAGE_BACKEND))
+    return _storage
+
+def _create_storage(backend: StorageBackendType) -> StorageBackend:
+    """
+    メディアストレージを作成する
+    """
+
+    if backend == StorageBackendType.S3:
+        from app.storage.s3 import S3Storage
+        return S3Storage(
+            bucket=settings.S3_BUCKET,
+            prefix=settings.S3_PREFIX,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            region=settings.S3_REGION,
+            access_key_id=settings.S3_ACCESS_KEY_ID,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY
+        )
+
+    from app.storage.local import LocalStorage
+    return LocalStorage(settings.MEDIA_ROOT)
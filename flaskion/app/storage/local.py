@@ -0,0 +1,130 @@
+import os
+import shutil
+import uuid
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Iterator, Optional, Union
+from app.storage.base import StorageBackend, StorageObject
+
+class LocalStorage(StorageBackend):
+    """
+    ローカルファイルシステムのストレージ
+
+    - キーはルートディレクトリからの相対パス
+    - 書き込みは一時ファイル経由のアトミック書き込み(書き込み途中のファイルは公開されない)
+    - 複製はハードリンク(非対応の場合はコピー)
+    """
+
+    # 一時ファイル・隠しディレクトリの接頭辞(列挙・ギャラリー再構築ツール等は無視する)
+    TEMP_PREFIX = "."
+
+    def __init__(self, root: Path):
+        """
+        コンストラクタ
+
+        Parameters
+        ----------
+        root : Path
+            ルートディレクトリ(MEDIA_ROOT)
+        """
+
+        self.root = root
+
+    def put(self, key: str, data: Union[bytes, BinaryIO], content_type: Optional[str] = None,
+            overwrite: bool = True) -> None:
+        path = self.local_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.write_atomic(path, data, overwrite=overwrite)
+
+    def open(self, key: str) -> BinaryIO:
+        return open(self.local_path(key), "rb")
+
+    def stat(self, key: str) -> Optional[StorageObject]:
+        try:
+            stat = self.local_path(key).stat()
+        except FileNotFoundError:
+            return None
+        return StorageObject(key=key, size=stat.st_size, mtime=stat.st_mtime)
+
+    def list(self, prefix: str) -> Iterator[StorageObject]:
+        base = self.local_path(prefix.rstrip("/")) if prefix.rstrip("/") else self.root
+        if not base.is_dir():
+            return
+
+        for dirpath, dirnames, filenames in os.walk(base):
+            # 隠しディレクトリ(派生画像等)は対象外
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith(self.TEMP_PREFIX))
+            for filename in sorted(filenames):
+                if filename.startswith(self.TEMP_PREFIX):
+                    continue
+                path = Path(dirpath) / filename
+                stat = path.stat()
+                yield StorageObject(key=path.relative_to(self.root).as_posix(), size=stat.st_size, mtime=stat.st_mtime)
+
+    def copy(self, src_key: str, dst_key: str) -> None:
+        src_path = self.local_path(src_key)
+        dst_path = self.local_path(dst_key)
+        dst_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # 一時名でリンクしてからリネームする
+        tmp_path = dst_path.with_name(f"{self.TEMP_PREFIX}{dst_path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            os.link(src_path, tmp_path)
+            os.replace(tmp_path, dst_path)
+        except OSError:
+            # ハードリンク非対応(別デバイス等)の場合はコピーする
+            tmp_path.unlink(missing_ok=True)
+            with open(src_path, "rb") as f:
+                self.put(dst_key, f)
+
+    def link(self, src_key: str, dst_key: str) -> bool:
+        # ハードリンク(非対応の場合はコピー)で参照を作成する
+        self.copy(src_key, dst_key)
+        return True
+
+    def delete(self, key: str) -> None:
+        self.local_path(key).unlink(missing_ok=True)
+
+    def local_path(self, key: str) -> Path:
+        return self.root / PurePosixPath(key)
+
+    @staticmethod
+    def write_atomic(path: Path, data: Union[bytes, BinaryIO], overwrite: bool = True) -> None:
+        """
+        ファイルをアトミックに書き込む
+
+        - 同一ディレクトリの一時ファイルに書き込み、fsync後にリネームする
+        - 失敗時は一時ファイルを削除する
+
+        Parameters
+        ----------
+        path : Path
+            出力先パス(親ディレクトリは作成済み)
+        data : bytes | BinaryIO
+            バイナリ、または読み込み可能なストリーム
+        overwrite : bool
+            既存のファイルを上書きするかどうか(Falseの場合は既存を残す)
+        """
+
+        tmp_path = path.with_name(f"{LocalStorage.TEMP_PREFIX}{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                if isinstance(data, (bytes, bytearray)):
+                    f.write(data)
+                else:
+                    shutil.copyfileobj(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+
+            if overwrite:
+                os.replace(tmp_path, path)
+            else:
+                # 既存があれば残す(並行して同じキーを書き込んだ場合も先に公開された方を残す)
+                try:
+                    os.link(tmp_path, path)
+                except FileExistsError:
+                    pass
+                except OSError:
+                    # ハードリンク非対応の場合はリネームで公開する
+                    os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
@@ -0,0 +1,132 @@
+import threading
+from typing import BinaryIO, Iterator, Optional, Union
+from app.storage.base import StorageBackend, StorageObject
+
+class S3Storage(StorageBackend):
+    """
+    S3互換オブジェクトストレージ(AWS S3 / MinIO等)
+
+    - boto3は利用時に読み込む(STORAGE_BACKEND=s3の場合のみ必要)
+    - endpoint_urlを指定するとMinIO等のS3互換サーバーに接続する
+    - 画像配信は期限付きURL(presigned URL)へのリダイレクトで行う
+    - 参照(link)は作成しない。サーバー側コピーは実体と同じ容量を消費するため、copyは移行ツールのみで使う
+    """
+
+    def __init__(self, bucket: str, prefix: str = "", endpoint_url: Optional[str] = None,
+                 region: Optional[str] = None, access_key_id: Optional[str] = None,
+                 secret_access_key: Optional[str] = None):
+        """
+        コンストラクタ
+
+        Parameters
+        ----------
+        bucket : str
+            バケット名
+        prefix : str
+            キーの接頭辞(バケットを他用途と共有する場合)
+        endpoint_url : str | None
+            S3互換サーバーのURL(例: http://minio:9000)
+        region : str | None
+            リージョン
+        access_key_id : str | None
+            アクセスキーID(Noneの場合はboto3の既定の認証情報)
+        secret_access_key : str | None
+            シークレットアクセスキー
+        """
+
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self._client_kwargs = {
+            "endpoint_url": endpoint_url or None,
+            "region_name": region or None,
+            "aws_access_key_id": access_key_id or None,
+            "aws_secret_access_key": secret_access_key or None,
+        }
+        self._client = None
+        self._lock = threading.Lock()
+
+    def put(self, key: str, data: Union[bytes, BinaryIO], content_type: Optional[str] = None,
+            overwrite: bool = True) -> None:
+        if not overwrite and self.exists(key):
+            return
+
+        extra = {"ContentType": content_type} if content_type else {}
+        if isinstance(data, (bytes, bytearray)):
+            self._get_client().put_object(Bucket=self.bucket, Key=self._object_key(key), Body=bytes(data), **extra)
+        else:
+            # ストリームはマルチパートで分割アップロードする
+            self._get_client().upload_fileobj(data, self.bucket, self._object_key(key), ExtraArgs=extra or None)
+
+    def open(self, key: str) -> BinaryIO:
+        client = self._get_client()
+        try:
+            return client.get_object(Bucket=self.bucket, Key=self._object_key(key))["Body"]
+        except client.exceptions.NoSuchKey as e:
+            raise FileNotFoundError(key) from e
+
+    def stat(self, key: str) -> Optional[StorageObject]:
+        from botocore.exceptions import ClientError
+
+        try:
+            head = self._get_client().head_object(Bucket=self.bucket, Key=self._object_key(key))
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        return StorageObject(key=key, size=head["ContentLength"], mtime=head["LastModified"].timestamp())
+
+    def list(self, prefix: str) -> Iterator[StorageObject]:
+        paginator = self._get_client().get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self._object_key(prefix)):
+            for item in page.get("Contents", []):
+                yield StorageObject(
+                    key=self._storage_key(item["Key"]),
+                    size=item["Size"],
+                    mtime=item["LastModified"].timestamp()
+                )
+
+    def copy(self, src_key: str, dst_key: str) -> None:
+        self._get_client().copy_object(
+            Bucket=self.bucket,
+            Key=self._object_key(dst_key),
+            CopySource={"Bucket": self.bucket, "Key": self._object_key(src_key)}
+        )
+
+    def delete(self, key: str) -> None:
+        self._get_client().delete_object(Bucket=self.bucket, Key=self._object_key(key))
+
+    def presigned_url(self, key: str, expires_in: int) -> Optional[str]:
+        return self._get_client().generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": self._object_key(key)},
+            ExpiresIn=expires_in
+        )
+
+    def _object_key(self, key: str) -> str:
+        """
+        ストレージキーをバケット内のオブジェクトキーに変換する
+        """
+
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def _storage_key(self, object_key: str) -> str:
+        """
+        バケット内のオブジェクトキーをストレージキーに変換する
+        """
+
+        return object_key[len(self.prefix) + 1:] if self.prefix else object_key
+
+    def _get_client(self):
+        """
+        S3クライアントを取得する(初回利用時に作成する。クライアントはスレッドセーフ)
+        """
+
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    try:
+                        import boto3
+                    except ImportError as e:
+                        raise RuntimeError("STORAGE_BACKEND=s3 requires boto3 (pip install boto3)") from e
+                    self._client = boto3.client("s3", **self._client_kwargs)
+        return self._client
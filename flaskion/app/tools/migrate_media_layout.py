@@ -0,0 +1,131 @@
+"""
+メディア配置方式の移行ツール(dated → sharded)
+
+- <user>/<種類>/<YYYY-MM-DD>/<ファイル名> の画像を <user>/<種類>/<aa>/<bb>/<ファイル名> に移動する
+- 移動した画像のインデックス(imagesテーブル)のstorage_keyを書き換える
+- 旧方式の派生画像は削除する(新しい位置で初回要求時に再生成される)
+- 移行中も画像取得APIは両方式を読むため、サービスを止めずに実行できる
+- 途中で中断しても再実行できる(移動済みの画像はスキップする)
+
+Usage
+-----
+python -m app.tools.migrate_media_layout [--user <user_id>] [--dry-run]
+"""
+import argparse
+import uuid
+from datetime import datetime
+from app.core.enums import ImageVariant, MediaLayout
+from app.db.session import db
+from app.models.image import Image
+from app.models.user import User
+from app.services.derivative_service import DerivativeService
+from app.services.image_service import ImageGenService
+from app.storage.factory import get_storage
+from app.storage.local import LocalStorage
+from app.tools.reindex_gallery import TARGET_DIRS
+
+def migrate_user(user_id: str, dry_run: bool = False) -> int:
+    """
+    ユーザーの画像を新しい配置方式に移動する
+
+    Parameters
+    ----------
+    user_id : str
+        ユーザーID
+    dry_run : bool
+        Trueの場合は移動せずに件数のみ数える
+
+    Returns
+    -------
+    int
+        移動した画像ファイル数
+    """
+
+    storage = get_storage()
+    count = 0
+    for path_type, dir_name in TARGET_DIRS:
+        prefix = f"{user_id}/{dir_name}/"
+
+        # 旧方式の画像(<date_dir>/<filename>)を対象にする
+        legacy = []
+        for obj in storage.list(prefix):
+            parts = obj.key[len(prefix):].split("/")
+            if len(parts) != 2 or any(part.startswith(LocalStorage.TEMP_PREFIX) for part in parts):
+                continue
+            if not is_date_dir(parts[0]):
+                continue
+            legacy.append((obj.key, parts[0], parts[1]))
+
+        for legacy_key, date_dir, filename in legacy:
+            count += 1
+            if dry_run:
+                continue
+
+            new_key = ImageGenService.get_image_key(path_type, date_dir, user_id, filename, MediaLayout.SHARDED)
+
+            # 新しい位置に複製する(ローカルはハードリンクのため実体は共有される)
+            if not storage.exists(new_key):
+                storage.copy(legacy_key, new_key)
+
+            # インデックスの参照を書き換えてから旧方式のファイルを削除する
+            db.query(Image).filter_by(
+                user_id=user_id,
+                path_type=path_type,
+                date_dir=date_dir,
+                filename=filename
+            ).update({Image.storage_key: new_key}, synchronize_session=False)
+            db.commit()
+
+            storage.delete(legacy_key)
+            for variant in (ImageVariant.THUMB, ImageVariant.MEDIUM):
+                storage.delete(DerivativeService.derivative_key(legacy_key, variant))
+
+        # ローカルストレージの場合は空になった日付フォルダを削除する
+        if not dry_run:
+            remove_empty_dirs(storage.local_path(prefix.rstrip("/")))
+
+    return count
+
+def is_date_dir(name: str) -> bool:
+    """
+    旧方式の日付フォルダ名(YYYY-MM-DD)かどうかを判定する
+    """
+
+    try:
+        datetime.strptime(name, "%Y-%m-%d")
+    except ValueError:
+        return False
+    return True
+
+def remove_empty_dirs(root) -> None:
+    """
+    空になったディレクトリを削除する(ローカルストレージのみ)
+    """
+
+    if root is None or not root.is_dir():
+        return
+    for path in sorted(root.rglob("*"), key=lambda p: len(p.parts), reverse=True):
+        if path.is_dir() and not any(path.iterdir()):
+            path.rmdir()
+
+def main():
+    parser = argparse.ArgumentParser(description="Move media files from the dated layout to the sharded layout.")
+    parser.add_argument("--user", help="対象ユーザーID(省略時は全ユーザー)")
+    parser.add_argument("--dry-run", action="store_true", help="移動せずに対象件数のみ表示する")
+    args = parser.parse_args()
+
+    # 対象ユーザー
+    if args.user:
+        user_ids = [str(uuid.UUID(args.user))]
+    else:
+        user_ids = [str(user_id) for (user_id,) in db.query(User.id).order_by(User.id)]
+
+    try:
+        for user_id in user_ids:
+            count = migrate_user(user_id, dry_run=args.dry_run)
+            print(f"✅ {user_id}: {count} files {'found' if args.dry_run else 'moved'}")
+    finally:
+        db.remove()
+
+if __name__ == "__main__":
+    main()
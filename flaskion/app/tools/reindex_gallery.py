@@ -0,0 +1,109 @@
+"""
+ギャラリーインデックス(imagesテーブル)の再構築ツール
+
+- メディアストレージ(STORAGE_BACKEND)の既存画像を列挙し、未登録のものをインデックスに登録する
+- インデックス導入前に保存された画像をギャラリーに表示するために一度だけ実行する
+
+Usage
+-----
+python -m app.tools.reindex_gallery [--user <user_id>]
+"""
+import argparse
+import uuid
+from datetime import datetime, timezone
+from sqlalchemy.dialects.postgresql import insert
+from app.core.config import settings
+from app.core.enums import ImagePathType
+from app.db.session import db
+from app.models.image import Image
+from app.models.user import User
+from app.services.image_service import ImageGenService
+from app.storage.factory import get_storage
+from app.storage.local import LocalStorage
+
+# 画像種類とディレクトリ名の対応
+TARGET_DIRS = (
+    (ImagePathType.GENERATED.value, settings.GEN_IMAGE_DIR),
+    (ImagePathType.EDITED.value, settings.EDIT_IMAGE_DIR),
+)
+
+def reindex_user(user_id: str) -> int:
+    """
+    ユーザーの画像をインデックスに登録する
+
+    Parameters
+    ----------
+    user_id : str
+        ユーザーID
+
+    Returns
+    -------
+    int
+        走査した画像ファイル数
+    """
+
+    storage = get_storage()
+    count = 0
+    for path_type, dir_name in TARGET_DIRS:
+        # 日付フォルダごとにまとめる
+        # dated: <user_id>/<dir_name>/<date_dir>/<filename>
+        # sharded: <user_id>/<dir_name>/<aa>/<bb>/<filename>(日付はファイル名、なければ更新日時から求める)
+        rows_by_date: dict[str, list[dict]] = {}
+        prefix = f"{user_id}/{dir_name}/"
+        for obj in storage.list(prefix):
+            parts = obj.key[len(prefix):].split("/")
+
+            # 派生画像・書き込み途中の一時ファイルは対象外
+            if len(parts) not in (2, 3) or any(part.startswith(LocalStorage.TEMP_PREFIX) for part in parts):
+                continue
+            filename = parts[-1]
+            if len(parts) == 2:
+                date_dir = parts[0]
+            else:
+                date_dir = (
+                    ImageGenService.date_from_filename(filename)
+                    or datetime.fromtimestamp(obj.mtime, tz=timezone.utc).date().isoformat()
+                )
+            rows_by_date.setdefault(date_dir, []).append({
+                "user_id": user_id,
+                "path_type": path_type,
+                "date_dir": date_dir,
+                "filename": filename,
+                "mtime": obj.mtime,
+                "size_bytes": obj.size,
+                "storage_key": obj.key,
+            })
+
+        for date_dir in sorted(rows_by_date):
+            rows = rows_by_date[date_dir]
+
+            # 登録済みのファイルは無視する
+            stmt = insert(Image).values(rows).on_conflict_do_nothing(
+                index_elements=["user_id", "path_type", "date_dir", "filename"]
+            )
+            db.execute(stmt)
+            db.commit()
+            count += len(rows)
+
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the gallery image index from the media storage.")
+    parser.add_argument("--user", help="対象ユーザーID(省略時は全ユーザー)")
+    args = parser.parse_args()
+
+    # 対象ユーザー
+    if args.user:
+        user_ids = [str(uuid.UUID(args.user))]
+    else:
+        user_ids = [str(user_id) for (user_id,) in db.query(User.id).order_by(User.id)]
+
+    try:
+        for user_id in user_ids:
+            count = reindex_user(user_id)
+            print(f"✅ {user_id}: {count} files scanned")
+    finally:
+        db.remove()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import os
+import secrets
+import uuid
+from datetime import datetime, timezone
+import pytest
+from cryptography.fernet import Fernet
+
+# アプリのモジュールを読み込む前に必須の環境変数を設定する
+os.environ.setdefault("GEMINI_KEY_SECRET", Fernet.generate_key().decode())
+os.environ.setdefault("UWGEN_KEY_SECRET", Fernet.generate_key().decode())
+os.environ.setdefault("JWT_SECRET_KEY", secrets.token_urlsafe(32))
+
+import libcore_hng.utils.app_logger as app_logger
+from libcore_hng.configs.logger import LoggerConfig
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+from app.core.config import settings
+from app.db.session import db
+import app.storage.factory as storage_factory
+
+# ロガーは既定設定で使う(init_loggingはログファイルを作成するため呼び出さない)
+app_logger.logger_config = LoggerConfig()
+
+@pytest.fixture
+def local_storage(tmp_path, monkeypatch):
+    """
+    一時ディレクトリをMEDIA_ROOTとするローカルストレージ
+    """
+
+    monkeypatch.setattr(settings, "MEDIA_ROOT", tmp_path)
+    monkeypatch.setattr(settings, "STORAGE_BACKEND", "local")
+    monkeypatch.setattr(storage_factory, "_storage", None)
+    yield storage_factory.get_storage()
+    storage_factory._storage = None
+
+@pytest.fixture
+def sqlite_db():
+    """
+    インメモリSQLiteにセッションを接続し、指定したモデルのテーブルを作成する関数を返す
+
+    - uwgenスキーマはATTACHしたデータベースで代用する
+    - PostgreSQLの関数(gen_random_uuid, NOW)はSQLite関数として登録する(NOWはタイムゾーンなしのUTC)
+    """
+
+    def on_connect(conn, record):
+        conn.execute("ATTACH DATABASE ':memory:' AS uwgen")
+        conn.create_function("gen_random_uuid", 0, lambda: uuid.uuid4().hex)
+        conn.create_function("NOW", 0, lambda: datetime.now(timezone.utc).replace(tzinfo=None).isoformat(sep=" "))
+
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    event.listen(engine, "connect", on_connect)
+
+    def create_tables(*models):
+        for model in models:
+            model.__table__.create(engine)
+
+    db.remove()
+    db.configure(bind=engine)
+    yield create_tables
+    db.remove()
+    engine.dispose()
@@ -0,0 +1,65 @@
+import uuid
+from http import HTTPStatus
+import pytest
+from flask import Flask
+from app.core.errors import UserError
+from app.core.security import api_key_digest, get_current_user
+from app.db.session import db
+from app.models.user import User
+from app.services.user_service import UserService
+
+@pytest.fixture
+def user(sqlite_db):
+    sqlite_db(User)
+    user = User(id=uuid.uuid4(), email=f"{uuid.uuid4().hex}@example.com", password_hash="x")
+    db.add(user)
+    db.commit()
+    return user
+
+def authenticate(headers: dict):
+    app = Flask(__name__)
+    with app.test_request_context("/", headers=headers):
+        return get_current_user()
+
+def test_digest_is_deterministic_and_key_specific():
+    digest = api_key_digest("key-a")
+
+    assert digest == api_key_digest("key-a")
+    assert digest != api_key_digest("key-b")
+    assert len(digest) == 64
+
+def test_api_key_resolves_user(user):
+    api_key, _ = UserService.generate_uwgen_api_key(user.id)
+
+    resolved, error, status = authenticate({"X-API-Key": api_key})
+
+    assert error is None and status is None
+    assert resolved.id == user.id
+
+def test_unknown_api_key_is_rejected(user):
+    UserService.generate_uwgen_api_key(user.id)
+
+    assert authenticate({"X-API-Key": "unknown"}) == (None, UserError.INVALID_API_KEY, HTTPStatus.UNAUTHORIZED)
+
+def test_regenerated_key_invalidates_old_one(user):
+    old_key, _ = UserService.generate_uwgen_api_key(user.id)
+    authenticate({"X-API-Key": old_key})
+    new_key, _ = UserService.generate_uwgen_api_key(user.id)
+
+    assert authenticate({"X-API-Key": old_key})[1] == UserError.INVALID_API_KEY
+    assert authenticate({"X-API-Key": new_key})[0].id == user.id
+
+def test_inactive_user_is_rejected(user):
+    api_key, _ = UserService.generate_uwgen_api_key(user.id)
+    user.is_active = False
+    db.commit()
+
+    assert authenticate({"X-API-Key": api_key})[1] == UserError.INVALID_API_KEY
+
+def test_authorization_header_takes_precedence(user):
+    api_key, _ = UserService.generate_uwgen_api_key(user.id)
+
+    resolved, error, _ = authenticate({"Authorization": "Bearer invalid", "X-API-Key": api_key})
+
+    assert resolved is None
+    assert error == UserError.INVALID_ACCESS_TOKEN
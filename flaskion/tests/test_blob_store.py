@@ -0,0 +1,92 @@
+import io
+import os
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from flask import Flask
+from PIL import Image as PIL_image
+from app.api.v1.image_gen import bp as image_gen_bp
+from app.core.config import settings
+from app.core.enums import ImagePathType, ImageVariant
+from app.models.image import Image
+from app.services.blob_store import BlobStore
+from app.services.image_delivery_service import ImageDeliveryService
+from app.services.image_service import ImageGenService
+from app.services.image_url_service import ImageUrlService
+
+def blob_files(storage):
+    return [path for path in storage.root.rglob("*") if path.is_file() and settings.MEDIA_BLOB_DIR in path.parts]
+
+def test_identical_bytes_share_one_blob(local_storage):
+    h1 = BlobStore.store("user-a/gen/20260101/a.png", b"same")
+    h2 = BlobStore.store("user-b/gen/20260101/b.png", b"same")
+
+    assert h1 == h2 == BlobStore.digest(b"same")
+    assert len(blob_files(local_storage)) == 1
+    assert local_storage.exists(BlobStore.blob_key(h1, ".png"))
+    with local_storage.open("user-b/gen/20260101/b.png") as f:
+        assert f.read() == b"same"
+
+def test_sharing_keeps_existing_reference_metadata(local_storage):
+    BlobStore.store("user-a/gen/20260101/a.png", b"same")
+    first = local_storage.local_path("user-a/gen/20260101/a.png")
+    os.utime(first, (1_000_000, 1_000_000))
+    before = first.stat()
+
+    BlobStore.store("user-b/gen/20260101/b.png", b"same")
+
+    after = first.stat()
+    assert after.st_mtime_ns == before.st_mtime_ns
+    assert after.st_ino == before.st_ino
+
+def test_etag_is_stable_across_sharing(local_storage):
+    content_hash = BlobStore.store("user-a/gen/20260101/a.png", b"same")
+    image = SimpleNamespace(content_hash=content_hash, created_at=datetime(2026, 1, 1, 12, 0, 0, 500, tzinfo=timezone.utc))
+    etag, last_modified = ImageDeliveryService.validators(image)
+    path = local_storage.local_path("user-a/gen/20260101/a.png")
+
+    app = Flask(__name__)
+    with app.test_request_context("/"):
+        first = ImageDeliveryService.send(path, mimetype="image/png", etag=etag, last_modified=last_modified)
+    BlobStore.store("user-b/gen/20260101/b.png", b"same")
+    with app.test_request_context("/"):
+        second = ImageDeliveryService.send(path, mimetype="image/png", etag=etag, last_modified=last_modified)
+    with app.test_request_context("/", headers={"If-None-Match": f'"{content_hash}"'}):
+        cached = ImageDeliveryService.send(path, mimetype="image/png", etag=etag, last_modified=last_modified)
+
+    assert first.headers["ETag"] == second.headers["ETag"] == f'"{content_hash}"'
+    assert first.headers["Last-Modified"] == "Thu, 01 Jan 2026 12:00:00 GMT"
+    assert cached.status_code == 304
+
+def test_validators_for_derivatives_and_unindexed_images():
+    image = SimpleNamespace(content_hash="abc", created_at=datetime(2026, 1, 1, tzinfo=timezone.utc))
+
+    etag, _ = ImageDeliveryService.validators(image, ImageVariant.THUMB)
+
+    assert etag.startswith("abc-thumb-")
+    assert ImageDeliveryService.validators(None) == (None, None)
+
+def test_missing_blob_returns_not_found(local_storage, sqlite_db):
+    sqlite_db(Image)
+    buffer = io.BytesIO()
+    PIL_image.new("RGB", (8, 8)).save(buffer, format="PNG")
+    user_id = uuid.uuid4()
+    path_type, date_dir, filename = ImageGenService.store_results(
+        user_id, ImagePathType.GENERATED.value, [buffer.getvalue()]
+    )[0]
+
+    app = Flask(__name__)
+    app.register_blueprint(image_gen_bp)
+    with app.test_request_context("/"):
+        original = ImageUrlService.build(user_id, path_type, date_dir, filename)
+        thumb = ImageUrlService.build(user_id, path_type, date_dir, filename, variant=ImageVariant.THUMB)
+    client = app.test_client()
+    assert client.get(original).status_code == 200
+
+    # 実体と参照を削除する(派生画像も未生成の状態にする)
+    for path in list(local_storage.root.rglob("*")):
+        if path.is_file():
+            path.unlink()
+
+    assert client.get(original).status_code == 404
+    assert client.get(thumb).status_code == 404
@@ -0,0 +1,65 @@
+from app.core import cache as cache_module
+from app.core.cache import TTLCache
+
+class FakeClock:
+    """
+    time.monotonicの代わりに使う時計
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def make_cache(monkeypatch, maxsize=3, ttl=10.0):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    return TTLCache(maxsize=maxsize, ttl=ttl), clock
+
+def test_get_returns_value_until_expired(monkeypatch):
+    cache, clock = make_cache(monkeypatch)
+    cache.set("a", 1)
+
+    clock.now += 9.9
+    assert cache.get("a") == 1
+
+    clock.now += 0.1
+    assert cache.get("a", "miss") == "miss"
+    assert len(cache) == 0
+
+def test_evicts_least_recently_used(monkeypatch):
+    cache, _ = make_cache(monkeypatch, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+def test_disabled_when_ttl_or_maxsize_is_zero(monkeypatch):
+    for maxsize, ttl in ((3, 0), (0, 10)):
+        cache, _ = make_cache(monkeypatch, maxsize=maxsize, ttl=ttl)
+        cache.set("a", 1)
+
+        assert not cache.enabled
+        assert cache.get("a") is None
+
+def test_pop_and_pop_matching(monkeypatch):
+    cache, _ = make_cache(monkeypatch, maxsize=10)
+    for key in (("u1", "x"), ("u1", "y"), ("u2", "x")):
+        cache.set(key, key)
+
+    assert cache.pop(("u2", "x")) == ("u2", "x")
+    assert cache.pop(("u2", "x"), "gone") == "gone"
+    assert cache.pop_matching(lambda key: key[0] == "u1") == 2
+    assert len(cache) == 0
+
+def test_clear(monkeypatch):
+    cache, _ = make_cache(monkeypatch)
+    cache.set("a", 1)
+    cache.clear()
+
+    assert cache.get("a") is None
@@ -0,0 +1,47 @@
+import threading
+import time
+import pytest
+from app.core.concurrency import BlockingPool
+
+def test_run_uses_pool_threads():
+    pool = BlockingPool("test-pool", 2)
+
+    name = pool.run(lambda: threading.current_thread().name)
+
+    assert name.startswith("test-pool")
+
+def test_run_limits_concurrency_without_gevent():
+    pool = BlockingPool("test-pool", 1)
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def work():
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.05)
+        with lock:
+            state["active"] -= 1
+
+    callers = [threading.Thread(target=pool.run, args=(work,)) for _ in range(4)]
+    for caller in callers:
+        caller.start()
+    for caller in callers:
+        caller.join()
+
+    assert state["peak"] == 1
+
+def test_run_propagates_exceptions():
+    pool = BlockingPool("test-pool", 1)
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        pool.run(fail)
+
+def test_map_keeps_input_order():
+    pool = BlockingPool("test-pool", 3)
+
+    assert pool.map(lambda x: x * 2, [3, 1, 2]) == [6, 2, 4]
+    assert pool.map(lambda x: x * 2, [5]) == [10]
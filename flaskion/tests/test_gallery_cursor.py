@@ -0,0 +1,18 @@
+import pytest
+from app.services.gallery_service import GalleryService
+
+def test_cursor_round_trip():
+    cursor = GalleryService.encode_cursor("2026-01-05", 1767571200.125, "20260105T000000Z_abc.png")
+
+    assert GalleryService.decode_cursor(cursor) == ("2026-01-05", 1767571200.125, "20260105T000000Z_abc.png")
+
+def test_cursor_is_url_safe():
+    cursor = GalleryService.encode_cursor("2026-01-05", 1.0, "a+b/c?.png")
+
+    assert "=" not in cursor
+    assert all(c.isalnum() or c in "-_" for c in cursor)
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", "W10", "WyJhIl0"])
+def test_decode_rejects_invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        GalleryService.decode_cursor(cursor)
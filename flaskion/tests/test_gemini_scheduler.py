@@ -0,0 +1,103 @@
+import threading
+import time
+import pytest
+from gevent import GreenletExit
+import app.services.gemini_scheduler as scheduler_module
+from app.core.config import settings
+from app.services.gemini_scheduler import GeminiScheduler, GeminiSchedulerTimeout
+
+@pytest.fixture(autouse=True)
+def scheduler(monkeypatch):
+    """
+    スケジューラーの状態を初期化し、同時実行数を設定する
+    """
+
+    monkeypatch.setattr(settings, "GEMINI_MAX_CONCURRENCY", 1)
+    monkeypatch.setattr(settings, "GEMINI_USER_CONCURRENCY", 1)
+    monkeypatch.setattr(GeminiScheduler, "_virtual_time", 0.0)
+    monkeypatch.setattr(GeminiScheduler, "_finish_tags", {})
+    monkeypatch.setattr(GeminiScheduler, "_queues", {})
+    monkeypatch.setattr(GeminiScheduler, "_running", 0)
+    monkeypatch.setattr(GeminiScheduler, "_user_running", {})
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not met"
+        time.sleep(0.005)
+
+def test_fair_share_between_users():
+    order = []
+    release = threading.Event()
+
+    def hold():
+        with GeminiScheduler.slot("blocker"):
+            release.wait()
+
+    def call(user):
+        with GeminiScheduler.slot(user):
+            order.append(user)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    wait_until(lambda: GeminiScheduler.stats()["running"] == 1)
+
+    # ユーザーAが3件投入した後にユーザーBが1件投入する
+    callers = []
+    for user in ("a", "a", "a", "b"):
+        caller = threading.Thread(target=call, args=(user,))
+        caller.start()
+        callers.append(caller)
+        wait_until(lambda n=len(callers): GeminiScheduler.stats()["waiting"] == n)
+
+    release.set()
+    for thread in (holder, *callers):
+        thread.join()
+
+    assert order == ["a", "b", "a", "a"]
+
+def test_caps_and_queue_timeout(monkeypatch):
+    monkeypatch.setattr(settings, "GEMINI_MAX_CONCURRENCY", 2)
+
+    with GeminiScheduler.slot("a"):
+        with GeminiScheduler.slot("b"):
+            assert GeminiScheduler.stats()["running"] == 2
+        with pytest.raises(GeminiSchedulerTimeout):
+            with GeminiScheduler.slot("a", timeout=0.05):
+                pass
+
+    assert GeminiScheduler.stats() == {"running": 0, "waiting": 0, "users": 0}
+
+class InterruptedWaiter(scheduler_module._Waiter):
+    """
+    待機中にグリーンレットがkillされた状態を再現する実行待ち
+    """
+
+    def __init__(self, user_key, finish_tag):
+        super().__init__(user_key, finish_tag)
+        self.event.wait = self.interrupt
+
+    def interrupt(self, timeout=None):
+        raise GreenletExit()
+
+def test_interrupted_waiter_leaves_the_queue(monkeypatch):
+    with GeminiScheduler.slot("a"):
+        with monkeypatch.context() as m:
+            m.setattr(scheduler_module, "_Waiter", InterruptedWaiter)
+            with pytest.raises(GreenletExit):
+                with GeminiScheduler.slot("b"):
+                    pass
+
+        assert GeminiScheduler.stats()["waiting"] == 0
+
+def test_interrupted_dispatched_waiter_releases_its_slot(monkeypatch):
+    # 実行枠が空いているため登録と同時に割り当てられ、その後の待機で中断される
+    with monkeypatch.context() as m:
+        m.setattr(scheduler_module, "_Waiter", InterruptedWaiter)
+        with pytest.raises(GreenletExit):
+            with GeminiScheduler.slot("a"):
+                pass
+
+    assert GeminiScheduler.stats()["running"] == 0
+    with GeminiScheduler.slot("a", timeout=0.05):
+        pass
@@ -0,0 +1,72 @@
+import time
+import uuid
+import pytest
+from flask import Flask
+from urllib.parse import parse_qs, urlparse
+from app.api.v1.image_gen import bp as image_gen_bp
+from app.core.config import settings
+from app.core.enums import ImageVariant
+from app.services.image_url_service import ImageUrlService
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.register_blueprint(image_gen_bp)
+    with app.test_request_context("/"):
+        yield app
+
+def query_of(url: str) -> dict:
+    return {key: values[0] for key, values in parse_qs(urlparse(url).query).items()}
+
+def test_built_url_verifies(app):
+    uid = str(uuid.uuid4())
+    query = query_of(ImageUrlService.build(uid, "gen", "2026-01-05", "a.png"))
+
+    assert query["uid"] == uid
+    assert ImageUrlService.verify(uid, "gen", "2026-01-05", "a.png", query["exp"], query["sig"])
+
+def test_variant_shares_the_original_signature(app):
+    uid = str(uuid.uuid4())
+    original = query_of(ImageUrlService.build(uid, "gen", "2026-01-05", "a.png"))
+    thumb = query_of(ImageUrlService.build(uid, "gen", "2026-01-05", "a.png", variant=ImageVariant.THUMB))
+
+    assert thumb["size"] == ImageVariant.THUMB.value
+    assert thumb["sig"] == original["sig"]
+
+@pytest.mark.parametrize("field, value", [
+    ("uid", str(uuid.uuid4())),
+    ("path_type", "edit"),
+    ("date_dir", "2026-01-06"),
+    ("filename", "b.png"),
+])
+def test_tampered_url_is_rejected(app, field, value):
+    signed = {"uid": str(uuid.uuid4()), "path_type": "gen", "date_dir": "2026-01-05", "filename": "a.png"}
+    query = query_of(ImageUrlService.build(signed["uid"], signed["path_type"], signed["date_dir"], signed["filename"]))
+
+    signed[field] = value
+    assert not ImageUrlService.verify(**signed, exp=query["exp"], sig=query["sig"])
+
+def test_missing_or_malformed_signature_is_rejected():
+    exp = str(int(time.time()) + 60)
+
+    assert not ImageUrlService.verify("u", "gen", "d", "f", None, "sig")
+    assert not ImageUrlService.verify("u", "gen", "d", "f", exp, None)
+    assert not ImageUrlService.verify("u", "gen", "d", "f", "soon", "sig")
+
+def test_expired_url_is_rejected(monkeypatch):
+    exp = ImageUrlService.expires_at(now=1_000_000)
+    sig = ImageUrlService._signature("u", "gen", "d", "f", exp)
+    now = {"value": exp - 1}
+    monkeypatch.setattr("app.services.image_url_service.time.time", lambda: now["value"])
+
+    assert ImageUrlService.verify("u", "gen", "d", "f", str(exp), sig)
+    now["value"] = exp + 1
+    assert not ImageUrlService.verify("u", "gen", "d", "f", str(exp), sig)
+
+def test_expiry_is_rounded_up_to_the_bucket(monkeypatch):
+    monkeypatch.setattr(settings, "IMAGE_URL_TTL_SECONDS", 3600)
+    monkeypatch.setattr(settings, "IMAGE_URL_BUCKET_SECONDS", 600)
+
+    assert ImageUrlService.expires_at(now=1_000_000) == 1_003_800
+    assert ImageUrlService.expires_at(now=1_000_001) == ImageUrlService.expires_at(now=1_000_200)
+    assert ImageUrlService.expires_at(now=1_000_201) == 1_004_400
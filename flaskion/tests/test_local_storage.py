@@ -0,0 +1,38 @@
+import io
+from app.storage.local import LocalStorage
+
+def test_put_and_open(local_storage):
+    local_storage.put("u/gen/a.png", b"abc")
+    local_storage.put("u/gen/b.png", io.BytesIO(b"stream"))
+
+    with local_storage.open("u/gen/a.png") as f:
+        assert f.read() == b"abc"
+    with local_storage.open("u/gen/b.png") as f:
+        assert f.read() == b"stream"
+
+def test_put_without_overwrite_keeps_existing(local_storage):
+    local_storage.put("k.png", b"first")
+    local_storage.put("k.png", b"second", overwrite=False)
+
+    with local_storage.open("k.png") as f:
+        assert f.read() == b"first"
+
+def test_atomic_write_leaves_no_temp_files(local_storage):
+    local_storage.put("u/gen/a.png", b"abc")
+
+    names = [path.name for path in local_storage.root.rglob("*") if path.is_file()]
+    assert names == ["a.png"]
+
+def test_list_skips_hidden_entries(local_storage):
+    local_storage.put("u/gen/a.png", b"a")
+    local_storage.put("u/gen/.derivatives/thumb/a.webp", b"t")
+    local_storage.put(f"u/gen/{LocalStorage.TEMP_PREFIX}a.png.tmp", b"partial")
+
+    assert [obj.key for obj in local_storage.list("u/")] == ["u/gen/a.png"]
+
+def test_delete_is_idempotent(local_storage):
+    local_storage.put("k.png", b"x")
+    local_storage.delete("k.png")
+    local_storage.delete("k.png")
+
+    assert not local_storage.exists("k.png")
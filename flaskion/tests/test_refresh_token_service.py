@@ -0,0 +1,85 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+import pytest
+import app.services.refresh_token_service as refresh_token_module
+from app.core.errors import AuthError
+from app.db.session import db
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+from app.services.refresh_token_service import RefreshTokenService
+
+class NaiveUTCDateTime(datetime):
+    """
+    SQLiteはタイムゾーンなしで日時を返すため、現在時刻もタイムゾーンなしのUTCにそろえる
+    """
+
+    @classmethod
+    def now(cls, tz=None):
+        return datetime.now(timezone.utc).replace(tzinfo=None)
+
+@pytest.fixture
+def user(sqlite_db, monkeypatch):
+    monkeypatch.setattr(refresh_token_module, "datetime", NaiveUTCDateTime)
+    sqlite_db(User, RefreshToken)
+    user = User(id=uuid.uuid4(), email=f"{uuid.uuid4().hex}@example.com", password_hash="x")
+    db.add(user)
+    db.commit()
+    return user
+
+def family_rows(family_id):
+    db.expire_all()
+    return db.query(RefreshToken).filter_by(family_id=family_id).all()
+
+def test_rotate_issues_new_token_and_revokes_old(user):
+    token = RefreshTokenService.issue(user.id)
+
+    rotated_user, access_token, new_token, error = RefreshTokenService.rotate(token)
+
+    assert error is None
+    assert rotated_user.id == user.id
+    assert access_token
+    assert new_token != token
+    old = db.query(RefreshToken).filter_by(token_hash=RefreshTokenService.hash_token(token)).one()
+    assert old.revoked_at is not None
+
+def test_reused_token_revokes_family(user):
+    token = RefreshTokenService.issue(user.id)
+    _, _, new_token, _ = RefreshTokenService.rotate(token)
+
+    assert RefreshTokenService.rotate(token)[3] == AuthError.INVALID_REFRESH_TOKEN
+    assert RefreshTokenService.rotate(new_token)[3] == AuthError.INVALID_REFRESH_TOKEN
+
+    family_id = db.query(RefreshToken.family_id).filter_by(token_hash=RefreshTokenService.hash_token(token)).scalar()
+    assert all(row.revoked_at is not None for row in family_rows(family_id))
+
+def test_logout_revokes_family(user):
+    token = RefreshTokenService.issue(user.id)
+    _, _, new_token, _ = RefreshTokenService.rotate(token)
+
+    RefreshTokenService.revoke(new_token)
+
+    assert RefreshTokenService.rotate(new_token)[3] == AuthError.INVALID_REFRESH_TOKEN
+
+def test_unknown_token_is_rejected(user):
+    assert RefreshTokenService.rotate("unknown") == (None, None, None, AuthError.INVALID_REFRESH_TOKEN)
+    RefreshTokenService.revoke("unknown")
+
+def test_expired_token_is_rejected(user):
+    token = RefreshTokenService.issue(user.id)
+    db.query(RefreshToken).update({RefreshToken.expires_at: NaiveUTCDateTime.now() - timedelta(seconds=1)})
+    db.commit()
+
+    assert RefreshTokenService.rotate(token)[3] == AuthError.INVALID_REFRESH_TOKEN
+
+def test_rotate_purges_expired_rows(user):
+    stale = RefreshTokenService.issue(user.id)
+    token = RefreshTokenService.issue(user.id)
+    stale_hash = RefreshTokenService.hash_token(stale)
+    db.query(RefreshToken).filter_by(token_hash=stale_hash).update(
+        {RefreshToken.expires_at: NaiveUTCDateTime.now() - timedelta(days=1)}
+    )
+    db.commit()
+
+    RefreshTokenService.rotate(token)
+
+    assert db.query(RefreshToken).filter_by(token_hash=stale_hash).first() is None
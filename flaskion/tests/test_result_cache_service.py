@@ -0,0 +1,104 @@
+import threading
+import pytest
+from http import HTTPStatus
+from app.services.result_cache_service import ResultCacheService
+
+@pytest.fixture(autouse=True)
+def clear_results():
+    ResultCacheService._results.clear()
+    yield
+    ResultCacheService._results.clear()
+
+def run_concurrently(key: str, count: int, compute):
+    results = [None] * count
+
+    def call(i):
+        results[i] = ResultCacheService.get_or_run(key, compute)
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+def test_concurrent_calls_share_one_computation(monkeypatch):
+    monkeypatch.setattr(ResultCacheService._results, "ttl", 60)
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return ["ref"], HTTPStatus.OK
+
+    threads, results = run_concurrently("k1", 3, compute)
+    while not ResultCacheService._inflight:
+        threading.Event().wait(0.01)
+    threading.Event().wait(0.2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == [(["ref"], HTTPStatus.OK)] * 3
+    assert not ResultCacheService._inflight
+
+def test_concurrent_calls_run_separately_when_disabled(monkeypatch):
+    # 結果キャッシュが無効(既定)の場合、同じパラメーターの同時実行はそれぞれ生成する
+    monkeypatch.setattr(ResultCacheService._results, "ttl", 0)
+    started = threading.Barrier(3, timeout=5)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.wait()
+        return [f"ref{len(calls)}"], HTTPStatus.OK
+
+    threads, results = run_concurrently("k5", 3, compute)
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 3
+    assert all(status == HTTPStatus.OK for _, status in results)
+    assert not ResultCacheService._inflight
+
+def test_results_are_not_retained_when_disabled(monkeypatch):
+    monkeypatch.setattr(ResultCacheService._results, "ttl", 0)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return ["ref"], HTTPStatus.OK
+
+    ResultCacheService.get_or_run("k2", compute)
+    ResultCacheService.get_or_run("k2", compute)
+
+    assert len(calls) == 2
+
+def test_successful_results_are_retained_when_enabled(monkeypatch):
+    monkeypatch.setattr(ResultCacheService._results, "ttl", 60)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return ["ref"], HTTPStatus.OK
+
+    ResultCacheService.get_or_run("k3", compute)
+    assert ResultCacheService.get_or_run("k3", compute) == (["ref"], HTTPStatus.OK)
+    assert len(calls) == 1
+
+    # 参照先が失われた結果は使わない
+    ResultCacheService.get_or_run("k3", compute, is_valid=lambda cached: False)
+    assert len(calls) == 2
+
+def test_failures_are_not_retained(monkeypatch):
+    monkeypatch.setattr(ResultCacheService._results, "ttl", 60)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return "error", HTTPStatus.INTERNAL_SERVER_ERROR
+
+    ResultCacheService.get_or_run("k4", compute)
+    ResultCacheService.get_or_run("k4", compute)
+
+    assert len(calls) == 2
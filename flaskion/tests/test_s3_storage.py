@@ -0,0 +1,94 @@
+import contextlib
+import os
+import uuid
+import pytest
+import app.storage.factory as storage_factory
+from app.core.enums import ImagePathType
+from app.models.image import Image
+from app.services.blob_store import BlobStore
+from app.services.image_service import ImageGenService
+from app.storage.s3 import S3Storage
+
+boto3 = pytest.importorskip("boto3")
+
+# 指定時はS3互換サーバー(MinIO等)に接続する。未指定の場合はmotoで代用する
+ENDPOINT_URL = os.getenv("S3_TEST_ENDPOINT_URL")
+
+@pytest.fixture
+def s3_storage(monkeypatch):
+    """
+    テスト用バケットを作成したS3ストレージ
+    """
+
+    if ENDPOINT_URL:
+        context = contextlib.nullcontext()
+        credentials = {
+            "aws_access_key_id": os.getenv("S3_TEST_ACCESS_KEY_ID", "minioadmin"),
+            "aws_secret_access_key": os.getenv("S3_TEST_SECRET_ACCESS_KEY", "minioadmin"),
+        }
+    else:
+        moto = pytest.importorskip("moto")
+        context = moto.mock_aws()
+        credentials = {"aws_access_key_id": "testing", "aws_secret_access_key": "testing"}
+
+    with context:
+        bucket = f"uwgen-test-{uuid.uuid4().hex[:12]}"
+        client = boto3.client("s3", endpoint_url=ENDPOINT_URL, region_name="us-east-1", **credentials)
+        client.create_bucket(Bucket=bucket)
+
+        storage = S3Storage(
+            bucket, prefix="media", endpoint_url=ENDPOINT_URL, region="us-east-1",
+            access_key_id=credentials["aws_access_key_id"],
+            secret_access_key=credentials["aws_secret_access_key"]
+        )
+        monkeypatch.setattr(storage_factory, "_storage", storage)
+        yield storage
+
+        for obj in client.list_objects_v2(Bucket=bucket).get("Contents", []):
+            client.delete_object(Bucket=bucket, Key=obj["Key"])
+        client.delete_bucket(Bucket=bucket)
+
+def test_put_open_stat_delete(s3_storage):
+    s3_storage.put("u/gen/a.png", b"abc", content_type="image/png")
+
+    with s3_storage.open("u/gen/a.png") as f:
+        assert f.read() == b"abc"
+    assert s3_storage.stat("u/gen/a.png").size == 3
+
+    s3_storage.delete("u/gen/a.png")
+    assert s3_storage.stat("u/gen/a.png") is None
+    with pytest.raises(FileNotFoundError):
+        s3_storage.open("u/gen/a.png")
+
+def test_put_without_overwrite_keeps_existing(s3_storage):
+    s3_storage.put("k.png", b"first")
+    s3_storage.put("k.png", b"second", overwrite=False)
+
+    with s3_storage.open("k.png") as f:
+        assert f.read() == b"first"
+
+def test_list_strips_prefix(s3_storage):
+    s3_storage.put("u/gen/a.png", b"a")
+    s3_storage.put("u/gen/b.png", b"b")
+    s3_storage.put("v/gen/c.png", b"c")
+
+    assert [obj.key for obj in s3_storage.list("u/")] == ["u/gen/a.png", "u/gen/b.png"]
+
+def test_blob_store_keeps_only_the_blob(s3_storage):
+    h1 = BlobStore.store("user-a/gen/20260101/a.png", b"same")
+    h2 = BlobStore.store("user-b/gen/20260101/b.png", b"same")
+
+    assert h1 == h2
+    assert [obj.key for obj in s3_storage.list("")] == [BlobStore.blob_key(h1, ".png")]
+
+def test_resolve_image_reads_the_blob(s3_storage, sqlite_db):
+    sqlite_db(Image)
+    user_id = uuid.uuid4()
+    refs = ImageGenService.store_results(user_id, ImagePathType.GENERATED.value, [b"same"])
+    path_type, date_dir, filename = refs[0]
+
+    key, image = ImageGenService.resolve_image(path_type, date_dir, user_id, filename)
+
+    assert key == BlobStore.blob_key(image.content_hash, ".png")
+    assert ImageGenService.refs_exist(user_id, refs)
+    assert not list(s3_storage.list(f"{user_id}/"))